@@ -0,0 +1,73 @@
+"""
+Import-time budget check for the CLI entry points.
+
+Imports each entry point in a fresh interpreter under `-X importtime` and fails (exit 1) when
+one of them pulls a heavy provider/rendering dependency at module load or exceeds its budget.
+Those dependencies must load inside the code paths that use them (see utils.LazyImport).
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "fetch_playbook_data", "fetch_options_data", "alpha_standalone",
+    "generate_playbook_report", "generate_options_report", "capture_report",
+    "generate_playbook", "generate_options_playbook", "deploy_reports",
+    "compact_reports", "run_alpha_pipeline", "ghost_pulse", "generate_reports",
+]
+HEAVY_MODULES = {"yfinance", "pandas", "numpy", "tradingview_ta", "httpx", "feedparser", "jinja2", "playwright", "pyarrow"}
+DEFAULT_BUDGET_MS = 150
+
+def import_profile(module):
+    """Return (own cumulative import ms, set of top-level packages imported) for one module."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "import failed")
+    cumulative_us, loaded = None, set()
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return (cumulative_us or 0) / 1000, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time of the CLI entry points")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='Per-module cumulative import budget')
+    parser.add_argument('--runs', type=int, default=3, help='Best-of-N runs per module (smooths cold caches)')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<28} {'import ms':>10}  heavy imports")
+    for module in args.modules:
+        try:
+            samples = [import_profile(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            failures.append(f"{module}: {e}")
+            print(f"{module:<28} {'error':>10}  {e}")
+            continue
+        elapsed = min(ms for ms, _ in samples)
+        heavy = sorted(HEAVY_MODULES & samples[0][1])
+        print(f"{module:<28} {elapsed:>10.1f}  {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at module load")
+        if elapsed > args.budget_ms:
+            failures.append(f"{module} took {elapsed:.0f} ms to import (budget {args.budget_ms:.0f} ms)")
+
+    if failures:
+        print("\nImport budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll entry points within import budget.")
+
+if __name__ == "__main__":
+    main()
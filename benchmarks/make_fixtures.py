@@ -0,0 +1,138 @@
+"""Write the BASE provider fixture used by run_benchmarks.py.
+
+Produces the same on-disk format as replay_providers.encode(): a deterministic two-year
+random-walk price history, five option expirations, info/insider/news payloads, a TradingView
+analysis and a default RSS body. Replace it with a real recording when one is available.
+"""
+import os
+import json
+import math
+import random
+import argparse
+from datetime import date, timedelta
+
+def _frame(columns, rows, index, index_name=None, datetime_index=False, datetime_columns=()):
+    return {"__frame__": {
+        "columns": columns, "index": index, "index_name": index_name,
+        "datetime_index": datetime_index, "datetime_columns": list(datetime_columns), "data": rows,
+    }}
+
+def _business_days(end, count):
+    days, d = [], end
+    while len(days) < count:
+        if d.weekday() < 5:
+            days.append(d)
+        d -= timedelta(days=1)
+    return days[::-1]
+
+def make_history(rng, end, bars=504, start_price=100.0):
+    rows, index = [], []
+    price = start_price
+    for d in _business_days(end, bars):
+        ret = rng.gauss(0.0004, 0.02)
+        open_ = price
+        close = max(1.0, price * math.exp(ret))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, 0.008)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, 0.008)))
+        volume = int(rng.lognormvariate(16, 0.4))
+        rows.append([round(open_, 4), round(high, 4), round(low, 4), round(close, 4), volume, 0.0, 0.0])
+        index.append(f"{d.isoformat()}T00:00:00-05:00")
+        price = close
+    columns = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+    return _frame(columns, rows, index, index_name="Date", datetime_index=True), price
+
+def make_chain(rng, spot, expiry, dte, side):
+    columns = ["contractSymbol", "lastTradeDate", "strike", "lastPrice", "bid", "ask", "change",
+               "percentChange", "volume", "openInterest", "impliedVolatility", "inTheMoney",
+               "contractSize", "currency"]
+    rows = []
+    step = max(0.5, round(spot * 0.025, 0))
+    base_strike = round(spot / step) * step
+    for i in range(-15, 16):
+        strike = base_strike + i * step
+        moneyness = (spot - strike) if side == "C" else (strike - spot)
+        iv = 0.35 + 0.0015 * abs(i) ** 1.5 + rng.uniform(-0.01, 0.01)
+        time_value = spot * iv * math.sqrt(max(dte, 1) / 365) * 0.4 * math.exp(-abs(i) / 8)
+        mid = max(0.01, max(moneyness, 0) + time_value)
+        rows.append([
+            f"BASE{expiry.replace('-', '')[2:]}{side}{int(strike * 1000):08d}",
+            f"{expiry}T15:59:00+00:00", strike, round(mid, 2), round(mid * 0.98, 2), round(mid * 1.02, 2),
+            0.0, 0.0, int(rng.lognormvariate(5, 1.2)), int(rng.lognormvariate(7, 1.0)),
+            round(iv, 4), moneyness > 0, "REGULAR", "USD",
+        ])
+    return _frame(columns, rows, list(range(len(rows))), datetime_columns=["lastTradeDate"])
+
+RSS_BODY = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Fixture Feed</title>
+{items}
+</channel></rss>
+"""
+
+def make_rss(rng, count=10):
+    items = []
+    for i in range(count):
+        items.append(
+            f"<item><title>Fixture headline {i} ({rng.randint(1000, 9999)})</title>"
+            f"<link>https://example.com/news/{i}</link>"
+            f"<description>Recorded summary text for benchmark item {i}. " + "Market detail. " * 12 + "</description></item>"
+        )
+    return RSS_BODY.format(items="\n".join(items))
+
+def build(out_dir, seed=7, end=None):
+    rng = random.Random(seed)
+    end = end or date(2026, 2, 24)
+    ticker_dir = os.path.join(out_dir, "BASE")
+    http_dir = os.path.join(out_dir, "http")
+    os.makedirs(ticker_dir, exist_ok=True)
+    os.makedirs(http_dir, exist_ok=True)
+
+    history, spot = make_history(rng, end)
+    expiries = [(end + timedelta(days=d)).isoformat() for d in (3, 10, 17, 31, 59)]
+    chains = {
+        exp: {"calls": make_chain(rng, spot, exp, dte, "C"), "puts": make_chain(rng, spot, exp, dte, "P")}
+        for exp, dte in zip(expiries, (3, 10, 17, 31, 59))
+    }
+    insiders = _frame(
+        ["Shares", "Value", "URL", "Text", "Insider", "Position", "Transaction", "Start Date", "Ownership"],
+        [[10000 * (i + 1), 1_250_000.0 * (i + 1), "", "Sale at price", f"Insider {i}", "Director",
+          "Sale" if i % 2 else "Purchase", f"{(end - timedelta(days=7 * i)).isoformat()}T00:00:00+00:00", "D"]
+         for i in range(8)],
+        list(range(8)), datetime_columns=["Start Date"],
+    )
+    yf_payload = {
+        "history": history,
+        "options": expiries,
+        "option_chain": chains,
+        "info": {
+            "longName": "Benchmark Fixture Corp", "sector": "Technology", "industry": "Software",
+            "exchange": "NMS", "marketCap": 125_000_000_000, "beta": 1.2, "trailingEps": 4.1,
+            "bookValue": 21.5, "revenueGrowth": 0.14, "profitMargins": 0.22,
+            "targetMeanPrice": round(spot * 1.1, 2), "fiftyTwoWeekLow": round(spot * 0.7, 2),
+            "fiftyTwoWeekHigh": round(spot * 1.2, 2), "city": "Austin", "country": "United States",
+            "website": "https://example.com",
+        },
+        "insider_transactions": insiders,
+        "calendar": {"Earnings Date": [(end + timedelta(days=40)).isoformat()]},
+        "news": [{"title": f"Fixture news {i}", "link": f"https://example.com/{i}"} for i in range(5)],
+    }
+    tv_payload = {
+        "summary": {"RECOMMENDATION": "BUY", "BUY": 12, "SELL": 4, "NEUTRAL": 10},
+        "oscillators": {"RECOMMENDATION": "NEUTRAL", "BUY": 2, "SELL": 1, "NEUTRAL": 8, "COMPUTE": {}},
+        "moving_averages": {"RECOMMENDATION": "BUY", "BUY": 10, "SELL": 3, "NEUTRAL": 2, "COMPUTE": {}},
+        "indicators": {"close": round(spot, 2), "RSI": 55.2, "MACD.macd": 1.1, "ADX": 22.4},
+    }
+
+    with open(os.path.join(ticker_dir, "yfinance.json"), "w") as f:
+        json.dump(yf_payload, f)
+    with open(os.path.join(ticker_dir, "tradingview.json"), "w") as f:
+        json.dump(tv_payload, f)
+    with open(os.path.join(http_dir, "default.body"), "w") as f:
+        f.write(make_rss(rng))
+    print(f"Fixtures written to {out_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate benchmark provider fixtures")
+    parser.add_argument('--out', type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    build(args.out, seed=args.seed)
@@ -0,0 +1,157 @@
+"""
+Offline benchmark for the playbook pipeline.
+
+Replays recorded provider fixtures (see make_fixtures.py, or a --record capture) through
+replay_providers and times each stage per ticker for synthetic watchlists of several sizes.
+Results are written as JSON so runs can be diffed across commits or engines.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import importlib
+import subprocess
+import statistics
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from replay_providers import FixtureStore, replaying
+
+FETCHERS = ["fetch_playbook_data", "fetch_options_data", "alpha_standalone"]
+DEFAULT_FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "results")
+
+def synthetic_watchlist(size):
+    return [f"SYN{i:04d}" for i in range(size)]
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "total_s": round(sum(ordered), 6),
+        "mean_s": round(statistics.fmean(ordered), 6),
+        "p50_s": round(ordered[len(ordered) // 2], 6),
+        "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "max_s": round(ordered[-1], 6),
+    }
+
+def timed(fn, *args, quiet=True, **kwargs):
+    start = time.perf_counter()
+    if quiet:
+        with redirect_stdout(io.StringIO()):
+            result = fn(*args, **kwargs)
+    else:
+        result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def run_size(size, store, fetcher, capture=False, quiet=True):
+    fetch_mod = importlib.import_module(fetcher)
+    report_mod = importlib.import_module("generate_playbook_report")
+    dataset_mod = importlib.import_module("ticker_dataset")
+    capture_mod = importlib.import_module("capture_report") if capture else None
+
+    template = "options_template.html" if fetcher == "fetch_options_data" else "hud_template.html"
+    samples = {"fetch": [], "serialize": [], "render": [], "capture": []}
+    failures = []
+    with replaying(store, fetch_mod, dataset_mod, report_mod):
+        for ticker in synthetic_watchlist(size):
+            try:
+                elapsed, data = timed(fetch_mod.fetch_ticker_data, ticker, quiet=quiet)
+                samples["fetch"].append(elapsed)
+                if not data:
+                    failures.append({"ticker": ticker, "stage": "fetch", "error": "no data"})
+                    continue
+
+                if hasattr(fetch_mod, "save_json"):
+                    start = time.perf_counter()
+                    with redirect_stdout(io.StringIO()):
+                        fetch_mod.save_json(data, ticker)
+                        fetch_mod.save_series_json(ticker, data.get('chart_data', []), data.get('ema_data', {}))
+                    samples["serialize"].append(time.perf_counter() - start)
+
+                elapsed, html_path = timed(report_mod.generate_html, data, template, quiet=quiet)
+                samples["render"].append(elapsed)
+
+                if capture_mod and html_path:
+                    elapsed, _ = timed(capture_mod.capture_report, ticker, "png", quiet=quiet)
+                    samples["capture"].append(elapsed)
+            except Exception as e:
+                failures.append({"ticker": ticker, "stage": "pipeline", "error": str(e)})
+
+        index_s, _ = timed(report_mod.update_index, quiet=quiet)
+
+    result = {stage: summarize(values) for stage, values in samples.items() if values}
+    result["index"] = summarize([index_s])
+    result["failures"] = failures
+    return result
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark on recorded fixtures")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Synthetic watchlist sizes')
+    parser.add_argument('--fixtures', type=str, default=DEFAULT_FIXTURES, help='Fixture directory to replay')
+    parser.add_argument('--fetcher', type=str, choices=FETCHERS, default="fetch_playbook_data",
+                        help='Module whose fetch_ticker_data is benchmarked')
+    parser.add_argument('--capture', action='store_true', help='Also time the Playwright screenshot stage')
+    parser.add_argument('--label', type=str, default=None, help='Free-form label stored with the results (e.g. engine name)')
+    parser.add_argument('--out', type=str, default=None, help='Output JSON path')
+    parser.add_argument('--verbose', action='store_true', help='Show pipeline output instead of swallowing it')
+    args = parser.parse_args()
+
+    store = FixtureStore(os.path.abspath(args.fixtures))
+    results = {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fetcher": args.fetcher,
+        "label": args.label,
+        "sizes": {},
+    }
+
+    # Stages write reports/ relative to the working directory, so run in a scratch copy of the templates
+    workdir = tempfile.mkdtemp(prefix="alpha-bench-")
+    cwd = os.getcwd()
+    try:
+        shutil.copytree(os.path.join(ROOT, "templates"), os.path.join(workdir, "templates"))
+        os.chdir(workdir)
+        for size in args.sizes:
+            print(f"Benchmarking {size} tickers with {args.fetcher}...")
+            start = time.perf_counter()
+            results["sizes"][str(size)] = run_size(size, store, args.fetcher, capture=args.capture, quiet=not args.verbose)
+            results["sizes"][str(size)]["wall_s"] = round(time.perf_counter() - start, 3)
+            shutil.rmtree(os.path.join(workdir, "reports"), ignore_errors=True)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    out = args.out or os.path.join(DEFAULT_RESULTS, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n{'size':>6} {'stage':<10} {'mean ms':>9} {'p95 ms':>9} {'total s':>9}")
+    for size, stages in results["sizes"].items():
+        for stage, stats in stages.items():
+            if isinstance(stats, dict) and stats.get("count"):
+                print(f"{size:>6} {stage:<10} {stats['mean_s'] * 1000:>9.2f} {stats['p95_s'] * 1000:>9.2f} {stats['total_s']:>9.2f}")
+    print(f"\nResults saved to: {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Times tradier_client against the local stub server (tradier_stub.py) and checks the chains it returns.
+
+Runs the watchlist once one symbol at a time and once through fetch_chains, then again from the
+per-expiration cache, which must not touch the server. At the configured "tradier" rate limit both
+runs are paced by the limiter; --rate lifts it to show what the concurrency itself buys:
+
+    python benchmarks/tradier_bench.py --symbols 8 --latency-ms 50 --rate 100
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import options_chain
+import provider_calls
+import tradier_client
+from tradier_stub import stub_server
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Tradier client against the stub server")
+    parser.add_argument("--symbols", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated server latency")
+    parser.add_argument("--rate", type=float, help="Override the tradier requests/s limit for the run")
+    args = parser.parse_args()
+    if args.rate:
+        limit = provider_calls.limiter.limits["tradier"]
+        provider_calls.limiter.limits["tradier"] = {**limit, "rate": args.rate, "burst": args.rate}
+    symbols = [f"SYN{i:04d}" for i in range(args.symbols)]
+
+    failed = False
+    with tempfile.TemporaryDirectory() as cache_dir, stub_server(latency=args.latency_ms / 1000) as (url, stub):
+        os.environ["TRADIER_API_URL"] = url
+        options_chain.OPTIONS_CACHE_DIR = os.path.join(cache_dir, "sequential")
+        sequential_s, _ = timed(lambda: [tradier_client.fetch_chain(s) for s in symbols])
+        options_chain.OPTIONS_CACHE_DIR = os.path.join(cache_dir, "batched")
+        before = stub.requests
+        batched_s, chains = timed(tradier_client.fetch_chains, symbols)
+        requests = stub.requests - before
+        before = stub.requests
+        cached_s, cached = timed(tradier_client.fetch_chains, symbols)
+
+        print(f"{len(symbols)} symbols, {requests} requests at {args.latency_ms:g} ms latency")
+        print(f"  one symbol at a time  {sequential_s * 1000:8.1f} ms")
+        print(f"  fetch_chains          {batched_s * 1000:8.1f} ms")
+        print(f"  fetch_chains (cached) {cached_s * 1000:8.1f} ms  ({stub.requests - before} listing requests)")
+
+        for symbol in symbols:
+            chain = chains[symbol]
+            columns = {"contractSymbol", "strike", "side", "expiration", "dte", "impliedVolatility", "delta"}
+            if chain.empty or not columns <= set(chain.columns) or chain["delta"].isna().all():
+                print(f"  {symbol}: incomplete chain ({len(chain)} rows)")
+                failed = True
+            if len(cached[symbol]) != len(chain):
+                print(f"  {symbol}: cached chain has {len(cached[symbol])} rows, expected {len(chain)}")
+                failed = True
+        # Only the expiration listings are re-requested once the chains are cached
+        failed |= stub.requests - before != len(symbols)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
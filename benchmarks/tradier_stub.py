@@ -0,0 +1,94 @@
+"""
+Local stand-in for the Tradier market-data API, served from a replay fixture recording.
+
+Answers the quotes, option expirations and option chains endpoints tradier_client uses, with bodies
+built by replay_providers.ReplayTradier. Symbols without their own recording are served from the BASE
+fixture with scaled prices, like FixtureStore, so any watchlist works offline:
+
+    python benchmarks/tradier_stub.py --port 8765 &
+    TRADIER_API_URL=http://127.0.0.1:8765/v1 python uoa_scanner.py --provider tradier --tickers AAPL MSFT
+
+In-process, `with stub_server() as (url, stub):` serves on a free port for the duration of the block.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from replay_providers import FixtureStore, ReplayTradier
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+class TradierStub(ReplayTradier):
+    """ReplayTradier that counts the requests it serves."""
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+def make_handler(stub, latency=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            route = stub.route(url.path) if url.path.startswith("/v1/") else None
+            stub.count()
+            if latency:
+                time.sleep(latency)
+            try:
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, body = (200, route(params)) if route else (404, {"fault": "not found"})
+            except (KeyError, FileNotFoundError) as e:
+                status, body = 400, {"fault": f"bad request: {e}"}
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+@contextmanager
+def stub_server(fixtures=FIXTURES, port=0, latency=0.0):
+    """Serve the stub on a background thread; yields (API root to use as TRADIER_API_URL, TradierStub)."""
+    stub = TradierStub(FixtureStore(fixtures))
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(stub, latency))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1", stub
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Tradier API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=str, default=FIXTURES, help="Replay fixture directory")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    with stub_server(args.fixtures, args.port, args.latency_ms / 1000) as (url, _):
+        print(f"Tradier stub on {url} (fixtures: {args.fixtures})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
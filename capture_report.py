@@ -1,6 +1,7 @@
 import os
 import argparse
-from playwright.sync_api import sync_playwright
+
+from run_metrics import metrics
 
 def capture_report(ticker, output_format="png"):
     ticker_dir = f"reports/{ticker}"
@@ -21,8 +22,10 @@ def capture_report(ticker, output_format="png"):
     os.makedirs(output_dir, exist_ok=True)
     
     output_file = f"{output_dir}/{ticker}_report.{output_format}"
+
+    from playwright.sync_api import sync_playwright
     
-    with sync_playwright() as p:
+    with metrics.stage(ticker, "capture"), sync_playwright() as p:
         # Launching browser
         browser = p.chromium.launch(headless=True)
         # Setting a large desktop viewport to ensure the dashboard renders fully
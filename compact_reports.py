@@ -0,0 +1,145 @@
+import os
+import re
+import json
+import argparse
+from collections import defaultdict
+from datetime import datetime
+
+from utils import HISTORY_DATES_FILE, load_history_dates
+
+REPORT_ROOTS = ["reports", "ghost-research-v1/reports"]
+# deploy_reports.py writes .gz/.br siblings next to each artifact; they go with it
+DATED_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})(_series|_options)?\.(html|json)(\.gz|\.br)?$")
+# Folded months: history/<YYYY-MM>.parquet (one row per report date) and history/<YYYY-MM>_series.parquet
+HISTORY_DIR = "history"
+SERIES_SUFFIX = "_series"
+
+def _dated_artifacts(ticker_dir):
+    """Group a ticker's dated artifacts by report date."""
+    by_date = defaultdict(list)
+    for name in os.listdir(ticker_dir):
+        m = DATED_FILE.match(name)
+        if m:
+            by_date[m.group(1)].append(name)
+    return by_date
+
+def _flatten_snapshot(date_str, snapshot):
+    """One history row per report date; nested lists are kept as JSON text so columns stay scalar."""
+    import pandas as pd
+
+    row = pd.json_normalize(snapshot, sep='.').iloc[0].to_dict()
+    for k, v in row.items():
+        if isinstance(v, (list, dict)):
+            row[k] = json.dumps(v)
+    row['date'] = date_str
+    return row
+
+def _series_rows(series):
+    """Merge OHLC bars and EMA values of one series snapshot into rows keyed by bar time."""
+    rows = {bar['time']: dict(bar) for bar in series.get('chart_data', []) if bar.get('time')}
+    for span, points in series.get('ema_data', {}).items():
+        for p in points:
+            if p.get('time') in rows:
+                rows[p['time']][f"ema_{span}"] = p.get('value')
+    return list(rows.values())
+
+def _month_bars(bars, month, history_dir):
+    """Bars up to the end of `month` that no earlier month's series file holds yet."""
+    import pandas as pd
+
+    done = ""
+    for name in os.listdir(history_dir) if os.path.isdir(history_dir) else []:
+        if name.endswith(f"{SERIES_SUFFIX}.parquet") and name[:7] < month:
+            done = max(done, pd.read_parquet(os.path.join(history_dir, name), columns=["time"])["time"].max())
+    return [bar for bar in bars if done < str(bar["time"])[:10] <= f"{month}-31"]
+
+def compact_ticker(ticker_dir, keep_days, dry_run=False):
+    """Fold whole months of report dates beyond the newest `keep_days` into per-month parquet history
+    and delete their artifacts.
+
+    A month folds only once every day of it is past the window (and it isn't the current month), so
+    each history/<YYYY-MM>.parquet is written once and never rewritten: the committed archive gains one
+    blob per ticker per month instead of a fresh copy of the whole table every day.
+    """
+    import pandas as pd
+    from utils import upsert_parquet
+
+    by_date = _dated_artifacts(ticker_dir)
+    dates = sorted(by_date)
+    kept = dates[-keep_days:] if keep_days > 0 else []
+    cutoff = min(kept[0][:7] if kept else "9999-12", datetime.now().strftime('%Y-%m'))
+    expired = [d for d in dates if d[:7] < cutoff]
+    if not expired:
+        return 0, 0
+
+    snapshots, bars = defaultdict(list), defaultdict(list)
+    for date_str in list(expired):
+        names = by_date[date_str]
+        try:
+            if f"{date_str}.json" in names:
+                with open(os.path.join(ticker_dir, f"{date_str}.json"), 'r') as f:
+                    snapshots[date_str[:7]].append(_flatten_snapshot(date_str, json.load(f)))
+            if f"{date_str}_series.json" in names:
+                with open(os.path.join(ticker_dir, f"{date_str}_series.json"), 'r') as f:
+                    bars[date_str[:7]].extend(_series_rows(json.load(f)))
+        except Exception as e:
+            print(f"Skipping unreadable snapshot {ticker_dir}/{date_str}: {e}")
+            expired.remove(date_str)
+
+    freed = sum(os.path.getsize(os.path.join(ticker_dir, n)) for d in expired for n in by_date[d])
+    if dry_run:
+        return len(expired), freed
+
+    history_dir = os.path.join(ticker_dir, HISTORY_DIR)
+    for month in sorted(set(snapshots) | set(bars)):
+        if snapshots[month]:
+            upsert_parquet(os.path.join(history_dir, f"{month}.parquet"), pd.DataFrame(snapshots[month]), key='date')
+        month_bars = _month_bars(bars[month], month, history_dir)
+        if month_bars:
+            # Later snapshots come last, so keep='last' prefers the most recent value for a bar
+            upsert_parquet(os.path.join(history_dir, f"{month}{SERIES_SUFFIX}.parquet"), pd.DataFrame(month_bars),
+                           key='time')
+
+    archived = sorted(set(load_history_dates(ticker_dir)) | set(expired), reverse=True)
+    with open(os.path.join(ticker_dir, HISTORY_DATES_FILE), 'w') as f:
+        json.dump(archived, f, indent=2)
+
+    for d in expired:
+        for name in by_date[d]:
+            os.remove(os.path.join(ticker_dir, name))
+    return len(expired), freed
+
+def compact(roots=REPORT_ROOTS, keep_days=14, dry_run=False):
+    total_dates, total_freed = 0, 0
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for ticker in sorted(os.listdir(root)):
+            ticker_dir = os.path.join(root, ticker)
+            if not os.path.isdir(ticker_dir):
+                continue
+            try:
+                dates, freed = compact_ticker(ticker_dir, keep_days, dry_run=dry_run)
+            except Exception as e:
+                print(f"Compaction Error ({ticker_dir}): {e}")
+                continue
+            if dates:
+                print(f"{ticker_dir}: folded {dates} report days ({freed / 1e6:.1f} MB)")
+            total_dates += dates
+            total_freed += freed
+
+    prefix = "[dry-run] " if dry_run else ""
+    print(f"{prefix}Compaction complete: {total_dates} report days folded ({total_freed / 1e6:.1f} MB).")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the per-day report archive")
+    parser.add_argument('--keep-days', type=int, default=14,
+                        help='Minimum report days per ticker to keep as full artifacts (only whole months fold)')
+    parser.add_argument('--roots', type=str, nargs='+', default=REPORT_ROOTS, help='Report roots to compact')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be folded without touching files')
+    args = parser.parse_args()
+
+    compact(args.roots, keep_days=args.keep_days, dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 import json
 import os
 
+# Per-provider request budgets: `rate` requests/s refilled into a bucket of `burst` tokens, at most
+# `concurrency` requests in flight. `per_name` gives every provider under the key its own bucket
+# (one per RSS host). Entries in config.json's RATE_LIMITS override these key by key.
+DEFAULT_RATE_LIMITS = {
+    "yfinance": {"rate": 4.0, "burst": 8, "concurrency": 6},
+    "yfinance.option_chain": {"rate": 3.0, "burst": 5, "concurrency": 5},
+    "tradingview": {"rate": 1.0, "burst": 3, "concurrency": 2},
+    "rss": {"rate": 1.0, "burst": 2, "concurrency": 2, "per_name": True},
+    "tradier": {"rate": 2.0, "burst": 5, "concurrency": 4},
+}
+
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
 
 def load_config():
@@ -10,10 +21,26 @@ def load_config():
     return {
         "VULTR_ALIAS": "vultr",
         "VULTR_WEB_ROOT": "/home/mphinance/public_html/alpha",
-        "VENUS_STORAGE": "backups"
+        "VENUS_STORAGE": "backups",
+        "VENUS_SNAPSHOT_KEEP": 30
     }
 
 config = load_config()
 VULTR_ALIAS = config.get("VULTR_ALIAS", "vultr")
 VULTR_WEB_ROOT = config.get("VULTR_WEB_ROOT", "/home/mphinance/public_html/alpha")
 VENUS_STORAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.get("VENUS_STORAGE", "backups"))
+VENUS_SNAPSHOT_KEEP = int(config.get("VENUS_SNAPSHOT_KEEP", 30))
+RATE_LIMITS = {**DEFAULT_RATE_LIMITS, **config.get("RATE_LIMITS", {})}
+# Option chains are cached per expiration: OPTIONS_CACHE_TTL_OPEN seconds while the market is open,
+# until the next open once a chain has been fetched after the close
+OPTIONS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.get("OPTIONS_CACHE_DIR", "cache/options"))
+OPTIONS_CACHE_TTL_OPEN = int(config.get("OPTIONS_CACHE_TTL_OPEN", 300))
+OPTIONS_MAX_DTE = int(config.get("OPTIONS_MAX_DTE", 60))
+# Also keep per-strike OI/volume per day next to the daily chain aggregates (larger files)
+OPTIONS_STRIKE_HISTORY = bool(config.get("OPTIONS_STRIKE_HISTORY", False))
+# Annualized, continuously compounded rate used by the Black-Scholes greeks
+RISK_FREE_RATE = float(config.get("RISK_FREE_RATE", 0.045))
+# Where fetch_options_data.py (ticker_dataset.acquire) gets option chains: "yfinance" or "tradier" (falls back to yfinance)
+OPTIONS_CHAIN_PROVIDER = config.get("OPTIONS_CHAIN_PROVIDER", "yfinance")
+# Tradier API root; the TRADIER_API_URL environment variable wins (e.g. benchmarks/tradier_stub.py)
+TRADIER_API_URL = config.get("TRADIER_API_URL", "https://api.tradier.com/v1")
@@ -1,9 +1,22 @@
 import os
+import gzip
+import json
+import shlex
+import hashlib
 import argparse
+import shutil
 import subprocess
 from datetime import datetime
 
-from config import VULTR_ALIAS, VULTR_WEB_ROOT, VENUS_STORAGE
+from config import VULTR_ALIAS, VULTR_WEB_ROOT, VENUS_STORAGE, VENUS_SNAPSHOT_KEEP
+
+MANIFEST_NAME = ".deploy_manifest.json"
+LOCAL_MANIFEST = ".deploy_manifest.json"
+RSYNC_CHUNK = 500
+PRECOMPRESS_TYPES = (".html", ".json", ".js", ".css")
+COMPRESSED_EXTS = (".gz", ".br")
+# Internal stores kept beside the reports (options/surface/GEX history, compacted days); never published
+PRIVATE_EXTS = (".parquet",)
 
 def deploy_to_vultr(ticker):
     """Sync the local reports to Vultr web root."""
@@ -13,7 +26,8 @@ def deploy_to_vultr(ticker):
         subprocess.run(["ssh", VULTR_ALIAS, f"mkdir -p {remote_dir}"], check=True)
         
         local_dir = f"reports/{ticker}"
-        subprocess.run(["scp", "-r", local_dir, f"{VULTR_ALIAS}:{VULTR_WEB_ROOT}/"], check=True)
+        excludes = [f"--exclude=*{ext}" for ext in PRIVATE_EXTS]
+        subprocess.run(["rsync", "-az", *excludes, f"{local_dir}/", f"{VULTR_ALIAS}:{remote_dir}/"], check=True)
         
         # Upload Root Index
         if os.path.exists("index.html"):
@@ -30,6 +44,212 @@ def deploy_to_vultr(ticker):
     except Exception as e:
         print(f"Vultr Deployment Error: {e}")
 
+def _ssh_options():
+    """Multiplex every ssh/rsync call of a run over one persistent connection."""
+    control_path = os.path.expanduser("~/.ssh/alpha-deploy-%r@%h:%p")
+    return [
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={control_path}",
+        "-o", "ControlPersist=120",
+    ]
+
+def _is_local_target(target):
+    """A target without a host prefix (e.g. /tmp/site) is a local directory."""
+    return ":" not in target or os.path.isabs(target)
+
+def _run_on_target(target, script, stdin=None):
+    """Run a shell script in the target's web root, locally or over ssh, optionally feeding it `stdin` bytes."""
+    if _is_local_target(target):
+        subprocess.run(["sh", "-c", script], input=stdin, check=True)
+    else:
+        host = target.split(":", 1)[0]
+        subprocess.run(["ssh", *_ssh_options(), host, script], input=stdin, check=True)
+
+def _publish_files():
+    """Map every publishable artifact to its path under the web root."""
+    files = {}
+    for ticker in sorted(os.listdir("reports")) if os.path.isdir("reports") else []:
+        ticker_dir = os.path.join("reports", ticker)
+        if not os.path.isdir(ticker_dir):
+            continue
+        for dirpath, _, filenames in os.walk(ticker_dir):
+            for name in filenames:
+                local = os.path.join(dirpath, name)
+                if name.startswith("latest.html") or name.endswith(PRIVATE_EXTS) or os.path.islink(local):
+                    continue
+                files[os.path.relpath(local, "reports").replace(os.sep, "/")] = local
+    for root_file in ("index.html", "docs/index.html"):
+        for local in (root_file, *(root_file + ext for ext in COMPRESSED_EXTS)):
+            if os.path.exists(local):
+                files[local] = local
+    return files
+
+def precompress(paths):
+    """Write max-level .gz (and .br when brotli is installed) siblings for text artifacts that changed."""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = 0
+    for path in paths:
+        if not path.endswith(PRECOMPRESS_TYPES) or not os.path.isfile(path):
+            continue
+        src_mtime = os.stat(path).st_mtime
+        targets = [(".gz", lambda b: gzip.compress(b, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            targets.append((".br", lambda b: brotli.compress(b, quality=11)))
+
+        raw = None
+        for ext, compress in targets:
+            out = path + ext
+            # Siblings carry the source mtime, so an equal mtime means they are current
+            if os.path.exists(out) and os.stat(out).st_mtime == src_mtime:
+                continue
+            if raw is None:
+                with open(path, "rb") as f:
+                    raw = f.read()
+            with open(out, "wb") as f:
+                f.write(compress(raw))
+            os.utime(out, (src_mtime, src_mtime))
+            written += 1
+    return written
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def precompress_publish_set():
+    paths = [p for p in _publish_files().values() if not p.endswith(COMPRESSED_EXTS)]
+    written = precompress(paths)
+    print(f"Pre-compressed {written} artifacts.")
+    return written
+
+def build_manifest(previous=None):
+    """Hash the publish set, reusing digests for files whose size and mtime are unchanged."""
+    previous = previous or {}
+    manifest = {}
+    for rel, local in _publish_files().items():
+        st = os.stat(local)
+        old = previous.get(rel)
+        if old and old.get("size") == st.st_size and old.get("mtime") == int(st.st_mtime):
+            digest = old["sha256"]
+        else:
+            digest = _file_digest(local)
+        manifest[rel] = {"sha256": digest, "size": st.st_size, "mtime": int(st.st_mtime)}
+    return manifest
+
+def load_local_manifest():
+    if os.path.exists(LOCAL_MANIFEST):
+        try:
+            with open(LOCAL_MANIFEST, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable local manifest: {e}")
+    return {}
+
+def load_remote_manifest(target):
+    """Read the manifest the target holds; missing or unreadable means a full upload."""
+    web_root = _web_root(target)
+    try:
+        if _is_local_target(target):
+            with open(os.path.join(web_root, MANIFEST_NAME), "r") as f:
+                return json.load(f)
+        host = target.split(":", 1)[0]
+        out = subprocess.run(
+            ["ssh", *_ssh_options(), host, f"cat {shlex.quote(f'{web_root}/{MANIFEST_NAME}')}"],
+            check=True, capture_output=True, text=True
+        )
+        return json.loads(out.stdout)
+    except Exception:
+        return {}
+
+def diff_manifest(local, remote):
+    """Return (changed, retired) web-root paths between the local and remote manifests."""
+    changed = sorted(
+        rel for rel, entry in local.items()
+        if remote.get(rel, {}).get("sha256") != entry["sha256"]
+    )
+    retired = sorted(rel for rel in remote if rel not in local)
+    return changed, retired
+
+def _web_root(target):
+    return target if _is_local_target(target) else target.split(":", 1)[1]
+
+def _rsync_command(target):
+    if _is_local_target(target):
+        return ["rsync", "-az", "--relative"]
+    return ["rsync", "-az", "--relative", "-e", shlex.join(["ssh", *_ssh_options()])]
+
+def deploy_batch(tickers, target=None, date_str=None, delete_retired=False, compress=True):
+    """Upload only artifacts whose hash differs from the target's manifest, then link all latest.html in one step."""
+    target = target or f"{VULTR_ALIAS}:{VULTR_WEB_ROOT}"
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    web_root = _web_root(target)
+
+    print(f"Deploying {len(tickers)} tickers to {target}...")
+    try:
+        if compress:
+            precompress_publish_set()
+        files = _publish_files()
+        local_manifest = build_manifest(load_local_manifest())
+        remote_manifest = load_remote_manifest(target)
+        changed, retired = diff_manifest(local_manifest, remote_manifest)
+        changed_bytes = sum(local_manifest[rel]["size"] for rel in changed)
+        print(f"Manifest diff: {len(changed)} changed ({format_bytes(changed_bytes)}), {len(retired)} retired, "
+              f"{len(local_manifest) - len(changed)} unchanged.")
+
+        if _is_local_target(target):
+            os.makedirs(target, exist_ok=True)
+
+        # "reports/./AAPL/x.html" + --relative keeps only "AAPL/x.html" on the remote side, matching the old scp layout
+        sources = [f"reports/./{rel}" if files[rel].startswith("reports") else rel for rel in changed]
+        for i in range(0, len(sources), RSYNC_CHUNK):
+            subprocess.run([*_rsync_command(target), *sources[i:i + RSYNC_CHUNK], f"{target.rstrip('/')}/"], check=True)
+
+        if delete_retired and retired:
+            # Paths go over stdin, NUL-separated: a compaction can retire more than one command line holds
+            paths = b"".join(f"{web_root}/{rel}".encode() + b"\0" for rel in retired)
+            _run_on_target(target, "xargs -0 rm -f --", stdin=paths)
+
+        remote_steps = []
+        for t in tickers:
+            if os.path.exists(f"reports/{t}/{date_str}.html"):
+                link = shlex.quote(f"{web_root}/{t}/latest.html")
+                remote_steps.append(f"ln -sfn {shlex.quote(f'{date_str}.html')} {link}")
+                for ext in COMPRESSED_EXTS if compress else ():
+                    link = shlex.quote(f"{web_root}/{t}/latest.html{ext}")
+                    # .br is only written when brotli is installed; never leave a dangling link behind
+                    if os.path.exists(f"reports/{t}/{date_str}.html{ext}"):
+                        remote_steps.append(f"ln -sfn {shlex.quote(f'{date_str}.html{ext}')} {link}")
+                    else:
+                        remote_steps.append(f"rm -f {link}")
+        if remote_steps:
+            _run_on_target(target, " && ".join(remote_steps))
+
+        # Retired entries stay in the manifest until they are actually deleted
+        if not delete_retired:
+            for rel in retired:
+                local_manifest.setdefault(rel, remote_manifest[rel])
+        with open(LOCAL_MANIFEST, "w") as f:
+            json.dump(local_manifest, f, indent=2, sort_keys=True)
+        subprocess.run([*_rsync_command(target), LOCAL_MANIFEST, f"{target.rstrip('/')}/"], check=True)
+
+        print(f"Batch deployment complete: {len(changed)} files uploaded, {len(tickers)} latest links updated.")
+        return changed
+    except Exception as e:
+        print(f"Batch Deployment Error: {e}")
+        return []
+
+def format_bytes(num):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num < 1024 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+
 def backup_to_venus():
     """Sync the local reports to Venus large storage."""
     print("Backing up to Venus...")
@@ -40,6 +260,55 @@ def backup_to_venus():
     except Exception as e:
         print(f"Venus Backup Error: {e}")
 
+def backup_snapshot(keep=VENUS_SNAPSHOT_KEEP, date_str=None):
+    """Write a dated Venus snapshot, hard-linking files unchanged since the previous snapshot."""
+    snapshots_dir = os.path.join(VENUS_STORAGE, "snapshots")
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    dest = os.path.join(snapshots_dir, date_str)
+    print(f"Snapshotting reports to {dest}...")
+    try:
+        os.makedirs(snapshots_dir, exist_ok=True)
+        previous = sorted(d for d in os.listdir(snapshots_dir) if d != date_str and not d.startswith("."))
+        prev_dir = os.path.join(snapshots_dir, previous[-1]) if previous else None
+
+        partial = os.path.join(snapshots_dir, f".{date_str}.partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        linked = copied = 0
+        for dirpath, _, filenames in os.walk("reports"):
+            rel_dir = os.path.relpath(dirpath, "reports")
+            os.makedirs(os.path.join(partial, rel_dir), exist_ok=True)
+            for name in filenames:
+                src = os.path.join(dirpath, name)
+                out = os.path.join(partial, rel_dir, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), out)
+                    continue
+                # Same size and mtime as last snapshot (rsync's quick check) means the bytes can be shared
+                old = os.path.join(prev_dir, rel_dir, name) if prev_dir else None
+                st = os.stat(src)
+                if old and os.path.isfile(old) and not os.path.islink(old):
+                    ost = os.stat(old)
+                    if ost.st_size == st.st_size and int(ost.st_mtime) == int(st.st_mtime):
+                        os.link(old, out)
+                        linked += 1
+                        continue
+                shutil.copy2(src, out)
+                copied += 1
+
+        shutil.rmtree(dest, ignore_errors=True)
+        os.rename(partial, dest)
+
+        snapshots = sorted(d for d in os.listdir(snapshots_dir) if not d.startswith("."))
+        for old in snapshots[:-keep] if keep > 0 else []:
+            shutil.rmtree(os.path.join(snapshots_dir, old), ignore_errors=True)
+            print(f"Pruned snapshot: {old}")
+
+        print(f"Snapshot complete: {copied} new files, {linked} hard-linked from {previous[-1] if previous else 'nothing'}.")
+        return dest
+    except Exception as e:
+        print(f"Venus Snapshot Error: {e}")
+        return None
+
 def deploy_global_docs():
     """Deploy docs directory for options dashboard if exists"""
     try:
@@ -52,12 +321,31 @@ def deploy_global_docs():
 
 def main():
     parser = argparse.ArgumentParser(description="Deploy Playbook Reports")
-    parser.add_argument('--ticker', type=str, required=True, help='Stock Ticker Symbol')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--ticker', type=str, help='Stock Ticker Symbol')
+    group.add_argument('--tickers', type=str, nargs='+', help='Deploy a whole run in one batched transfer')
+    parser.add_argument('--target', type=str, default=None,
+                        help='Batch target: host:/web/root or a local directory (default: Vultr web root)')
+    parser.add_argument('--delete-retired', action='store_true',
+                        help='Remove files from the target that are no longer in the local publish set')
+    parser.add_argument('--no-precompress', action='store_true',
+                        help='Skip writing .gz/.br siblings before a batch deploy')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='Back up to a dated hard-linked Venus snapshot instead of the rsync mirror')
+    parser.add_argument('--keep', type=int, default=VENUS_SNAPSHOT_KEEP, help='Number of Venus snapshots to retain')
     args = parser.parse_args()
 
-    deploy_to_vultr(args.ticker)
-    deploy_global_docs()
-    backup_to_venus()
+    if args.tickers:
+        deploy_batch(args.tickers, target=args.target, delete_retired=args.delete_retired,
+                     compress=not args.no_precompress)
+    else:
+        deploy_to_vultr(args.ticker)
+        deploy_global_docs()
+
+    if args.snapshot:
+        backup_snapshot(keep=args.keep)
+    else:
+        backup_to_venus()
 
 if __name__ == "__main__":
     main()
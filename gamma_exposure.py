@@ -0,0 +1,128 @@
+"""
+Dealer gamma exposure (GEX) from priced option chains (see greeks.chain_greeks).
+
+Uses the usual convention that dealers are long the calls and short the puts customers trade, so call
+gamma counts positive and put gamma negative. Exposure is in dollars per 1% move of the underlying.
+"""
+import os
+
+from greeks import CONTRACT_SIZE, MIN_DTE_DAYS, RISK_FREE_RATE, bs_gamma
+from provider_calls import is_live
+from utils import LazyImport, upsert_parquet
+
+np = LazyImport("numpy")
+pd = LazyImport("pandas")
+
+GAMMA_FILE = "gamma_profile.parquet"
+# Hypothetical spots the flip is searched over, as a fraction of the current spot
+FLIP_RANGE = 0.2
+FLIP_STEPS = 81
+FLIP_CHUNK = 8192
+PROFILE_RANGE = 0.15
+
+def _signed_oi(chain):
+    oi = chain["openInterest"].fillna(0).to_numpy(dtype=float) * CONTRACT_SIZE
+    return np.where((chain["side"] == "call").to_numpy(), oi, -oi)
+
+def contract_gex(chain, spot):
+    """Signed dollar gamma per 1% move for every contract."""
+    gamma = np.nan_to_num(chain["gamma"].to_numpy(dtype=float))
+    return _signed_oi(chain) * gamma * spot * spot * 0.01
+
+def strike_profile(chain, spot):
+    """Call, put and net GEX per strike, summed over every expiration in the chain."""
+    if chain.empty:
+        return pd.DataFrame(columns=["strike", "call_gex", "put_gex", "net_gex"])
+    gex = contract_gex(chain, spot)
+    is_call = (chain["side"] == "call").to_numpy()
+    frame = pd.DataFrame({"strike": chain["strike"].to_numpy(dtype=float),
+                          "call_gex": np.where(is_call, gex, 0.0), "put_gex": np.where(is_call, 0.0, gex)})
+    profile = frame.groupby("strike", as_index=False).sum()
+    profile["net_gex"] = profile["call_gex"] + profile["put_gex"]
+    return profile
+
+def _flip_levels(chains):
+    """Zero crossing of total GEX for every ticker in one pass.
+
+    All tickers' contracts are stacked and gamma is evaluated on the same relative grid of spots
+    (spot * (1 +/- FLIP_RANGE)), then summed per ticker with a bincount over the grid.
+    """
+    tickers = list(chains)
+    grid = np.linspace(1 - FLIP_RANGE, 1 + FLIP_RANGE, FLIP_STEPS)
+    strikes, t, sigma, weight, spot, owner = [], [], [], [], [], []
+    for i, ticker in enumerate(tickers):
+        chain, s = chains[ticker]
+        usable = chain[np.isfinite(chain["iv"].to_numpy(dtype=float)) & (chain["iv"] > 0)] if not chain.empty else chain
+        if usable.empty:
+            continue
+        strikes.append(usable["strike"].to_numpy(dtype=float))
+        t.append(np.maximum(usable["dte"].to_numpy(dtype=float), MIN_DTE_DAYS) / 365)
+        sigma.append(usable["iv"].to_numpy(dtype=float))
+        weight.append(_signed_oi(usable))
+        spot.append(np.full(len(usable), s))
+        owner.append(np.full(len(usable), i))
+    levels = dict.fromkeys(tickers)
+    if not strikes:
+        return levels
+    strikes, t, sigma, weight, spot, owner = (np.concatenate(a) for a in (strikes, t, sigma, weight, spot, owner))
+
+    totals = np.zeros(len(tickers) * FLIP_STEPS)
+    # contracts x grid blocks: gamma and exposure at every hypothetical spot, bounded in memory
+    for start in range(0, len(strikes), FLIP_CHUNK):
+        block = slice(start, start + FLIP_CHUNK)
+        spots = spot[block, None] * grid[None, :]
+        gamma = bs_gamma(spots, strikes[block, None], t[block, None], sigma[block, None], RISK_FREE_RATE)
+        gex = weight[block, None] * gamma * spots * spots * 0.01
+        cells = owner[block, None] * FLIP_STEPS + np.arange(FLIP_STEPS)[None, :]
+        totals += np.bincount(cells.ravel(), weights=gex.ravel(), minlength=totals.size)
+    totals = totals.reshape(len(tickers), FLIP_STEPS)
+
+    for i, ticker in enumerate(tickers):
+        curve = totals[i]
+        crossings = np.flatnonzero(np.sign(curve[:-1]) * np.sign(curve[1:]) < 0)
+        if not crossings.size:
+            continue
+        # The crossing nearest the current spot (grid midpoint), linearly interpolated
+        j = crossings[np.argmin(np.abs(crossings - FLIP_STEPS // 2))]
+        x0, x1 = grid[j], grid[j + 1]
+        level = x0 - curve[j] * (x1 - x0) / (curve[j + 1] - curve[j])
+        levels[ticker] = round(float(level * chains[ticker][1]), 2)
+    return levels
+
+def _summary(chain, spot, flip):
+    profile = strike_profile(chain, spot)
+    if profile.empty:
+        return {"netGex": 0.0, "callGex": 0.0, "putGex": 0.0, "gammaFlip": flip,
+                "callWall": None, "putWall": None, "regime": "n/a", "profile": []}, profile
+    call_gex, put_gex = float(profile["call_gex"].sum()), float(profile["put_gex"].sum())
+    net = call_gex + put_gex
+    near = profile[(profile["strike"] >= spot * (1 - PROFILE_RANGE)) & (profile["strike"] <= spot * (1 + PROFILE_RANGE))]
+    summary = {
+        "netGex": round(net, 2),
+        "callGex": round(call_gex, 2),
+        "putGex": round(put_gex, 2),
+        "gammaFlip": flip,
+        "callWall": float(profile.loc[profile["call_gex"].idxmax(), "strike"]),
+        "putWall": float(profile.loc[profile["put_gex"].idxmin(), "strike"]),
+        "regime": "positive" if net >= 0 else "negative",
+        "profile": [{"strike": float(r.strike), "callGex": round(float(r.call_gex), 2),
+                     "putGex": round(float(r.put_gex), 2), "netGex": round(float(r.net_gex), 2)}
+                    for r in near.itertuples(index=False)],
+    }
+    return summary, profile
+
+def gamma_levels(chains):
+    """{ticker: (priced chain, spot)} -> {ticker: (summary dict, per-strike profile DataFrame)}."""
+    flips = _flip_levels(chains)
+    return {ticker: _summary(chain, spot, flips[ticker]) for ticker, (chain, spot) in chains.items()}
+
+def snapshot_fields(summary):
+    """Scalar GEX levels stored on the daily options_history row, which doubles as the per-date cache."""
+    return {"net_gex": summary["netGex"], "gamma_flip": summary["gammaFlip"],
+            "call_wall": summary["callWall"], "put_wall": summary["putWall"]}
+
+def record_profile(ticker, date_str, profile, reports_dir="reports"):
+    if profile.empty or not is_live():
+        return
+    rows = profile.assign(date=date_str)[["date", "strike", "call_gex", "put_gex", "net_gex"]]
+    upsert_parquet(os.path.join(reports_dir, ticker, GAMMA_FILE), rows, key=["date", "strike"])
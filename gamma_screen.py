@@ -0,0 +1,155 @@
+"""
+Universe-wide gamma wall screen.
+
+Reads every ticker's GEX levels for the session from reports/<TICKER>/options_history.parquet, where
+fetch_options_data.py caches them per date. With --fetch, tickers without levels for the session are
+fetched concurrently, priced and run through gamma_exposure in one batch, then cached the same way.
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from config import OPTIONS_MAX_DTE
+from run_metrics import metrics, add_profile_args
+from http_sessions import install_dns_cache, yf_session
+from provider_calls import call
+from options_chain import fetch_chain, last_close
+from options_history import load_history, chain_snapshot, record_snapshot
+from greeks import chain_greeks
+from gamma_exposure import gamma_levels, snapshot_fields, record_profile
+from replay_providers import add_cassette_args, cassette
+from utils import LazyImport
+
+yf = LazyImport("yfinance")
+pd = LazyImport("pandas")
+
+WATCHLIST_FILE = "alpha_watchlist.json"
+FETCH_WORKERS = 4
+NEAR_WALL_PCT = 2.0
+
+def default_tickers():
+    if os.path.exists(WATCHLIST_FILE):
+        with open(WATCHLIST_FILE, "r") as f:
+            return json.load(f).get("tickers", [])
+    from run_alpha_pipeline import TICKERS
+    return TICKERS
+
+def cached_levels(ticker, date_str):
+    """The ticker's cached row for the session, or None when it is missing or predates GEX caching."""
+    history = load_history(ticker)
+    if history.empty or "net_gex" not in history:
+        return None
+    rows = history[(history["date"] == date_str) & history["net_gex"].notna()]
+    return rows.iloc[-1].to_dict() if not rows.empty else None
+
+def fetch_priced(ticker):
+    stock = yf.Ticker(ticker, session=yf_session())
+    with metrics.stage(ticker, "history", "yfinance"):
+        bars = call("yfinance", stock.history, period='5d')
+    if bars.empty:
+        raise ValueError(f"No price data found for {ticker}")
+    spot = float(bars['Close'].iloc[-1])
+    chain = fetch_chain(ticker, stock, max_dte=OPTIONS_MAX_DTE)
+    with metrics.stage(ticker, "greeks"):
+        priced = chain_greeks(chain, spot)
+    return bars.index[-1].strftime('%Y-%m-%d'), spot, chain, priced
+
+def refresh(tickers):
+    """Fetch and price the tickers concurrently, compute all their GEX levels in one batch and cache them."""
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = {ticker: executor.submit(fetch_priced, ticker) for ticker in tickers}
+        for ticker, future in futures.items():
+            try:
+                fetched[ticker] = future.result()
+            except Exception as e:
+                print(f"Error fetching {ticker}: {e}")
+
+    with metrics.stage("ALL", "gamma"):
+        levels = gamma_levels({t: (priced, spot) for t, (_, spot, _, priced) in fetched.items()})
+    rows = {}
+    for ticker, (date_str, spot, chain, _) in fetched.items():
+        summary, profile = levels[ticker]
+        # Keep the ATM IV fetch_options_data stored for the day; the screen doesn't derive one
+        history = load_history(ticker)
+        same_day = history[history["date"] == date_str] if not history.empty else history
+        atm_iv = same_day["atm_iv"].iloc[-1] if not same_day.empty and "atm_iv" in same_day else None
+        snapshot = chain_snapshot(chain, date_str, spot, atm_iv=atm_iv if pd.notna(atm_iv) else None)
+        snapshot.update(snapshot_fields(summary))
+        record_profile(ticker, date_str, profile)
+        record_snapshot(ticker, snapshot, chain)
+        rows[ticker] = snapshot
+    return rows
+
+def _distance(level, close):
+    return round((level - close) / close * 100, 2) if level is not None and pd.notna(level) else None
+
+def screen_row(ticker, row, source):
+    close = row["close"]
+    flip = row.get("gamma_flip")
+    item = {
+        "ticker": ticker, "date": row["date"], "source": source, "close": round(close, 2),
+        "netGex": row["net_gex"], "regime": "positive" if row["net_gex"] >= 0 else "negative",
+        "gammaFlip": flip if pd.notna(flip) else None, "flipDistPct": _distance(flip, close),
+        "callWall": row["call_wall"], "callWallDistPct": _distance(row["call_wall"], close),
+        "putWall": row["put_wall"], "putWallDistPct": _distance(row["put_wall"], close),
+    }
+    walls = [abs(d) for d in (item["callWallDistPct"], item["putWallDistPct"]) if d is not None]
+    item["nearestWallPct"] = min(walls) if walls else None
+    item["nearWall"] = item["nearestWallPct"] is not None and item["nearestWallPct"] <= NEAR_WALL_PCT
+    return item
+
+def run_screen(tickers, date_str, fetch=False):
+    results, missing = [], []
+    for ticker in tickers:
+        row = cached_levels(ticker, date_str)
+        if row:
+            results.append(screen_row(ticker, row, "cache"))
+        else:
+            missing.append(ticker)
+    if missing and fetch:
+        for ticker, row in refresh(missing).items():
+            results.append(screen_row(ticker, row, "fetched"))
+            missing.remove(ticker)
+    results.sort(key=lambda item: item["nearestWallPct"] if item["nearestWallPct"] is not None else float("inf"))
+    return results, missing
+
+def print_screen(results, missing, date_str):
+    print(f"Gamma wall screen for {date_str}: {len(results)} tickers")
+    print(f"  {'TICKER':<8}{'CLOSE':>10}{'NET GEX':>14}  {'FLIP':>9}{'CALL WALL':>11}{'PUT WALL':>10}  NEAREST")
+    for item in results:
+        flip = f"{item['gammaFlip']:.2f}" if item["gammaFlip"] is not None else "--"
+        flag = " *" if item["nearWall"] else ""
+        print(f"  {item['ticker']:<8}{item['close']:>10.2f}{item['netGex'] / 1e6:>13.1f}M  {flip:>9}"
+              f"{item['callWall']:>11.2f}{item['putWall']:>10.2f}  {item['nearestWallPct']}%{flag}")
+    if missing:
+        print(f"No GEX levels cached for {date_str}: {', '.join(missing)} (run with --fetch)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen the watchlist for gamma walls")
+    parser.add_argument('--tickers', type=str, nargs='+', help='Tickers to screen (default: the watchlist)')
+    parser.add_argument('--date', type=str, help='Session date YYYY-MM-DD (default: the last close)')
+    parser.add_argument('--fetch', action='store_true', help='Fetch and compute tickers without cached levels')
+    parser.add_argument('--output', type=str, help='Write the screen as JSON (default: daily_signals/<date>/)')
+    add_cassette_args(parser)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    install_dns_cache()
+    if args.profile:
+        metrics.enable_profiling(args.profile, "gamma_screen")
+
+    date_str = args.date or last_close().strftime('%Y-%m-%d')
+    with cassette(args, sys.modules[__name__]):
+        results, missing = run_screen(args.tickers or default_tickers(), date_str, fetch=args.fetch)
+    print_screen(results, missing, date_str)
+
+    output = args.output or os.path.join("daily_signals", date_str, f"Gamma_Screen_{date_str}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"date": date_str, "results": results, "missing": missing}, f, indent=2, default=float)
+    print(f"Screen saved to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@ import json
 import os
 import argparse
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 from generate_playbook_report import update_index, generate_html
+from run_metrics import metrics, add_profile_args
 
 def update_dashboard(target_dest="docs/index.html"):
     """Generate the dynamic dashboard with the ticker list."""
     print(f"Updating dynamic dashboard at {target_dest}...")
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     try:
         env = Environment(
             loader=FileSystemLoader('templates'),
@@ -38,7 +40,10 @@ def main():
     parser = argparse.ArgumentParser(description="Generate Options Playbook Report")
     parser.add_argument('--ticker', type=str, required=True, help='Stock Ticker Symbol')
     parser.add_argument('--template', type=str, default='options_template.html', help='Jinja template file')
+    add_profile_args(parser)
     args = parser.parse_args()
+    if args.profile:
+        metrics.enable_profiling(args.profile, "generate_options_report")
 
     ticker_dir = f"reports/{args.ticker}"
     latest_json = f"{ticker_dir}/latest.json"
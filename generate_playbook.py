@@ -5,17 +5,24 @@ import argparse
 def main():
     parser = argparse.ArgumentParser(description="Generate Stock Playbook (Legacy Wrapper)")
     parser.add_argument('--ticker', type=str, required=True, help='Stock Ticker Symbol')
+    parser.add_argument('--skip-deploy', action='store_true', help='Leave deployment to a batched deploy_reports.py --tickers run')
+    parser.add_argument('--profile', nargs='?', const='profiling', default=None, metavar='DIR',
+                        help='Pass --profile through to the fetch and report steps')
     args = parser.parse_args()
+    profile = ["--profile", args.profile] if args.profile else []
 
     print(f"--- 1. Fetching Playbook Data for {args.ticker} ---")
-    subprocess.run([sys.executable, "fetch_playbook_data.py", "--ticker", args.ticker], check=True)
+    subprocess.run([sys.executable, "fetch_playbook_data.py", "--ticker", args.ticker, *profile], check=True)
     
     print(f"\n--- 2. Generating Playbook Report for {args.ticker} ---")
-    subprocess.run([sys.executable, "generate_playbook_report.py", "--ticker", args.ticker], check=True)
+    subprocess.run([sys.executable, "generate_playbook_report.py", "--ticker", args.ticker, *profile], check=True)
     
     print(f"\n--- 3. Capturing Dashboard Screenshot for {args.ticker} ---")
     subprocess.run([sys.executable, "capture_report.py", "--ticker", args.ticker, "--format", "png"], check=True)
     
+    if args.skip_deploy:
+        return
+
     print(f"\n--- 4. Deploying Reports for {args.ticker} ---")
     subprocess.run([sys.executable, "deploy_reports.py", "--ticker", args.ticker], check=True)
 
@@ -2,10 +2,14 @@ import json
 import os
 import argparse
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-def generate_html(data, template_name='hud_template.html'):
-    """Generate the final HTML report using Jinja2."""
+from run_metrics import metrics, add_profile_args
+from utils import load_history_dates
+
+def generate_html(data, template_name='hud_template.html', suffix=''):
+    """Generate the final HTML report using Jinja2, as reports/<ticker>/<date><suffix>.html."""
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     try:
         env = Environment(
             loader=FileSystemLoader('templates'),
@@ -19,12 +23,14 @@ def generate_html(data, template_name='hud_template.html'):
         context['chart_data_json'] = json.dumps(data.get('chart_data', []))
         context['ema_data_json'] = json.dumps(data.get('ema_data', {}))
         
-        html = template.render(**context)
+        with metrics.stage(data['ticker'], "render") as m:
+            html = template.render(**context)
+            m.add_bytes(html)
         
         ticker_dir = f"reports/{data['ticker']}"
         os.makedirs(ticker_dir, exist_ok=True)
         
-        out_html = f"{ticker_dir}/{datetime.now().strftime('%Y-%m-%d')}.html"
+        out_html = f"{ticker_dir}/{datetime.now().strftime('%Y-%m-%d')}{suffix}.html"
         with open(out_html, 'w') as f:
             f.write(html)
         return out_html
@@ -37,6 +43,8 @@ def generate_html(data, template_name='hud_template.html'):
 def update_index(target_dest=None):
     """Scan reports directory and generate an index.html archive page."""
     print(f"Updating reports index at {target_dest or 'default'}...")
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     try:
         env = Environment(
             loader=FileSystemLoader('templates'),
@@ -55,6 +63,10 @@ def update_index(target_dest=None):
             if os.path.isdir(ticker_path):
                 ticker_reports = []
                 for f in sorted(os.listdir(ticker_path), reverse=True):
+                    # generate_reports.py writes the options dashboard next to the day's playbook; the
+                    # archive lists one report per day, the playbook
+                    if f.endswith('_options.html'):
+                        continue
                     if f.endswith('.html') and f != 'index.html' and f != 'latest.html':
                         date_str = f.replace('.html', '')
                         ticker_reports.append({
@@ -62,7 +74,11 @@ def update_index(target_dest=None):
                             "date": date_str
                         })
                         total_reports += 1
+                # Days folded into history/ by compact_reports.py have no HTML left, only a count
                 if ticker_reports:
+                    for date_str in load_history_dates(ticker_path):
+                        ticker_reports.append({"filename": None, "date": date_str, "archived": True})
+                        total_reports += 1
                     archive[ticker] = ticker_reports
         
         is_root = target_dest and 'reports' not in target_dest
@@ -89,7 +105,10 @@ def main():
     parser = argparse.ArgumentParser(description="Generate Playbook Report")
     parser.add_argument('--ticker', type=str, required=True, help='Stock Ticker Symbol')
     parser.add_argument('--template', type=str, default='hud_template.html', help='Jinja template file')
+    add_profile_args(parser)
     args = parser.parse_args()
+    if args.profile:
+        metrics.enable_profiling(args.profile, "generate_playbook_report")
 
     ticker_dir = f"reports/{args.ticker}"
     latest_json = f"{ticker_dir}/latest.json"
@@ -0,0 +1,79 @@
+"""
+Every playbook for a ticker from one data pass.
+
+ticker_dataset.acquire() fetches history, fundamentals, TradingView and, as far as the requested
+reports need them, the full option chain and the RSS feeds once; each requested report is rendered
+from it in this process:
+
+    reports/<T>/<date>.html           HUD (generate_playbook_report.py)
+    reports/<T>/<date>_options.html   options dashboard (generate_options_report.py)
+    <T>_Alpha.html                    standalone dossier (alpha_standalone.py)
+
+The saved JSON (<date>.json, latest.json) is the options payload when the options report is requested
+(a superset of the HUD one, with the same IV), else the HUD payload, and is not written for the
+standalone dossier alone, so the single-report scripts still re-render from it.
+"""
+import sys
+import argparse
+
+from http_sessions import install_dns_cache
+from run_metrics import metrics, add_profile_args
+from replay_providers import add_cassette_args, cassette
+from fetch_options_data import save_json, save_series_json
+from generate_playbook_report import generate_html, update_index
+import alpha_standalone
+import ticker_dataset
+
+OUTPUTS = ("hud", "options", "standalone")
+
+def generate_reports(ticker, outputs=OUTPUTS, chain_provider=ticker_dataset.OPTIONS_CHAIN_PROVIDER):
+    """Acquire `ticker` once and write each requested report; returns {output: path}, or None without data."""
+    # Only the options report needs the full chain; the HUD and the dossier read just the IV
+    dataset = ticker_dataset.acquire(ticker, options="chain" if "options" in outputs else "iv",
+                                     rss="standalone" in outputs, chain_provider=chain_provider)
+    if dataset is None:
+        return None
+
+    hud = ticker_dataset.hud_data(dataset) if "hud" in outputs else None
+    data = ticker_dataset.options_data(dataset) if "options" in outputs else hud
+    if data is not None:
+        json_path = save_json(data, ticker)
+        print(f"JSON Data saved to: {json_path}")
+        save_series_json(ticker, data.get('chart_data', []), data.get('ema_data', {}))
+
+    paths = {}
+    if "hud" in outputs:
+        paths["hud"] = generate_html(hud)
+    if "options" in outputs:
+        paths["options"] = generate_html(data, 'options_template.html', suffix='_options')
+    if "standalone" in outputs:
+        paths["standalone"] = alpha_standalone.generate_html(ticker_dataset.standalone_data(dataset))
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate every playbook for a ticker from one data pass")
+    parser.add_argument('--ticker', type=str, required=True, help='Stock Ticker Symbol')
+    parser.add_argument('--outputs', nargs='+', choices=OUTPUTS, default=list(OUTPUTS), help='Reports to render')
+    parser.add_argument('--chain-provider', choices=['yfinance', 'tradier'],
+                        default=ticker_dataset.OPTIONS_CHAIN_PROVIDER,
+                        help='Option chain source (default: OPTIONS_CHAIN_PROVIDER)')
+    add_cassette_args(parser)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    install_dns_cache()
+    if args.profile:
+        metrics.enable_profiling(args.profile, "generate_reports")
+
+    with cassette(args, sys.modules[__name__], ticker_dataset, alpha_standalone):
+        paths = generate_reports(args.ticker, args.outputs, args.chain_provider)
+    if paths is None:
+        sys.exit(1)
+    for output, path in paths.items():
+        if path:
+            print(f"{output} report saved to: {path}")
+
+    update_index()
+    update_index(target_dest="index.html")
+
+if __name__ == "__main__":
+    main()
@@ -337,16 +337,19 @@ def fetch_ticker_data(ticker):
     
     supply_chain_claims = []
     
+    # One pooled keep-alive client for every feed instead of a fresh TLS handshake per feed
+    client = httpx.Client(timeout=5.0, follow_redirects=True,
+                          limits=httpx.Limits(max_connections=10, max_keepalive_connections=10))
+
     # helper
     def fetch_rss(source, url):
         print(f"DEBUG: Fetching RSS {source}...", flush=True)
         try:
-            with httpx.Client(timeout=5.0, follow_redirects=True) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                feed = feedparser.parse(response.text)
-                print(f"DEBUG: Successfully fetched RSS {source}", flush=True)
-                return source, feed.entries
+            response = client.get(url)
+            response.raise_for_status()
+            feed = feedparser.parse(response.text)
+            print(f"DEBUG: Successfully fetched RSS {source}", flush=True)
+            return source, feed.entries
         except Exception as e:
             print(f"ERROR: Failed to fetch RSS {source}: {e}", flush=True)
             return source, []
@@ -367,6 +370,7 @@ def fetch_ticker_data(ticker):
                     })
             except Exception as e:
                 print(f"ERROR: Future result failed: {e}", flush=True)
+    client.close()
 
     print(f"DEBUG: RSS Fetch Complete. Found {len(rss_items)} items.", flush=True)
 
@@ -796,6 +800,13 @@ def update_index(target_dest=None):
                             "date": date_str
                         })
                         total_reports += 1
+                # Days folded into history/ by compact_reports.py only survive as dates
+                history_dates = os.path.join(ticker_path, 'history_dates.json')
+                if ticker_reports and os.path.exists(history_dates):
+                    with open(history_dates, 'r') as hf:
+                        for date_str in json.load(hf):
+                            ticker_reports.append({"filename": None, "date": date_str, "archived": True})
+                            total_reports += 1
                 if ticker_reports:
                     archive[ticker] = ticker_reports
         
@@ -1,33 +1,73 @@
 import json
+import argparse
 import subprocess
 import time
 
+from run_metrics import start_run, finish_run
+from scheduler import Deadline, plan_run, print_plan, skip_record
+
 WATCHLIST_FILE = "alpha_watchlist.json"
 SCRIPT_PATH = "generate_playbook.py"
+DEPLOY_SCRIPT = "deploy_reports.py"
+DEPLOY_RESERVE_S = 180
 
-def run_pulse():
+def run_pulse(deadline_minutes=None):
     print(f"--- GHOST PULSE START: {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
     
     try:
         with open(WATCHLIST_FILE, 'r') as f:
             config = json.load(f)
             tickers = config.get("tickers", [])
+            tiers = config.get("tiers", {})
     except Exception as e:
         print(f"Error loading watchlist: {e}")
         return
 
-    for ticker in tickers:
+    metrics_path, started_at = start_run()
+    # Keep time back for the batched deploy so finished reports always ship
+    deadline = Deadline(deadline_minutes * 60, reserve_s=DEPLOY_RESERVE_S) if deadline_minutes else None
+    plan = plan_run(tickers, "ghost_pulse", tiers)
+    print_plan(plan, deadline)
+    ticker_runs = []
+    skipped = []
+    done = []
+    for item in plan:
+        ticker = item["ticker"]
+        if deadline and not deadline.fits(item["estimate_s"]):
+            print(f"\n[-] SKIPPED: {ticker} (~{item['estimate_s']:.0f}s estimated, {max(deadline.remaining(), 0):.0f}s left)")
+            skipped.append(skip_record(item, deadline))
+            continue
         print(f"\n[!] PROCESSING: {ticker}")
+        start = time.perf_counter()
         try:
-            # Run the playbook generator
-            subprocess.run(["python3", SCRIPT_PATH, "--ticker", ticker], check=True)
+            # Run the playbook generator; deployment happens once for the whole batch below
+            subprocess.run(["python3", SCRIPT_PATH, "--ticker", ticker, "--skip-deploy"], check=True,
+                           timeout=max(deadline.remaining(), 1) if deadline else None)
+            done.append(ticker)
             print(f"[+] SUCCESS: {ticker}")
         except subprocess.CalledProcessError as e:
             print(f"[-] FAILED: {ticker} (Exit code: {e.returncode})")
+        except subprocess.TimeoutExpired:
+            print(f"[-] TIMEOUT: {ticker} (killed at the run deadline)")
         except Exception as e:
             print(f"[-] ERROR: {ticker} - {e}")
+        ticker_runs.append({"ticker": ticker, "wall_s": round(time.perf_counter() - start, 3),
+                            "status": "ok" if ticker in done else "failed"})
+
+    if done:
+        print(f"\n[!] DEPLOYING {len(done)} TICKERS")
+        try:
+            subprocess.run(["python3", DEPLOY_SCRIPT, "--tickers", *done, "--snapshot"], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"[-] DEPLOY FAILED (Exit code: {e.returncode})")
             
     print(f"\n--- GHOST PULSE COMPLETE ---")
+    finish_run(metrics_path, started_at, pipeline="ghost_pulse", ticker_runs=ticker_runs, skipped_tickers=skipped,
+               schedule={"deadline_s": deadline.budget_s if deadline else None, "plan": plan})
 
 if __name__ == "__main__":
-    run_pulse()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Ghost Pulse watchlist run")
+    parser.add_argument('--deadline-minutes', type=float, default=None,
+                        help='Stop starting tickers that will not finish (plus deploy) within this many minutes')
+    args = parser.parse_args()
+    run_pulse(args.deadline_minutes)
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Vectorized Black-Scholes-Merton pricing, greeks and implied volatility.
+
+Every function takes NumPy arrays (or scalars that broadcast) so a whole option chain is priced in a
+handful of array operations instead of a Python loop per contract.
+"""
+from config import RISK_FREE_RATE
+from utils import LazyImport
+
+np = LazyImport("numpy")
+pd = LazyImport("pandas")
+
+SQRT_2PI = 2.5066282746310002
+# Same-day expiries still get a quarter of a day so 1/sqrt(T) stays finite
+MIN_DTE_DAYS = 0.25
+IV_LOW, IV_HIGH = 1e-4, 5.0
+IV_TOLERANCE = 1e-6
+IV_MAX_ITER = 60
+CONTRACT_SIZE = 100
+
+# --- Normal distribution ---
+def _erfc(x):
+    """Complementary error function (Chebyshev fit, fractional error < 1.2e-7), numpy only."""
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    result = t * np.exp(poly)
+    return np.where(x >= 0, result, 2.0 - result)
+
+def norm_cdf(x):
+    return 0.5 * _erfc(-np.asarray(x, dtype=float) / np.sqrt(2.0))
+
+def norm_pdf(x):
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+# --- Pricing ---
+def _d1_d2(spot, strike, t, r, q, sigma):
+    vol_t = sigma * np.sqrt(t)
+    d1 = (np.log(spot / strike) + (r - q + 0.5 * sigma * sigma) * t) / vol_t
+    return d1, d1 - vol_t
+
+def _price_and_vega(spot, strike, t, sigma, is_call, r, q):
+    """Prices and raw vega (per unit of vol); puts come from put-call parity to save two CDF evaluations."""
+    d1, d2 = _d1_d2(spot, strike, t, r, q, sigma)
+    disc_spot, disc_strike = spot * np.exp(-q * t), strike * np.exp(-r * t)
+    call = disc_spot * norm_cdf(d1) - disc_strike * norm_cdf(d2)
+    price = np.where(is_call, call, call - disc_spot + disc_strike)
+    return price, disc_spot * norm_pdf(d1) * np.sqrt(t)
+
+def bs_price(spot, strike, t, sigma, is_call, r=RISK_FREE_RATE, q=0.0):
+    spot, strike, t, sigma = (np.asarray(a, dtype=float) for a in (spot, strike, t, sigma))
+    return _price_and_vega(spot, strike, t, sigma, is_call, r, q)[0]
+
+def bs_greeks(spot, strike, t, sigma, is_call, r=RISK_FREE_RATE, q=0.0):
+    """Delta, gamma (per $1), vega (per vol point) and theta (per calendar day) for each contract."""
+    spot, strike, t, sigma = (np.asarray(a, dtype=float) for a in (spot, strike, t, sigma))
+    d1, d2 = _d1_d2(spot, strike, t, r, q, sigma)
+    div_disc, rate_disc = np.exp(-q * t), np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+    sqrt_t = np.sqrt(t)
+
+    decay = -spot * div_disc * pdf_d1 * sigma / (2 * sqrt_t)
+    call_theta = decay - r * strike * rate_disc * cdf_d2 + q * spot * div_disc * cdf_d1
+    put_theta = decay + r * strike * rate_disc * (1 - cdf_d2) - q * spot * div_disc * (1 - cdf_d1)
+    return {
+        "delta": np.where(is_call, div_disc * cdf_d1, div_disc * (cdf_d1 - 1)),
+        "gamma": div_disc * pdf_d1 / (spot * sigma * sqrt_t),
+        "vega": spot * div_disc * pdf_d1 * sqrt_t / 100,
+        "theta": np.where(is_call, call_theta, put_theta) / 365,
+    }
+
+def bs_gamma(spot, strike, t, sigma, r=RISK_FREE_RATE, q=0.0):
+    """Gamma alone (same for calls and puts); cheap enough to evaluate a chain over a grid of spots."""
+    d1, _ = _d1_d2(spot, strike, t, r, q, sigma)
+    return np.exp(-q * t) * norm_pdf(d1) / (spot * sigma * np.sqrt(t))
+
+def implied_vol(price, spot, strike, t, is_call, r=RISK_FREE_RATE, q=0.0):
+    """Implied volatility for every contract at once: Newton steps kept inside a shrinking bisection bracket.
+
+    Prices outside the no-arbitrage bounds have no solution and come back as NaN, as do prices above
+    the model price at IV_HIGH and contracts still unsolved after IV_MAX_ITER steps.
+    """
+    price, spot, strike, t = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, spot, strike, t)))
+    is_call = np.broadcast_to(is_call, price.shape)
+    disc_spot, disc_strike = spot * np.exp(-q * t), strike * np.exp(-r * t)
+    lower = np.where(is_call, np.maximum(disc_spot - disc_strike, 0), np.maximum(disc_strike - disc_spot, 0))
+    upper = np.where(is_call, disc_spot, disc_strike)
+    valid = np.isfinite(price) & (price > lower) & (price < upper) & (t > 0) & (strike > 0)
+
+    # Start at the inflection point of price(sigma) (Manaster-Koehler), from which Newton converges
+    # monotonically; near the money that is ~0, so fall back to the Brenner-Subrahmanyam estimate there
+    idx = np.flatnonzero(valid)
+    s, k, tt, p, c = spot.ravel()[idx], strike.ravel()[idx], t.ravel()[idx], price.ravel()[idx], is_call.ravel()[idx]
+    # The bracket tops out at IV_HIGH; a price beyond it would otherwise "converge" onto the cap
+    in_bracket = p < _price_and_vega(s, k, tt, np.full(idx.size, IV_HIGH), c, r, q)[0]
+    idx, s, k, tt, p, c = (a[in_bracket] for a in (idx, s, k, tt, p, c))
+    inflection = np.sqrt(2 * np.abs(np.log(s / k) + (r - q) * tt) / tt)
+    sig = np.clip(np.maximum(inflection, np.sqrt(2 * np.pi / tt) * p / s), 0.05, IV_HIGH / 2)
+    lo, hi = np.full(idx.size, IV_LOW), np.full(idx.size, IV_HIGH)
+
+    result = np.full(price.size, np.nan)
+    for _ in range(IV_MAX_ITER):
+        if not idx.size:
+            break
+        model, vega = _price_and_vega(s, k, tt, sig, c, r, q)
+        diff = model - p
+        hi = np.where(diff > 0, sig, hi)
+        lo = np.where(diff <= 0, sig, lo)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = sig - diff / vega
+        # Newton steps that leave the bracket (flat vega far from the money) fall back to bisection
+        step = np.where(np.isfinite(step) & (step > lo) & (step < hi), step, 0.5 * (lo + hi))
+
+        done = (np.abs(diff) < IV_TOLERANCE) | (np.abs(step - sig) < IV_TOLERANCE) | (hi - lo < IV_TOLERANCE)
+        result[idx[done]] = sig[done]
+        # Converged contracts drop out so later iterations only touch the stragglers
+        keep = ~done
+        idx, s, k, tt, p, c, lo, hi, sig = (a[keep] for a in (idx, s, k, tt, p, c, lo, hi, step))
+    return result.reshape(price.shape)
+
+# --- Chains ---
+def mid_prices(chain):
+    """Bid/ask midpoint where the quote is two-sided, else the last trade."""
+    bid = chain["bid"].to_numpy(dtype=float) if "bid" in chain else np.full(len(chain), np.nan)
+    ask = chain["ask"].to_numpy(dtype=float) if "ask" in chain else np.full(len(chain), np.nan)
+    last = chain["lastPrice"].to_numpy(dtype=float) if "lastPrice" in chain else np.full(len(chain), np.nan)
+    quoted = (bid > 0) & (ask >= bid)
+    return np.where(quoted, (bid + ask) / 2, last)
+
+def chain_greeks(chain, spot, r=RISK_FREE_RATE, q=0.0):
+    """Copy of a fetch_chain frame with `mid`, `iv`, `delta`, `gamma`, `vega` and `theta` columns.
+
+    `iv` is solved from the mid price (a fraction, like yfinance's impliedVolatility); when the mid has
+    no solution the provider's IV is used instead, and contracts with neither get NaN greeks.
+    """
+    out = chain.copy()
+    if chain.empty:
+        for column in ("mid", "iv", "delta", "gamma", "vega", "theta"):
+            out[column] = pd.Series(dtype=float)
+        return out
+    strike = chain["strike"].to_numpy(dtype=float)
+    t = np.maximum(chain["dte"].to_numpy(dtype=float), MIN_DTE_DAYS) / 365
+    is_call = (chain["side"] == "call").to_numpy()
+    mid = mid_prices(chain)
+
+    iv = implied_vol(mid, spot, strike, t, is_call, r, q)
+    if "impliedVolatility" in chain:
+        quoted_iv = chain["impliedVolatility"].to_numpy(dtype=float)
+        # yfinance reports ~0 for contracts it couldn't solve; treat those as missing too
+        iv = np.where(np.isnan(iv) & (quoted_iv > 0.01), quoted_iv, iv)
+
+    out["mid"] = mid
+    out["iv"] = iv
+    with np.errstate(divide="ignore", invalid="ignore"):
+        greeks = bs_greeks(spot, strike, t, iv, is_call, r, q)
+    for name, values in greeks.items():
+        out[name] = values
+    return out
+
+def exposure_totals(chain):
+    """Open-interest weighted greeks per side: share-equivalent delta, gamma per $1, vega per vol point
+    and theta per day, all in dollars per 100-share contract."""
+    names = ("delta", "gamma", "vega", "theta")
+    totals = {}
+    for side in ("call", "put"):
+        rows = chain[chain["side"] == side] if "delta" in chain else chain.iloc[0:0]
+        if rows.empty:
+            totals[side] = dict.fromkeys(names, 0.0)
+            continue
+        oi = rows["openInterest"].fillna(0).to_numpy(dtype=float) * CONTRACT_SIZE
+        totals[side] = {name: round(float(np.nansum(rows[name].to_numpy(dtype=float) * oi)), 2) for name in names}
+    totals["net"] = {name: round(totals["call"][name] + totals["put"][name], 2) for name in totals["call"]}
+    return totals
+
+def strike_table(chain, spot, expiration, strikes=10):
+    """Call and put greeks side by side for the `strikes` strikes nearest the spot in one expiration."""
+    rows = chain[chain["expiration"] == expiration]
+    if rows.empty:
+        return []
+    nearest = np.sort(rows["strike"].unique())
+    nearest = nearest[np.argsort(np.abs(nearest - spot), kind="stable")[:strikes]]
+    by_side = {side: rows[rows["side"] == side].set_index("strike") for side in ("call", "put")}
+
+    def value(side, strike, column, digits):
+        frame = by_side[side]
+        if strike not in frame.index:
+            return None
+        v = frame.loc[strike, column]
+        v = float(v.iloc[0] if hasattr(v, "iloc") else v)
+        return round(v, digits) if np.isfinite(v) else None
+
+    table = []
+    for strike in np.sort(nearest):
+        table.append({
+            "strike": float(strike),
+            "callIv": value("call", strike, "iv", 4), "putIv": value("put", strike, "iv", 4),
+            "callDelta": value("call", strike, "delta", 3), "putDelta": value("put", strike, "delta", 3),
+            "callGamma": value("call", strike, "gamma", 4), "putGamma": value("put", strike, "gamma", 4),
+            "callVega": value("call", strike, "vega", 3), "putVega": value("put", strike, "vega", 3),
+            "callTheta": value("call", strike, "theta", 3), "putTheta": value("put", strike, "theta", 3),
+        })
+    return table
@@ -0,0 +1,92 @@
+import time
+import atexit
+import socket
+import threading
+import importlib.util
+
+DNS_TTL = 300
+POOL_CONNECTIONS = 20
+POOL_KEEPALIVE = 10
+KEEPALIVE_EXPIRY = 30.0
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+_lock = threading.Lock()
+_sessions = {}
+
+# --- DNS cache ---
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_real_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_lock:
+        hit = _dns_cache.get(key)
+    if hit and now - hit[0] < DNS_TTL:
+        return hit[1]
+    # Resolve outside the lock: a slow lookup must not stall other threads' cache hits
+    result = _real_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        _dns_cache[key] = (now, result)
+    return result
+
+def install_dns_cache():
+    """Memoize getaddrinfo for DNS_TTL seconds so pooled clients stop re-resolving the same hosts.
+
+    This replaces socket.getaddrinfo for the whole process, so only the pipeline's own entry points
+    call it (from main()); importing this module leaves resolution alone.
+    """
+    socket.getaddrinfo = _cached_getaddrinfo
+
+# --- Shared sessions ---
+def _shared(name, factory, close):
+    with _lock:
+        if name not in _sessions:
+            _sessions[name] = factory()
+            atexit.register(close, _sessions[name])
+        return _sessions[name]
+
+def http_client():
+    """Process-wide httpx.Client: pooled keep-alive connections, HTTP/2 when `h2` is installed.
+
+    Thread-safe and shared by every caller, so don't use it in a `with` block or close it.
+    """
+    def factory():
+        import httpx
+
+        return httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=POOL_CONNECTIONS, max_keepalive_connections=POOL_KEEPALIVE,
+                                keepalive_expiry=KEEPALIVE_EXPIRY),
+            timeout=10.0, follow_redirects=True, headers={"User-Agent": USER_AGENT},
+        )
+    return _shared("httpx", factory, lambda client: client.close())
+
+def yf_session():
+    """Shared curl_cffi session for yf.Ticker(session=...); None lets yfinance build its own.
+
+    curl_cffi keeps a curl handle (and its connections) per thread; provider_calls runs calls on
+    reused worker threads so those handles stay warm between calls.
+    """
+    if importlib.util.find_spec("curl_cffi") is None:
+        return None
+
+    def factory():
+        from curl_cffi import requests as curl_requests
+
+        return curl_requests.Session(impersonate="chrome")
+    return _shared("yfinance", factory, lambda session: session.close())
+
+def requests_session():
+    """Shared requests.Session with a connection pool sized like the httpx one (Tradier, scripts)."""
+    def factory():
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_CONNECTIONS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    return _shared("requests", factory, lambda session: session.close())
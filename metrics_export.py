@@ -0,0 +1,122 @@
+import os
+import glob
+import time
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+PROM_TEXTFILE_ENV = "ALPHA_PROM_TEXTFILE"
+# (metric, manifest providers[] key, help) for the per-provider gauges
+PROVIDER_GAUGES = (
+    ("alpha_provider_requests", "requests", "Provider requests made in the last run."),
+    ("alpha_provider_errors", "errors", "Provider calls that raised in the last run."),
+    ("alpha_provider_bytes", "bytes", "Payload bytes received from the provider in the last run."),
+)
+
+def _labels(**labels):
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+        self._declared = set()
+
+    def declare(self, name, kind, help_text):
+        if name not in self._declared:
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+            self._declared.add(name)
+
+    def sample(self, name, value, **labels):
+        self.lines.append(f"{name}{_labels(**labels)} {float(value):.6g}")
+
+    def histogram(self, name, help_text, observations, **labels):
+        self.declare(name, "histogram", help_text)
+        for le in DURATION_BUCKETS:
+            self.sample(f"{name}_bucket", sum(1 for v in observations if v <= le), **labels, le=le)
+        self.sample(f"{name}_bucket", len(observations), **labels, le="+Inf")
+        self.sample(f"{name}_sum", sum(observations), **labels)
+        self.sample(f"{name}_count", len(observations), **labels)
+
+def artifact_sizes(date_str, roots=("reports",)):
+    """Bytes of today's artifacts by kind (html / json / series)."""
+    sizes = defaultdict(int)
+    for root in roots:
+        for path in glob.glob(os.path.join(root, "*", f"{date_str}*")):
+            name = os.path.basename(path)
+            kind = "series" if "_series" in name else name.rsplit(".", 1)[-1]
+            if kind in ("html", "json", "series"):
+                sizes[kind] += os.path.getsize(path)
+    for path in glob.glob("*_Alpha.html"):
+        sizes["dossier"] += os.path.getsize(path)
+    return dict(sizes)
+
+def render_textfile(manifest, date_str=None):
+    """Render a run manifest (see run_metrics.build_manifest) as Prometheus text exposition."""
+    pipeline = manifest.get("pipeline", "unknown")
+    records = manifest.get("records", [])
+    w = _Writer()
+
+    w.declare("alpha_run_duration_seconds", "gauge", "Wall time of the last pipeline run.")
+    w.sample("alpha_run_duration_seconds", manifest.get("duration_s", 0), pipeline=pipeline)
+    w.declare("alpha_run_last_success_timestamp_seconds", "gauge", "Unix time the last run finished.")
+    w.sample("alpha_run_last_success_timestamp_seconds", time.time(), pipeline=pipeline)
+
+    status_counts = defaultdict(int)
+    for run in manifest.get("ticker_runs", []):
+        status_counts["ok" if run.get("status") == "ok" else "failed"] += 1
+    if manifest.get("skipped_tickers"):
+        status_counts["skipped"] += len(manifest["skipped_tickers"])
+    w.declare("alpha_tickers_processed", "gauge", "Tickers handled in the last run by outcome.")
+    for status, count in sorted(status_counts.items()):
+        w.sample("alpha_tickers_processed", count, pipeline=pipeline, status=status)
+
+    # One observation per ticker x stage, so the histogram shows the per-ticker distribution
+    per_stage = defaultdict(lambda: defaultdict(float))
+    for rec in records:
+        per_stage[rec["stage"]][rec["ticker"]] += rec.get("wall_s") or 0
+    for stage, by_ticker in sorted(per_stage.items()):
+        w.histogram("alpha_stage_duration_seconds", "Per-ticker wall time spent in each pipeline stage.",
+                    list(by_ticker.values()), pipeline=pipeline, stage=stage)
+
+    per_provider = defaultdict(list)
+    for rec in records:
+        if rec.get("provider") and rec.get("requests"):
+            per_provider[rec["provider"]].append(rec.get("wall_s") or 0)
+    for provider, observations in sorted(per_provider.items()):
+        w.histogram("alpha_provider_latency_seconds", "Latency of individual provider calls.",
+                    observations, pipeline=pipeline, provider=provider)
+
+    # Each metric family is one contiguous HELP/TYPE + samples group, as the exposition format requires
+    providers = manifest.get("providers", [])
+    for name, key, help_text in PROVIDER_GAUGES:
+        w.declare(name, "gauge", help_text)
+        for row in providers:
+            w.sample(name, row.get(key, 0), pipeline=pipeline, provider=row["provider"])
+    cached = [row for row in providers if row.get("cache_hits", 0) + row.get("cache_misses", 0)]
+    if cached:
+        w.declare("alpha_cache_hit_ratio", "gauge", "Cache hits / lookups for the provider in the last run.")
+        for row in cached:
+            lookups = row.get("cache_hits", 0) + row.get("cache_misses", 0)
+            w.sample("alpha_cache_hit_ratio", row.get("cache_hits", 0) / lookups, pipeline=pipeline,
+                     provider=row["provider"])
+
+    if date_str:
+        w.declare("alpha_artifact_bytes", "gauge", "Size of artifacts written by the last run.")
+        for kind, size in sorted(artifact_sizes(date_str).items()):
+            w.sample("alpha_artifact_bytes", size, pipeline=pipeline, kind=kind)
+
+    return "\n".join(w.lines) + "\n"
+
+def write_textfile(manifest, path, date_str=None):
+    """Atomically replace a node-exporter textfile so the collector never reads a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render_textfile(manifest, date_str=date_str))
+    os.replace(tmp_path, path)
+    print(f"Prometheus metrics written to: {path}")
+    return path
@@ -0,0 +1,80 @@
+"""
+Open-interest profile and max pain per expiration (see options_chain.fetch_chain for the frame layout).
+
+The chain is pivoted once into dense expiration x strike OI matrices; max pain for every expiration is
+then a pair of matrix products against the intrinsic-payoff matrix of every candidate settlement.
+"""
+from utils import LazyImport
+
+np = LazyImport("numpy")
+pd = LazyImport("pandas")
+
+PROFILE_RANGE = 0.15
+
+def oi_matrix(chain):
+    """(expirations, strikes, call_oi, put_oi, listed) with E x K arrays over the union of strikes."""
+    exp_codes, expirations = pd.factorize(chain["expiration"], sort=True)
+    strike_codes, strikes = pd.factorize(chain["strike"].astype(float), sort=True)
+    cells = exp_codes * len(strikes) + strike_codes
+    size = len(expirations) * len(strikes)
+    oi = chain["openInterest"].fillna(0).to_numpy(dtype=float)
+    is_call = (chain["side"] == "call").to_numpy()
+
+    def dense(weights):
+        return np.bincount(cells, weights=weights, minlength=size).reshape(len(expirations), len(strikes))
+    call_oi, put_oi = dense(np.where(is_call, oi, 0.0)), dense(np.where(is_call, 0.0, oi))
+    listed = dense(np.ones(len(chain))) > 0
+    return list(expirations), np.asarray(strikes, dtype=float), call_oi, put_oi, listed
+
+def max_pain(strikes, call_oi, put_oi, listed=None):
+    """Settlement strike minimizing the total intrinsic payout to option holders, per expiration row.
+
+    payoff[k, s] is what one contract struck at k pays if the underlying settles at candidate s, so the
+    total payout for every expiration and candidate is call_oi @ call_payoff + put_oi @ put_payoff.
+    """
+    settle = strikes[None, :]
+    call_payoff = np.maximum(settle - strikes[:, None], 0.0)
+    put_payoff = np.maximum(strikes[:, None] - settle, 0.0)
+    payout = call_oi @ call_payoff + put_oi @ put_payoff
+    if listed is not None:
+        # Only strikes an expiration actually lists are candidates for its settlement
+        payout = np.where(listed, payout, np.inf)
+    return strikes[np.argmin(payout, axis=1)], payout
+
+def oi_summary(chain, spot):
+    """Max pain and OI totals per expiration, overall max pain, and the OI-by-strike profile near the spot."""
+    empty = {"maxPain": None, "maxPainDistPct": None, "expirations": [], "profile": {"expiration": None, "strikes": []}}
+    if chain.empty:
+        return empty
+    expirations, strikes, call_oi, put_oi, listed = oi_matrix(chain)
+    pain, _ = max_pain(strikes, call_oi, put_oi, listed)
+    overall, _ = max_pain(strikes, call_oi.sum(axis=0, keepdims=True), put_oi.sum(axis=0, keepdims=True))
+    dte = chain.groupby("expiration")["dte"].first() if "dte" in chain else {}
+
+    def dist(level):
+        return round((float(level) - spot) / spot * 100, 2)
+
+    rows = []
+    for i, expiration in enumerate(expirations):
+        calls, puts = call_oi[i].sum(), put_oi[i].sum()
+        rows.append({
+            "expiration": expiration,
+            "dte": int(dte[expiration]) if expiration in dte else None,
+            "maxPain": float(pain[i]),
+            "maxPainDistPct": dist(pain[i]),
+            "callOi": int(calls),
+            "putOi": int(puts),
+            "pcRatioOi": round(float(puts / calls), 2) if calls else None,
+            "topCallStrike": float(strikes[np.argmax(call_oi[i])]) if calls else None,
+            "topPutStrike": float(strikes[np.argmax(put_oi[i])]) if puts else None,
+        })
+
+    near = (strikes >= spot * (1 - PROFILE_RANGE)) & (strikes <= spot * (1 + PROFILE_RANGE)) & listed[0]
+    profile = [{"strike": float(k), "callOi": int(c), "putOi": int(p)}
+               for k, c, p in zip(strikes[near], call_oi[0][near], put_oi[0][near])]
+    return {
+        "maxPain": float(overall[0]),
+        "maxPainDistPct": dist(overall[0]),
+        "expirations": rows,
+        "profile": {"expiration": expirations[0], "maxPain": float(pain[0]), "strikes": profile},
+    }
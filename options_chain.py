@@ -0,0 +1,143 @@
+import os
+import threading
+from datetime import datetime, date, time as dtime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
+
+from config import OPTIONS_CACHE_DIR, OPTIONS_CACHE_TTL_OPEN
+from provider_calls import call, caches_enabled
+from run_metrics import metrics
+from utils import LazyImport
+
+pd = LazyImport("pandas")
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+CHAIN_WORKERS = 8
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _executor():
+    # One pool for every ticker; concurrency per provider is bounded by the shared rate limiter
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=CHAIN_WORKERS, thread_name_prefix="option-chain")
+        return _pool
+
+# --- Market clock ---
+def is_market_open(now=None):
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+def last_close(now=None):
+    """Most recent weekday 16:00 ET at or before `now` (exchange holidays are not modelled)."""
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    day = now.date()
+    while True:
+        close = datetime.combine(day, MARKET_CLOSE, tzinfo=MARKET_TZ)
+        if day.weekday() < 5 and close <= now:
+            return close
+        day -= timedelta(days=1)
+
+def is_fresh(fetched_at, now=None):
+    """Short TTL while the market is open; after the close a chain fetched post-close holds until the next open."""
+    now = now or datetime.now(timezone.utc)
+    if is_market_open(now):
+        return (now - fetched_at).total_seconds() < OPTIONS_CACHE_TTL_OPEN
+    return fetched_at >= last_close(now)
+
+# --- Per-expiration cache ---
+def _cache_path(ticker, expiration, source=None):
+    # yfinance chains sit directly under the cache dir; other providers get a subdirectory each
+    return os.path.join(OPTIONS_CACHE_DIR, *([source] if source else []), ticker, f"{expiration}.parquet")
+
+def load_cached(ticker, expiration, source=None):
+    path = _cache_path(ticker, expiration, source)
+    if not caches_enabled() or not os.path.exists(path):
+        return None
+    fetched_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    if not is_fresh(fetched_at):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+def store_cached(ticker, expiration, frame, source=None):
+    if not caches_enabled():
+        return
+    path = _cache_path(ticker, expiration, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+# --- Fetch ---
+def as_of_date():
+    """Date DTE is measured from (replays pin it to the recorded session)."""
+    return date.today()
+
+def select_expirations(expirations, min_dte=0, max_dte=None):
+    as_of = as_of_date()
+    selected = []
+    for exp in expirations:
+        dte = (date.fromisoformat(exp) - as_of).days
+        if dte >= min_dte and (max_dte is None or dte <= max_dte):
+            selected.append(exp)
+    return selected
+
+def _fetch_expiration(ticker, stock, expiration):
+    cached = load_cached(ticker, expiration)
+    metrics.cache(ticker, "options", "yfinance.option_chain", cached is not None)
+    if cached is not None:
+        return cached
+    with metrics.stage(ticker, "options", "yfinance.option_chain") as m:
+        chain = call("yfinance.option_chain", stock.option_chain, expiration)
+        m.add_bytes(chain.calls)
+        m.add_bytes(chain.puts)
+    frames = [side_frame.assign(side=side) for side, side_frame in (("call", chain.calls), ("put", chain.puts))
+              if side_frame is not None and not side_frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    frame = pd.concat(frames, ignore_index=True)
+    frame["expiration"] = expiration
+    store_cached(ticker, expiration, frame)
+    return frame
+
+def fetch_chain(ticker, stock, min_dte=0, max_dte=None, expirations=None):
+    """Every expiration in the DTE window as one DataFrame with `expiration`, `dte` and `side` columns.
+
+    Expirations are fetched concurrently and cached individually. Ones that fail are listed in
+    `chain.attrs["failed_expirations"]` instead of showing up as silently empty chains.
+    """
+    if expirations is None:
+        with metrics.stage(ticker, "options", "yfinance.options"):
+            expirations = list(call("yfinance.options", lambda: stock.options) or [])
+        expirations = select_expirations(expirations, min_dte, max_dte)
+    as_of = as_of_date()
+
+    futures = {exp: _executor().submit(_fetch_expiration, ticker, stock, exp) for exp in expirations}
+    frames, failed = [], []
+    for exp, future in futures.items():
+        try:
+            frame = future.result()
+        except Exception as e:
+            failed.append({"expiration": exp, "error": f"{type(e).__name__}: {e}"[:200]})
+            continue
+        if frame.empty:
+            failed.append({"expiration": exp, "error": "empty chain"})
+        else:
+            # DTE is derived on every read so a chain cached overnight doesn't carry yesterday's count
+            frames.append(frame.assign(dte=(date.fromisoformat(exp) - as_of).days))
+
+    if failed:
+        print(f"Option chain: {len(failed)}/{len(expirations)} expirations failed for {ticker}: "
+              f"{', '.join(f['expiration'] for f in failed)}")
+    chain = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["contractSymbol", "strike", "side", "expiration", "dte"])
+    chain.attrs["failed_expirations"] = failed
+    chain.attrs["expirations"] = [exp for exp in expirations if exp not in {f["expiration"] for f in failed}]
+    return chain
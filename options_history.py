@@ -0,0 +1,139 @@
+import os
+
+from config import OPTIONS_STRIKE_HISTORY
+from provider_calls import is_live
+from utils import LazyImport, upsert_parquet
+
+pd = LazyImport("pandas")
+np = LazyImport("numpy")
+
+SNAPSHOT_FILE = "options_history.parquet"
+STRIKE_FILE = "options_strikes.parquet"
+
+def chain_snapshot(chain, date_str, close, atm_iv=None):
+    """One row of chain aggregates for the day (see options_chain.fetch_chain for the frame layout)."""
+    calls = chain[chain['side'] == 'call'] if not chain.empty else chain
+    puts = chain[chain['side'] == 'put'] if not chain.empty else chain
+    call_vol = float(calls['volume'].fillna(0).sum()) if not calls.empty else 0.0
+    put_vol = float(puts['volume'].fillna(0).sum()) if not puts.empty else 0.0
+    call_oi = float(calls['openInterest'].fillna(0).sum()) if not calls.empty else 0.0
+    put_oi = float(puts['openInterest'].fillna(0).sum()) if not puts.empty else 0.0
+    return {
+        "date": date_str,
+        "close": float(close),
+        "atm_iv": float(atm_iv) if atm_iv else None,
+        "call_volume": call_vol, "put_volume": put_vol, "total_volume": call_vol + put_vol,
+        "call_oi": call_oi, "put_oi": put_oi, "total_oi": call_oi + put_oi,
+        "pc_ratio_vol": put_vol / call_vol if call_vol else None,
+        "pc_ratio_oi": put_oi / call_oi if call_oi else None,
+        "expirations": int(chain['expiration'].nunique()) if not chain.empty else 0,
+    }
+
+def record_snapshot(ticker, snapshot, chain=None, reports_dir="reports"):
+    """Upsert today's aggregates (and per-strike OI when enabled); returns the full history, oldest first.
+
+    Replays (provider_calls.offline) neither read nor write the stored history: just today's row comes back.
+    """
+    if not is_live():
+        return pd.DataFrame([snapshot])
+    ticker_dir = os.path.join(reports_dir, ticker)
+    history = upsert_parquet(os.path.join(ticker_dir, SNAPSHOT_FILE), pd.DataFrame([snapshot]), key='date')
+    if OPTIONS_STRIKE_HISTORY and chain is not None and not chain.empty:
+        strikes = (chain.groupby(['expiration', 'strike', 'side'], as_index=False)[['openInterest', 'volume']].sum()
+                   .rename(columns={'openInterest': 'open_interest'}))
+        strikes.insert(0, 'date', snapshot['date'])
+        upsert_parquet(os.path.join(ticker_dir, STRIKE_FILE), strikes, key=['date', 'expiration', 'strike', 'side'])
+    return history
+
+def load_history(ticker, reports_dir="reports"):
+    if not is_live():
+        return pd.DataFrame()
+    path = os.path.join(reports_dir, ticker, SNAPSHOT_FILE)
+    return pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+
+def _values_as_of(history, column, targets):
+    """Value of `column` on the last snapshot at or before each target date (NaN before the history starts)."""
+    dates = pd.to_datetime(history['date']).values
+    idx = np.searchsorted(dates, pd.to_datetime(targets).values, side='right') - 1
+    values = history[column].to_numpy(dtype=float)
+    return np.where(idx >= 0, values[np.clip(idx, 0, None)], np.nan)
+
+def change_metrics(history, as_of):
+    """Percent change of total volume and OI over 5 sessions and one month, 0 without enough history."""
+    if history.empty:
+        return {"volChg5d": 0, "volChg1m": 0, "oiChg5d": 0, "oiChg1m": 0}
+    as_of = pd.Timestamp(as_of)
+    targets = [np.busday_offset(as_of.date(), -5, roll='backward'), as_of - pd.DateOffset(months=1)]
+    first = pd.Timestamp(history['date'].iloc[0])
+    out = {}
+    for key, column in (("vol", "total_volume"), ("oi", "total_oi")):
+        current = _values_as_of(history, column, [as_of])[0]
+        past = _values_as_of(history, column, targets)
+        for suffix, target, value in zip(("5d", "1m"), targets, past):
+            # A lookback that starts before the first snapshot has no base to compare against
+            valid = pd.Timestamp(target) >= first and value and not np.isnan(value)
+            out[f"{key}Chg{suffix}"] = round(float((current - value) / value * 100), 2) if valid else 0
+    return out
+
+def ratio_series(history, dates):
+    """Put/call ratios aligned to chart dates; days without a snapshot are None so the chart shows a gap."""
+    if history.empty:
+        return [None] * len(dates), [None] * len(dates)
+    indexed = history.assign(date=pd.to_datetime(history['date'])).set_index('date')
+    aligned = indexed.reindex(pd.to_datetime(dates).normalize())
+    to_list = lambda s: [round(float(v), 2) if pd.notna(v) else None for v in s]
+    return to_list(aligned['pc_ratio_vol']), to_list(aligned['pc_ratio_oi'])
+
+def iv_stats(history, current_iv, as_of):
+    """IV rank/percentile, rolling averages and 3m/52w extremes from the stored daily ATM IV series.
+
+    Everything falls back to today's IV while the series is still too short to have a range.
+    """
+    current_iv = float(current_iv or 0)
+    stats = {
+        "ivRank": 0.0, "ivPercentile": 0.0,
+        "iv5dAvg": round(current_iv, 2), "iv1mAvg": round(current_iv, 2),
+        "iv3mLow": round(current_iv, 2), "iv3mLowDate": "N/A",
+        "iv3mHigh": round(current_iv, 2), "iv3mHighDate": "N/A",
+        "iv52wLow": round(current_iv, 2), "iv52wLowDate": "N/A",
+        "iv52wHigh": round(current_iv, 2), "iv52wHighDate": "N/A",
+    }
+    if history.empty or 'atm_iv' not in history:
+        return stats
+    as_of = pd.Timestamp(as_of)
+    series = history[['date', 'atm_iv']].dropna()
+    dates = pd.to_datetime(series['date']).values
+    ivs = series['atm_iv'].to_numpy(dtype=float)
+    keep = dates <= as_of.to_datetime64()
+    dates, ivs = dates[keep], ivs[keep]
+    if not len(ivs):
+        return stats
+
+    def window(offset):
+        return dates > (as_of - offset).to_datetime64()
+
+    def extremes(mask, label):
+        if not mask.any():
+            return
+        idx_low, idx_high = np.argmin(np.where(mask, ivs, np.inf)), np.argmax(np.where(mask, ivs, -np.inf))
+        stats[f"iv{label}Low"] = round(float(ivs[idx_low]), 2)
+        stats[f"iv{label}LowDate"] = pd.Timestamp(dates[idx_low]).strftime('%m/%d/%y')
+        stats[f"iv{label}High"] = round(float(ivs[idx_high]), 2)
+        stats[f"iv{label}HighDate"] = pd.Timestamp(dates[idx_high]).strftime('%m/%d/%y')
+
+    # No valid IV inside a window (stale history): None rather than a NaN mean in the payload
+    week = dates > np.datetime64(np.busday_offset(as_of.date(), -5, roll='backward'))
+    stats["iv5dAvg"] = round(float(ivs[week].mean()), 2) if week.any() else None
+    month = window(pd.DateOffset(months=1))
+    stats["iv1mAvg"] = round(float(ivs[month].mean()), 2) if month.any() else None
+    extremes(window(pd.DateOffset(months=3)), "3m")
+    year = window(pd.DateOffset(weeks=52))
+    extremes(year, "52w")
+
+    if year.any():
+        # Today's IV may sit outside the stored range; counting it keeps the rank within 0-100
+        low, high = min(ivs[year].min(), current_iv), max(ivs[year].max(), current_iv)
+        if high > low:
+            stats["ivRank"] = round((current_iv - low) / (high - low) * 100, 2)
+            stats["ivPercentile"] = round(float((ivs[year] < current_iv).mean() * 100), 2)
+    return stats
@@ -0,0 +1,366 @@
+import os
+import json
+import time
+import queue
+import random
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+from config import RATE_LIMITS
+
+BREAKER_ENV = "ALPHA_BREAKER_FILE"
+# Ceiling on provider worker threads; past it, calls queue until a worker frees up
+MAX_WORKERS = 64
+_live = True
+_recording = False
+
+class CallPolicy:
+    """How patiently to call one provider: per-attempt timeout, retries and optional hedging."""
+
+    def __init__(self, timeout=20.0, retries=2, backoff=0.5, hedge_after=None,
+                 failure_threshold=3, cooldown=120.0):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+# Looked up by the longest dotted prefix of the provider name ("rss.wsj" -> "rss")
+POLICIES = {
+    "default": CallPolicy(),
+    "yfinance": CallPolicy(timeout=30.0, retries=2),
+    "yfinance.option_chain": CallPolicy(timeout=20.0, retries=2, hedge_after=8.0),
+    "tradingview": CallPolicy(timeout=10.0, retries=1, failure_threshold=2),
+    "tradier": CallPolicy(timeout=10.0, retries=2),
+    "rss": CallPolicy(timeout=8.0, retries=1, hedge_after=4.0, failure_threshold=2, cooldown=300.0),
+}
+
+class ProviderTimeout(TimeoutError):
+    pass
+
+class CircuitOpen(RuntimeError):
+    pass
+
+class Throttled(RuntimeError):
+    """Our own rate limiter had no token or in-flight slot before the call's deadline.
+
+    Not a TimeoutError: the provider was never asked, so it says nothing about its health.
+    """
+
+def _longest_prefix(provider, table):
+    parts = provider.split(".")
+    for i in range(len(parts), 0, -1):
+        key = ".".join(parts[:i])
+        if key in table:
+            return key
+    return None
+
+def policy_for(provider):
+    return POLICIES[_longest_prefix(provider, POLICIES) or "default"]
+
+def is_transport_error(e):
+    """Timeouts and connection-level failures; data errors (empty frame, bad symbol) are not retried."""
+    if isinstance(e, (TimeoutError, ConnectionError)):
+        return True
+    name = type(e).__name__
+    if any(key in name for key in ("Timeout", "Connect", "Transport", "Network", "Curl", "RateLimit")):
+        return True
+    return "curl: (" in str(e) or is_rate_limited(e)
+
+def is_rate_limited(e):
+    response = getattr(e, "response", None)
+    return getattr(response, "status_code", None) == 429 or "RateLimit" in type(e).__name__ or "Too Many Requests" in str(e)
+
+class TokenBucket:
+    """Token bucket plus an in-flight cap for one provider, shared by every thread of the process."""
+
+    def __init__(self, rate, burst, concurrency):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(concurrency)
+
+    def _take(self):
+        """Take a token if one is available, else return the seconds until the next one."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, deadline=None):
+        """Block until both a token and an in-flight slot are free; returns a release-once callable.
+
+        With a `deadline` (time.monotonic()), raises Throttled instead of waiting past it.
+        """
+        while True:
+            wait_s = self._take()
+            if not wait_s:
+                break
+            if deadline is not None and time.monotonic() + wait_s > deadline:
+                raise Throttled("rate limit wait exceeds the call deadline")
+            time.sleep(wait_s)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        if not self._slots.acquire(timeout=timeout):
+            raise Throttled("no free in-flight slot before the call deadline")
+        released = threading.Event()
+        lock = threading.Lock()
+
+        def release():
+            with lock:
+                if released.is_set():
+                    return
+                released.set()
+            self._slots.release()
+        return release
+
+    def throttled(self):
+        """Provider answered 429: drop the banked burst so callers pace at the steady rate."""
+        with self._lock:
+            self.tokens = min(self.tokens, 0.0)
+
+class RateLimiter:
+    def __init__(self, limits):
+        self.limits = limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider):
+        if not _live:
+            return None
+        key = _longest_prefix(provider, self.limits)
+        if key is None:
+            return None
+        limit = self.limits[key]
+        name = provider if limit.get("per_name") else key
+        with self._lock:
+            if name not in self._buckets:
+                self._buckets[name] = TokenBucket(limit["rate"], limit["burst"], limit["concurrency"])
+            return self._buckets[name]
+
+limiter = RateLimiter(RATE_LIMITS)
+
+@contextmanager
+def offline():
+    """Providers are served from fixtures (replay, benchmarks): no pacing and no response caches."""
+    global _live
+    _live = False
+    try:
+        yield
+    finally:
+        _live = True
+
+@contextmanager
+def recording_calls():
+    """Providers are live but every response is being recorded: pacing stays, response caches are
+    bypassed so the recording holds each response a replay will ask for."""
+    global _recording
+    _recording = True
+    try:
+        yield
+    finally:
+        _recording = False
+
+def is_live():
+    return _live
+
+def caches_enabled():
+    """Whether response caches may be read or written: live and not recording."""
+    return _live and not _recording
+
+class CircuitBreaker:
+    """Per-provider consecutive-failure breaker.
+
+    Open circuits are also written to ALPHA_BREAKER_FILE when it is set (run_metrics.start_run does
+    this), so one ticker's subprocess finding TradingView down spares the following tickers the wait.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._open_until = {}
+        self._half_open = set()
+
+    def _shared(self):
+        path = os.environ.get(BREAKER_ENV)
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _publish(self, provider, until):
+        path = os.environ.get(BREAKER_ENV)
+        if not path:
+            return
+        state = self._shared()
+        state[provider] = until
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def allow(self, provider):
+        now = time.time()
+        with self._lock:
+            until = max(self._open_until.get(provider, 0), self._shared().get(provider, 0))
+            if now < until:
+                return False
+            if until and provider not in self._half_open:
+                # Cooldown over: half-open, so the next failure reopens it without waiting for the threshold
+                self._half_open.add(provider)
+            return True
+
+    def success(self, provider):
+        with self._lock:
+            self._failures[provider] = 0
+            self._half_open.discard(provider)
+            if self._open_until.pop(provider, None) is not None:
+                self._publish(provider, 0)
+
+    def failure(self, provider, policy):
+        with self._lock:
+            count = self._failures.get(provider, 0) + 1
+            self._failures[provider] = count
+            if count >= policy.failure_threshold or provider in self._half_open:
+                until = time.time() + policy.cooldown
+                self._open_until[provider] = until
+                self._half_open.discard(provider)
+                self._failures[provider] = 0
+                self._publish(provider, until)
+                print(f"Circuit open for {provider}: skipping it for {policy.cooldown:.0f}s")
+
+breaker = CircuitBreaker()
+
+class _Workers:
+    """Daemon threads reused across provider calls.
+
+    Per-thread client state survives between calls: curl_cffi keeps one curl handle per thread, so the
+    shared yfinance session only reuses connections when consecutive calls land on the same threads.
+    A worker is added whenever none is idle, up to `limit`, so a hung (abandoned) call doesn't hold
+    up the calls behind it until that many are stuck; being daemons they never block interpreter exit.
+    """
+
+    def __init__(self, limit=MAX_WORKERS):
+        self.limit = limit
+        self._tasks = queue.SimpleQueue()
+        self._threads = 0
+        self._idle = 0
+        self._lock = threading.Lock()
+
+    def submit(self, task):
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            elif self._threads < self.limit:
+                self._threads += 1
+                threading.Thread(target=self._work, daemon=True, name="provider-call").start()
+        self._tasks.put(task)
+
+    def _work(self):
+        while True:
+            self._tasks.get()()
+            with self._lock:
+                self._idle += 1
+
+_workers = _Workers()
+
+def _spawn(fn, args, kwargs, bucket=None, deadline=None):
+    """Run fn on a provider worker thread and return its Future.
+
+    The in-flight slot is held until fn actually returns, even when the caller has given up on it,
+    so the bucket's concurrency caps the requests really open against the provider.
+    """
+    future = Future()
+    release = bucket.acquire(deadline) if bucket else (lambda: None)
+
+    def runner():
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        finally:
+            release()
+
+    _workers.submit(runner)
+    return future
+
+def _abandon(futures):
+    # cancel() only stops calls still queued; a running one keeps its worker and slot until it returns
+    for future in futures:
+        future.cancel()
+
+def _attempt(fn, args, kwargs, policy, bucket=None):
+    """One attempt, plus a hedged duplicate if the first is still running after hedge_after seconds."""
+    started = time.monotonic()
+    deadline = started + policy.timeout
+    pending = {_spawn(fn, args, kwargs, bucket, deadline)}
+    if policy.hedge_after and policy.hedge_after < policy.timeout:
+        done, pending = wait(pending, timeout=policy.hedge_after)
+        if not done:
+            try:
+                pending.add(_spawn(fn, args, kwargs, bucket, deadline))
+            except Throttled:
+                pass
+        else:
+            pending = done
+    error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                _abandon(pending)
+                return future.result()
+            error = future.exception()
+    _abandon(pending)
+    if error is not None and not pending:
+        raise error
+    raise ProviderTimeout(f"no response within {policy.timeout:g}s")
+
+def checked_get(client, url, **kwargs):
+    """client.get() that raises on HTTP errors inside the call, so 429s reach the retry/limit logic."""
+    response = client.get(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+def call(provider, fn, *args, **kwargs):
+    """Call a provider with its policy's deadline, retries, hedging, rate limit and circuit breaker."""
+    policy = policy_for(provider)
+    bucket = limiter.bucket(provider)
+    if not breaker.allow(provider):
+        raise CircuitOpen(f"{provider} circuit is open")
+    for attempt in range(policy.retries + 1):
+        try:
+            result = _attempt(fn, args, kwargs, policy, bucket)
+        except Throttled:
+            # Queued behind our own limiter: neither a provider failure nor worth another wait
+            raise
+        except Exception as e:
+            if not is_transport_error(e):
+                # The provider answered; a data error says nothing about its health
+                breaker.success(provider)
+                raise
+            if bucket and is_rate_limited(e):
+                bucket.throttled()
+            breaker.failure(provider, policy)
+            if attempt == policy.retries or not breaker.allow(provider):
+                raise
+            time.sleep(policy.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+            continue
+        breaker.success(provider)
+        return result
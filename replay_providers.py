@@ -0,0 +1,648 @@
+import os
+import re
+import json
+import zlib
+import hashlib
+from types import SimpleNamespace
+from collections import namedtuple
+import threading
+from contextlib import contextmanager, nullcontext
+
+OptionChain = namedtuple("OptionChain", ["calls", "puts", "underlying"])
+
+YF_FILE = "yfinance.json"
+TV_FILE = "tradingview.json"
+HTTP_DIR = "http"
+TRADIER_DIR = "tradier"
+
+# --- Fixture encoding ---
+def encode(obj):
+    """Turn provider responses (DataFrames, Timestamps, numpy scalars) into plain JSON."""
+    import pandas as pd
+    import numpy as np
+
+    if isinstance(obj, pd.DataFrame):
+        frame = obj.copy()
+        datetime_columns = [c for c in frame.columns if pd.api.types.is_datetime64_any_dtype(frame[c])]
+        for c in datetime_columns:
+            frame[c] = frame[c].map(lambda v: v.isoformat() if pd.notnull(v) else None)
+        datetime_index = isinstance(frame.index, pd.DatetimeIndex)
+        index = [v.isoformat() for v in frame.index] if datetime_index else [encode(v) for v in frame.index]
+        return {"__frame__": {
+            "columns": [str(c) for c in frame.columns],
+            "index": index,
+            "index_name": frame.index.name,
+            "datetime_index": datetime_index,
+            "datetime_columns": [str(c) for c in datetime_columns],
+            "data": [[encode(v) for v in row] for row in frame.itertuples(index=False, name=None)],
+        }}
+    if isinstance(obj, dict):
+        return {str(k): encode(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode(v) for v in obj]
+    if isinstance(obj, (pd.Timestamp,)) or hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, float) and obj != obj:
+        return None
+    return obj
+
+def decode(obj):
+    """Inverse of encode(); frames come back with their datetime index and columns restored."""
+    import pandas as pd
+
+    if isinstance(obj, dict) and "__frame__" in obj:
+        f = obj["__frame__"]
+        index = pd.to_datetime(f["index"], utc=True) if f["datetime_index"] else f["index"]
+        df = pd.DataFrame(f["data"], columns=f["columns"], index=index)
+        df.index.name = f["index_name"]
+        for c in f["datetime_columns"]:
+            df[c] = pd.to_datetime(df[c], utc=True)
+        return df
+    if isinstance(obj, dict):
+        return {k: decode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [decode(v) for v in obj]
+    return obj
+
+def url_key(url):
+    return hashlib.sha1(url.encode()).hexdigest()[:16]
+
+# --- Fixture store ---
+class FixtureStore:
+    """Recorded provider responses on disk, one directory per ticker.
+
+    Tickers without their own recording are served from `base` with prices scaled by a
+    per-symbol factor, so benchmarks can fan a single recording out to any watchlist size.
+    """
+
+    def __init__(self, root, base="BASE"):
+        self.root = root
+        self.base = base
+        self._cache = {}
+        self._session = None
+
+    def _ticker_dir(self, ticker):
+        own = os.path.join(self.root, ticker)
+        if os.path.isdir(own) or not self.base:
+            return own, 1.0
+        return os.path.join(self.root, self.base), self.scale_for(ticker)
+
+    @staticmethod
+    def scale_for(ticker):
+        return 0.5 + (zlib.crc32(ticker.encode()) % 1000) / 500
+
+    def _load(self, ticker, filename):
+        key = (ticker, filename)
+        if key not in self._cache:
+            path, scale = self._ticker_dir(ticker)
+            with open(os.path.join(path, filename), "r") as f:
+                payload = decode(json.load(f))
+            if filename == YF_FILE and scale != 1.0:
+                payload = _scale_yfinance(payload, scale)
+            self._cache[key] = payload
+        return self._cache[key]
+
+    def yfinance(self, ticker):
+        return self._load(ticker, YF_FILE)
+
+    def tradingview(self, ticker):
+        return self._load(ticker, TV_FILE)
+
+    def session_date(self):
+        """Day the recording was made: the last bar of the base (else first recorded) ticker's history."""
+        if self._session is None:
+            ticker = self.base or next(name for name in sorted(os.listdir(self.root))
+                                       if os.path.exists(os.path.join(self.root, name, YF_FILE)))
+            self._session = self.yfinance(ticker)["history"].index[-1].date()
+        return self._session
+
+    def tradier(self, key):
+        """Recorded Tradier body for a tradier_key(), or None (ReplayTradier then builds one)."""
+        path = os.path.join(self.root, TRADIER_DIR, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def http(self, url):
+        """Body recorded for a URL; unrecorded per-ticker feeds fall back to http/default.body."""
+        http_dir = os.path.join(self.root, HTTP_DIR)
+        for name in (url_key(url), "default"):
+            path = os.path.join(http_dir, f"{name}.body")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return f.read()
+        raise FileNotFoundError(f"No recorded response for {url}")
+
+def _scale_yfinance(payload, scale):
+    payload = dict(payload)
+    hist = payload["history"].copy()
+    for c in ("Open", "High", "Low", "Close"):
+        hist[c] = hist[c] * scale
+    payload["history"] = hist
+    chains = {}
+    for exp, chain in payload.get("option_chain", {}).items():
+        scaled = {}
+        for side in ("calls", "puts"):
+            df = chain[side].copy()
+            for c in ("strike", "lastPrice", "bid", "ask"):
+                if c in df.columns:
+                    df[c] = df[c] * scale
+            scaled[side] = df
+        chains[exp] = scaled
+    payload["option_chain"] = chains
+    return payload
+
+def _period_slice(frame, period):
+    """The rows yfinance returns for `period` ("5d", "3mo", "2y", "ytd", "max") out of a longer recording."""
+    import pandas as pd
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period or "")
+    if frame.empty or not (match or period == "ytd"):
+        return frame
+    last = frame.index[-1]
+    if period == "ytd":
+        return frame[frame.index.year == last.year]
+    n, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return frame.iloc[-n:]
+    offset = {"wk": pd.DateOffset(weeks=n), "mo": pd.DateOffset(months=n), "y": pd.DateOffset(years=n)}[unit]
+    return frame[frame.index > last - offset]
+
+# --- Stand-in providers ---
+class ReplayTicker:
+    """Drop-in for yfinance.Ticker that answers from a FixtureStore."""
+
+    def __init__(self, ticker, store, session=None):
+        self.ticker = ticker
+        self._data = store.yfinance(ticker)
+
+    def history(self, period="2y", **kwargs):
+        return _period_slice(self._data["history"], period).copy()
+
+    @property
+    def options(self):
+        return tuple(self._data.get("options", []))
+
+    def option_chain(self, date=None, **kwargs):
+        chain = self._data["option_chain"][date or self.options[0]]
+        return OptionChain(chain["calls"].copy(), chain["puts"].copy(), {})
+
+    @property
+    def info(self):
+        return dict(self._data.get("info", {}))
+
+    @property
+    def insider_transactions(self):
+        return self._data.get("insider_transactions")
+
+    @property
+    def calendar(self):
+        return self._data.get("calendar", {})
+
+    @property
+    def news(self):
+        return list(self._data.get("news", []))
+
+class ReplayTAHandler:
+    """Drop-in for tradingview_ta.TA_Handler."""
+
+    def __init__(self, symbol, store, **kwargs):
+        self.symbol = symbol
+        self._store = store
+
+    def get_analysis(self):
+        return SimpleNamespace(**self._store.tradingview(self.symbol))
+
+class ReplayResponse:
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        return None
+
+class ReplayHttpClient:
+    """Drop-in for httpx.Client / requests.Session limited to GET."""
+
+    def __init__(self, store, **kwargs):
+        self._store = store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+    def get(self, url, **kwargs):
+        return ReplayResponse(url, self._store.http(url))
+
+def _clean(value):
+    """JSON-safe scalar: NaN becomes null, numpy scalars become Python ones."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+class ReplayTradier:
+    """Tradier API bodies for the quotes, expirations and chains endpoints, built from a FixtureStore.
+
+    Greeks are computed from the recorded IVs. Shared by the in-process replay session below and
+    benchmarks/tradier_stub.py.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def quotes(self, params):
+        out = []
+        for symbol in params.get("symbols", "").split(","):
+            history = self.store.yfinance(symbol)["history"]
+            last = history.iloc[-1]
+            out.append({
+                "symbol": symbol, "last": _clean(last["Close"]), "volume": _clean(last["Volume"]),
+                "trade_date": int(history.index[-1].timestamp() * 1000),
+            })
+        return {"quotes": {"quote": out[0] if len(out) == 1 else out}}
+
+    def expirations(self, params):
+        return {"expirations": {"date": list(self.store.yfinance(params["symbol"]).get("options", []))}}
+
+    def chains(self, params):
+        import numpy as np
+        from datetime import date
+        from greeks import bs_greeks
+
+        symbol, expiration = params["symbol"], params["expiration"]
+        data = self.store.yfinance(symbol)
+        recorded = data.get("option_chain", {}).get(expiration)
+        if recorded is None:
+            return {"options": None}
+        spot = float(data["history"]["Close"].iloc[-1])
+        # Each expiration's DTE counts from the recorded session, as options_chain does under replay
+        t = max((date.fromisoformat(expiration) - self.store.session_date()).days, 0.25) / 365
+        options = []
+        for side in ("call", "put"):
+            frame = recorded[f"{side}s"]
+            greeks = bs_greeks(spot, frame["strike"].to_numpy(dtype=float), t,
+                               frame["impliedVolatility"].to_numpy(dtype=float), side == "call")
+            for i, row in enumerate(frame.to_dict("records")):
+                options.append({
+                    "symbol": row["contractSymbol"], "description": f"{symbol} {expiration} {row['strike']} {side}",
+                    "option_type": side, "expiration_date": expiration, "strike": _clean(row["strike"]),
+                    "bid": _clean(row["bid"]), "ask": _clean(row["ask"]), "last": _clean(row["lastPrice"]),
+                    "volume": _clean(row["volume"]), "open_interest": _clean(row["openInterest"]),
+                    "greeks": {"mid_iv": _clean(row["impliedVolatility"]), "smv_vol": _clean(row["impliedVolatility"]),
+                               **{name: _clean(np.round(values[i], 6)) for name, values in greeks.items()}},
+                })
+        return {"options": {"option": options}}
+
+    # API path below the version root -> handler
+    ROUTES = {
+        "markets/quotes": quotes,
+        "markets/options/expirations": expirations,
+        "markets/options/chains": chains,
+    }
+
+    def route(self, path):
+        """Handler bound to this instance for a request path, or None."""
+        for suffix, handler in self.ROUTES.items():
+            if path.rstrip("/").endswith(suffix):
+                return handler.__get__(self)
+        return None
+
+def tradier_key(url, params=None):
+    """Fixture key of a Tradier GET: its endpoint (not the API root) and sorted query parameters."""
+    path = next((suffix for suffix in ReplayTradier.ROUTES if url.rstrip("/").endswith(suffix)), url)
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return url_key(f"{path}?{query}")
+
+class ReplayTradierSession:
+    """Drop-in for the shared requests.Session tradier_client sends its GETs through.
+
+    Serves the recorded body when the recording has one, else builds it from the yfinance fixture.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._tradier = ReplayTradier(store)
+
+    def get(self, url, params=None, **kwargs):
+        recorded = self._store.tradier(tradier_key(url, params))
+        if recorded is not None:
+            return ReplayResponse(url, recorded)
+        handler = self._tradier.route(url)
+        if handler is None:
+            raise FileNotFoundError(f"No replayed Tradier endpoint for {url}")
+        return ReplayResponse(url, json.dumps(handler(params or {})).encode())
+
+def _module_proxy(store):
+    """Namespaces shaped like the yfinance / httpx / feedparser modules the fetchers import, plus the
+    session tradier_client sends its requests through."""
+    def parse(url_file_stream_or_string, *args, **kwargs):
+        import feedparser as real_feedparser
+
+        source = url_file_stream_or_string
+        if isinstance(source, str) and source.startswith(("http://", "https://")):
+            source = store.http(source)
+        return real_feedparser.parse(source, *args, **kwargs)
+
+    return {
+        "yf": SimpleNamespace(Ticker=lambda ticker, session=None: ReplayTicker(ticker, store, session)),
+        "TA_Handler": lambda symbol, **kw: ReplayTAHandler(symbol, store, **kw),
+        "httpx": SimpleNamespace(Client=lambda **kw: ReplayHttpClient(store, **kw)),
+        "http_client": lambda: ReplayHttpClient(store),
+        "feedparser": SimpleNamespace(parse=parse),
+        "requests_session": lambda: ReplayTradierSession(store),
+        "is_configured": lambda: True,
+        "as_of_date": store.session_date,
+    }
+
+@contextmanager
+def _patched(modules, proxies):
+    saved = []
+    for module in modules:
+        for name, proxy in proxies.items():
+            if hasattr(module, name):
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, proxy)
+    try:
+        yield
+    finally:
+        for module, name, original in reversed(saved):
+            setattr(module, name, original)
+
+@contextmanager
+def replaying(store, *modules):
+    """Point the provider names imported by each module at the fixture store for the duration.
+
+    options_chain and tradier_client are always patched: fetchers reach them through their modules,
+    and DTE is measured from the recorded session rather than today.
+    """
+    import options_chain
+    import tradier_client
+    from provider_calls import offline
+
+    with _patched((*modules, options_chain, tradier_client), _module_proxy(store)), offline():
+        yield store
+
+# --- Recording ---
+class RecordingStore:
+    """Collects live provider responses and writes them in FixtureStore layout."""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._yf = {}
+        self._tv = {}
+        self._urls = {}
+
+    def put_yfinance(self, ticker, key, value):
+        with self._lock:
+            self._yf.setdefault(ticker, {})[key] = value
+
+    def put_history(self, ticker, frame):
+        """Keep the longest history seen, so a 5d call after the 2y one doesn't shrink the recording."""
+        import pandas as pd
+
+        with self._lock:
+            data = self._yf.setdefault(ticker, {})
+            if data.get("history") is not None:
+                frame = pd.concat([data["history"], frame])
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            data["history"] = frame
+
+    def put_option_chain(self, ticker, expiration, calls, puts):
+        with self._lock:
+            chains = self._yf.setdefault(ticker, {}).setdefault("option_chain", {})
+            chains[expiration] = {"calls": calls, "puts": puts}
+
+    def put_tradingview(self, ticker, analysis):
+        with self._lock:
+            self._tv[ticker] = {
+                k: getattr(analysis, k, {}) for k in ("summary", "oscillators", "moving_averages", "indicators")
+            }
+
+    def put_tradier(self, key, content):
+        tradier_dir = os.path.join(self.root, TRADIER_DIR)
+        os.makedirs(tradier_dir, exist_ok=True)
+        with open(os.path.join(tradier_dir, f"{key}.json"), "wb") as f:
+            f.write(content)
+
+    def put_http(self, url, content):
+        http_dir = os.path.join(self.root, HTTP_DIR)
+        os.makedirs(http_dir, exist_ok=True)
+        with open(os.path.join(http_dir, f"{url_key(url)}.body"), "wb") as f:
+            f.write(content)
+        with self._lock:
+            self._urls[url_key(url)] = url
+
+    def flush(self):
+        with self._lock:
+            for ticker, payload in self._yf.items():
+                self._write(ticker, YF_FILE, payload)
+            for ticker, payload in self._tv.items():
+                self._write(ticker, TV_FILE, payload)
+            if self._urls:
+                index_path = os.path.join(self.root, HTTP_DIR, "index.json")
+                urls = {}
+                if os.path.exists(index_path):
+                    with open(index_path, "r") as f:
+                        urls = json.load(f)
+                urls.update(self._urls)
+                with open(index_path, "w") as f:
+                    json.dump(urls, f, indent=2, sort_keys=True)
+
+    def _write(self, ticker, filename, payload):
+        ticker_dir = os.path.join(self.root, ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        path = os.path.join(ticker_dir, filename)
+        if os.path.exists(path) and filename == YF_FILE:
+            # Merge with an earlier capture of the same ticker (e.g. HUD then options fetch)
+            with open(path, "r") as f:
+                previous = json.load(f)
+            encoded = encode(payload)
+            chains = {**previous.get("option_chain", {}), **encoded.get("option_chain", {})}
+            previous.update(encoded)
+            previous["option_chain"] = chains
+            encoded = previous
+        else:
+            encoded = encode(payload)
+        with open(path, "w") as f:
+            json.dump(encoded, f)
+
+class RecordingTicker:
+    """Wraps a live yfinance.Ticker and records every response it returns."""
+
+    def __init__(self, real, ticker, store):
+        self._real = real
+        self._ticker = ticker
+        self._store = store
+
+    def _record(self, key, value):
+        if value is not None:
+            self._store.put_yfinance(self._ticker, key, value)
+        return value
+
+    def history(self, *args, **kwargs):
+        frame = self._real.history(*args, **kwargs)
+        if frame is not None:
+            self._store.put_history(self._ticker, frame)
+        return frame
+
+    @property
+    def options(self):
+        return self._record("options", list(self._real.options))
+
+    def option_chain(self, date=None, **kwargs):
+        chain = self._real.option_chain(date, **kwargs)
+        self._store.put_option_chain(self._ticker, date or self._real.options[0], chain.calls, chain.puts)
+        return chain
+
+    @property
+    def info(self):
+        return self._record("info", self._real.info)
+
+    @property
+    def insider_transactions(self):
+        return self._record("insider_transactions", self._real.insider_transactions)
+
+    @property
+    def calendar(self):
+        return self._record("calendar", self._real.calendar)
+
+    @property
+    def news(self):
+        return self._record("news", self._real.news)
+
+class RecordingTAHandler:
+    def __init__(self, real, symbol, store):
+        self._real = real
+        self._symbol = symbol
+        self._store = store
+
+    def get_analysis(self):
+        analysis = self._real.get_analysis()
+        self._store.put_tradingview(self._symbol, analysis)
+        return analysis
+
+class RecordingHttpClient:
+    def __init__(self, real, store):
+        self._real = real
+        self._store = store
+
+    def __enter__(self):
+        self._real.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._real.__exit__(*exc)
+
+    def close(self):
+        self._real.close()
+
+    def get(self, url, **kwargs):
+        response = self._real.get(url, **kwargs)
+        if response.status_code < 400:
+            self._store.put_http(str(url), response.content)
+        return response
+
+class RecordingTradierSession:
+    """Wraps the shared requests.Session tradier_client uses and records every Tradier body."""
+
+    def __init__(self, real, store):
+        self._real = real
+        self._store = store
+
+    def get(self, url, params=None, **kwargs):
+        response = self._real.get(url, params=params, **kwargs)
+        if response.status_code < 400:
+            self._store.put_tradier(tradier_key(url, params), response.content)
+        return response
+
+def _recording_proxy(store):
+    def ticker(symbol, session=None):
+        import yfinance
+        real = yfinance.Ticker(symbol, session=session) if session is not None else yfinance.Ticker(symbol)
+        return RecordingTicker(real, symbol, store)
+
+    def ta_handler(symbol, **kwargs):
+        from tradingview_ta import TA_Handler
+        return RecordingTAHandler(TA_Handler(symbol=symbol, **kwargs), symbol, store)
+
+    def client(**kwargs):
+        import httpx
+        return RecordingHttpClient(httpx.Client(**kwargs), store)
+
+    def shared_client():
+        from http_sessions import http_client
+        return RecordingHttpClient(http_client(), store)
+
+    def tradier_session():
+        from http_sessions import requests_session
+        return RecordingTradierSession(requests_session(), store)
+
+    def parse(url_file_stream_or_string, *args, **kwargs):
+        import httpx
+        import feedparser as real_feedparser
+
+        source = url_file_stream_or_string
+        if isinstance(source, str) and source.startswith(("http://", "https://")):
+            # Fetch the bytes ourselves so the exact body feedparser saw is on disk
+            with httpx.Client(timeout=10.0, follow_redirects=True) as c:
+                body = c.get(source).content
+            store.put_http(source, body)
+            source = body
+        return real_feedparser.parse(source, *args, **kwargs)
+
+    return {
+        "yf": SimpleNamespace(Ticker=ticker),
+        "TA_Handler": ta_handler,
+        "httpx": SimpleNamespace(Client=client),
+        "http_client": shared_client,
+        "feedparser": SimpleNamespace(parse=parse),
+        "requests_session": tradier_session,
+    }
+
+@contextmanager
+def recording(store, *modules):
+    """Route the modules' provider calls through live clients and save every response to `store`.
+
+    tradier_client is always patched, as in replaying().
+    """
+    import tradier_client
+    from provider_calls import recording_calls
+
+    try:
+        with _patched((*modules, tradier_client), _recording_proxy(store)), recording_calls():
+            yield store
+    finally:
+        store.flush()
+
+# --- CLI wiring ---
+def add_cassette_args(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', type=str, metavar='DIR', help='Record every provider response of this run into DIR')
+    group.add_argument('--replay', type=str, metavar='DIR', help='Serve every provider call from a recording in DIR (no network)')
+
+def cassette(args, *modules):
+    """Context manager for the --record/--replay flags; a no-op when neither is given."""
+    if getattr(args, "record", None):
+        return recording(RecordingStore(args.record), *modules)
+    if getattr(args, "replay", None):
+        return replaying(FixtureStore(args.replay, base=None), *modules)
+    return nullcontext()
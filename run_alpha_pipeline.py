@@ -1,23 +1,65 @@
 import sys
 import os
+import argparse
+import time
 import subprocess
 
+from run_metrics import start_run, finish_run
+from scheduler import Deadline, plan_run, print_plan, skip_record
+
 # List of tickers to process
 TICKERS = ["AAPL", "AMD", "AMZN", "GOOGL", "META", "MSFT", "NVDA", "TSLA", "SPY", "QQQ"]
+# Scheduling tier (1 = always first); anything not listed is tier 2
+TICKER_TIERS = {"SPY": 1, "QQQ": 1}
 
 def main():
+    parser = argparse.ArgumentParser(description="Daily Alpha Pipeline")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', type=str, metavar='DIR', help='Record every provider response of the run into DIR')
+    group.add_argument('--replay', type=str, metavar='DIR', help='Replay a recorded run from DIR with no network')
+    parser.add_argument('--metrics-textfile', type=str, default=None,
+                        help='Write node-exporter textfile metrics here (or set ALPHA_PROM_TEXTFILE)')
+    parser.add_argument('--deadline-minutes', type=float, default=None,
+                        help='Stop starting tickers that will not finish within this many minutes')
+    args = parser.parse_args()
+
+    cassette_args = ["--record", args.record] if args.record else ["--replay", args.replay] if args.replay else []
+
     print("Starting Daily Alpha Pipeline...")
-    
-    for ticker in TICKERS:
+    metrics_path, started_at = start_run()
+    deadline = Deadline(args.deadline_minutes * 60) if args.deadline_minutes else None
+    plan = plan_run(TICKERS, "run_alpha_pipeline", TICKER_TIERS, artifact=lambda t: f"{t}_Alpha.html")
+    print_plan(plan, deadline)
+    ticker_runs = []
+    skipped = []
+
+    for item in plan:
+        ticker = item["ticker"]
+        if deadline and not deadline.fits(item["estimate_s"]):
+            print(f"\n[{ticker}] Skipped: ~{item['estimate_s']:.0f}s estimated, {max(deadline.remaining(), 0):.0f}s left")
+            skipped.append(skip_record(item, deadline))
+            continue
         print(f"\n[{ticker}] Processing...")
+        start = time.perf_counter()
         try:
-            # Run the standalone script
-            subprocess.run([sys.executable, "alpha_standalone.py", "--ticker", ticker], check=True)
+            # Run the standalone script; the deadline also caps a single hung ticker
+            subprocess.run([sys.executable, "alpha_standalone.py", "--ticker", ticker, *cassette_args], check=True,
+                           timeout=max(deadline.remaining(), 1) if deadline else None)
+            status = "ok"
         except subprocess.CalledProcessError as e:
             print(f"[{ticker}] Failed: {e}")
-            continue
+            status = f"failed ({e.returncode})"
+        except subprocess.TimeoutExpired:
+            print(f"[{ticker}] Killed at the run deadline")
+            status = "timeout"
+        ticker_runs.append({"ticker": ticker, "wall_s": round(time.perf_counter() - start, 3), "status": status})
 
     print("\nPipeline Complete.")
+    if skipped:
+        print(f"Skipped for time: {', '.join(s['ticker'] for s in skipped)}")
+    finish_run(metrics_path, started_at, textfile=args.metrics_textfile,
+               pipeline="run_alpha_pipeline", ticker_runs=ticker_runs, skipped_tickers=skipped,
+               schedule={"deadline_s": deadline.budget_s if deadline else None, "plan": plan})
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+METRICS_ENV = "ALPHA_METRICS_FILE"
+DEFAULT_PROFILE_DIR = "profiling"
+
+def payload_size(obj):
+    """Best-effort size in bytes of a provider payload (exact for raw bodies, estimated for frames)."""
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8", errors="ignore"))
+    if hasattr(obj, "memory_usage"):
+        try:
+            return int(obj.memory_usage(deep=True).sum())
+        except Exception:
+            return 0
+    try:
+        return len(json.dumps(obj, default=str))
+    except Exception:
+        return 0
+
+def add_profile_args(parser):
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, default=None, metavar='DIR',
+                        help=f'Write per-stage cProfile + tracemalloc output (default dir: {DEFAULT_PROFILE_DIR}/)')
+
+class StageRecord:
+    __slots__ = ("ticker", "stage", "provider", "wall_s", "cpu_s", "requests", "bytes",
+                 "cache_hits", "cache_misses", "errors", "error")
+
+    def __init__(self, ticker, stage, provider=None):
+        self.ticker = ticker
+        self.stage = stage
+        self.provider = provider
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.requests = 1 if provider else 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors = 0
+        self.error = None
+
+    def add_bytes(self, obj):
+        self.bytes += payload_size(obj)
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+class RunMetrics:
+    """Collects ticker x stage x provider timings for one process.
+
+    When ALPHA_METRICS_FILE is set (by run_alpha_pipeline / ghost_pulse), records are appended to
+    it as JSON lines at exit so the parent can merge its children into one run manifest.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+        self._flushed = 0
+        self.profiler = None
+        if os.environ.get(METRICS_ENV):
+            atexit.register(self.flush)
+
+    def enable_profiling(self, out_dir, label):
+        """Profile every stage from here on (see stage_profiler); results are written at exit."""
+        from stage_profiler import StageProfiler
+
+        self.profiler = StageProfiler(out_dir, label)
+        atexit.register(self.profiler.save)
+
+    @contextmanager
+    def stage(self, ticker, stage, provider=None):
+        rec = StageRecord(ticker, stage, provider)
+        token = self.profiler.enter(stage) if self.profiler else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        except Exception as e:
+            rec.errors += 1
+            rec.error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            rec.wall_s = round(time.perf_counter() - wall, 6)
+            # process_time covers every thread, so concurrent stages each see the shared CPU
+            rec.cpu_s = round(time.process_time() - cpu, 6)
+            if self.profiler:
+                self.profiler.exit(token)
+            with self._lock:
+                self.records.append(rec.as_dict())
+
+    def cache(self, ticker, stage, provider, hit):
+        rec = StageRecord(ticker, stage, provider)
+        rec.requests = 0
+        if hit:
+            rec.cache_hits = 1
+        else:
+            rec.cache_misses = 1
+        with self._lock:
+            self.records.append(rec.as_dict())
+
+    def flush(self, path=None):
+        path = path or os.environ.get(METRICS_ENV)
+        if not path:
+            return
+        with self._lock:
+            pending = self.records[self._flushed:]
+            self._flushed = len(self.records)
+        if pending:
+            with open(path, "a") as f:
+                for rec in pending:
+                    f.write(json.dumps(rec) + "\n")
+
+metrics = RunMetrics()
+
+# --- Run manifest ---
+def load_records(path):
+    records = []
+    if path and os.path.exists(path):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+def aggregate(records, keys):
+    totals = defaultdict(lambda: defaultdict(float))
+    for rec in records:
+        group = tuple(rec.get(k) for k in keys)
+        for field in ("wall_s", "cpu_s", "requests", "bytes", "cache_hits", "cache_misses", "errors"):
+            totals[group][field] += rec.get(field) or 0
+        totals[group]["calls"] += 1
+    rows = []
+    for group, fields in totals.items():
+        row = dict(zip(keys, group))
+        row.update({k: round(v, 6) if isinstance(v, float) else v for k, v in fields.items()})
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["wall_s"], reverse=True)
+
+def build_manifest(records, started_at, finished_at=None, **extra):
+    finished_at = finished_at or datetime.now(timezone.utc)
+    manifest = {
+        "started_at": started_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "finished_at": finished_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "duration_s": round((finished_at - started_at).total_seconds(), 3),
+        "tickers": aggregate(records, ["ticker"]),
+        "stages": aggregate(records, ["stage"]),
+        "providers": aggregate([r for r in records if r.get("provider")], ["provider"]),
+        "records": records,
+    }
+    manifest.update(extra)
+    return manifest
+
+def write_manifest(manifest, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Run manifest saved to: {path}")
+    return path
+
+def print_summary(manifest, top=5, out=sys.stdout):
+    def table(title, rows, key):
+        print(f"\n{title}", file=out)
+        print(f"  {key:<24} {'wall s':>9} {'cpu s':>8} {'reqs':>6} {'MB':>8} {'errors':>6}", file=out)
+        for row in rows[:top]:
+            print(f"  {str(row[key]):<24} {row['wall_s']:>9.2f} {row['cpu_s']:>8.2f} {int(row['requests']):>6} "
+                  f"{row['bytes'] / 1e6:>8.2f} {int(row['errors']):>6}", file=out)
+
+    table("Slowest tickers:", manifest["tickers"], "ticker")
+    table("Slowest stages:", manifest["stages"], "stage")
+    table("Slowest providers:", manifest["providers"], "provider")
+
+def default_manifest_path(date_str=None):
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    return os.path.join("daily_signals", date_str, f"Run_Manifest_{date_str}.json")
+
+def start_run():
+    """Route child-process metrics into a fresh JSONL file; returns (path, started_at)."""
+    import tempfile
+
+    from provider_calls import BREAKER_ENV
+
+    fd, path = tempfile.mkstemp(prefix="alpha-metrics-", suffix=".jsonl")
+    os.close(fd)
+    os.environ[METRICS_ENV] = path
+    # Circuit-breaker state shared by every ticker subprocess of this run
+    os.environ[BREAKER_ENV] = f"{path[:-len('.jsonl')]}.breakers.json"
+    return path, datetime.now(timezone.utc)
+
+def finish_run(path, started_at, manifest_path=None, textfile=None, **extra):
+    """Merge child records with this process's own, write the run manifest and print the summary.
+
+    `textfile` (or ALPHA_PROM_TEXTFILE) additionally exports the run as a node-exporter textfile.
+    """
+    records = load_records(path) + metrics.records
+    manifest = build_manifest(records, started_at, **extra)
+    write_manifest(manifest, manifest_path or default_manifest_path())
+    print_summary(manifest)
+
+    from metrics_export import PROM_TEXTFILE_ENV, write_textfile
+    textfile = textfile or os.environ.get(PROM_TEXTFILE_ENV)
+    if textfile:
+        try:
+            write_textfile(manifest, textfile, date_str=datetime.now().strftime('%Y-%m-%d'))
+        except Exception as e:
+            print(f"Metrics Export Error: {e}")
+    from provider_calls import BREAKER_ENV
+
+    for leftover in (path, os.environ.pop(BREAKER_ENV, None)):
+        try:
+            os.remove(leftover)
+        except (OSError, TypeError):
+            pass
+    os.environ.pop(METRICS_ENV, None)
+    return manifest
@@ -0,0 +1,113 @@
+import os
+import json
+import glob
+import time
+import statistics
+from datetime import datetime
+
+DEFAULT_TIER = 2
+DEFAULT_COST_S = 60.0
+HISTORY_RUNS = 5
+MANIFEST_GLOB = os.path.join("daily_signals", "*", "Run_Manifest_*.json")
+
+class Deadline:
+    """Wall-clock budget for a run, measured from construction."""
+
+    def __init__(self, budget_s, reserve_s=0.0):
+        self.budget_s = budget_s
+        self.reserve_s = reserve_s
+        self.started = time.monotonic()
+
+    def remaining(self):
+        return self.budget_s - self.reserve_s - (time.monotonic() - self.started)
+
+    def fits(self, estimate_s):
+        return self.remaining() >= estimate_s
+
+def load_cost_history(pipeline, pattern=MANIFEST_GLOB, runs=HISTORY_RUNS):
+    """Per-ticker wall times of successful tickers from the last `runs` manifests of a pipeline."""
+    history = {}
+    for path in sorted(glob.glob(pattern), reverse=True):
+        try:
+            with open(path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get("pipeline") != pipeline:
+            continue
+        for run in manifest.get("ticker_runs", []):
+            samples = history.setdefault(run["ticker"], [])
+            if run.get("status") == "ok" and len(samples) < runs:
+                samples.append(run["wall_s"])
+    return {ticker: samples for ticker, samples in history.items() if samples}
+
+def estimate_costs(tickers, history):
+    """Median of recent runs per ticker; unseen tickers get the median of the known ones."""
+    known = {t: statistics.median(samples) for t, samples in history.items()}
+    fallback = statistics.median(known.values()) if known else DEFAULT_COST_S
+    return {t: round(known.get(t, fallback), 3) for t in tickers}
+
+def last_report(ticker):
+    path = f"reports/{ticker}/latest.json"
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def report_volatility(report):
+    """30-day historical volatility (percent) from an options payload or a HUD one, None without either."""
+    hv = report.get("historicVolatility")
+    if hv is None:
+        hv = (report.get("volatility") or {}).get("hv_30d")
+    return hv
+
+def staleness_hours(path):
+    if not os.path.exists(path):
+        return None
+    return (time.time() - os.path.getmtime(path)) / 3600
+
+def priority(tier, volatility, stale_h):
+    """Sort key: lower tier first, then tickers that moved more or have gone longer without a report."""
+    urgency = min(stale_h if stale_h is not None else 72, 72) / 24
+    urgency += (volatility or 0) / 50
+    return (tier, -round(urgency, 3))
+
+def plan_run(tickers, pipeline, tiers=None, artifact=lambda t: f"reports/{t}/latest.json"):
+    """Order tickers by priority and attach a cost estimate from previous run manifests."""
+    tiers = tiers or {}
+    costs = estimate_costs(tickers, load_cost_history(pipeline))
+    plan = []
+    for ticker in tickers:
+        report = last_report(ticker) or {}
+        item = {
+            "ticker": ticker,
+            "tier": tiers.get(ticker, DEFAULT_TIER),
+            "volatility": report_volatility(report),
+            "stale_h": staleness_hours(artifact(ticker)),
+            "estimate_s": costs[ticker],
+        }
+        plan.append(item)
+    # A ticker without a report ranks at the median volatility rather than as the calmest one
+    known = [item["volatility"] for item in plan if item["volatility"] is not None]
+    fallback = statistics.median(known) if known else 0
+    for item in plan:
+        volatility = item["volatility"] if item["volatility"] is not None else fallback
+        item["priority"] = priority(item["tier"], volatility, item["stale_h"])
+    plan.sort(key=lambda item: item["priority"])
+    return plan
+
+def print_plan(plan, deadline=None):
+    budget = f" within {deadline.budget_s / 60:.1f} min" if deadline else ""
+    total = sum(item["estimate_s"] for item in plan)
+    print(f"Schedule: {len(plan)} tickers, ~{total / 60:.1f} min estimated{budget}")
+    for item in plan:
+        stale = f"{item['stale_h']:.0f}h" if item["stale_h"] is not None else "never"
+        print(f"  {item['ticker']:<8} tier {item['tier']}  est {item['estimate_s']:>6.1f}s  last report {stale}")
+
+def skip_record(item, deadline):
+    return {"ticker": item["ticker"], "reason": "deadline", "estimate_s": item["estimate_s"],
+            "remaining_s": round(max(deadline.remaining(), 0), 1),
+            "at": datetime.now().strftime("%H:%M:%S")}
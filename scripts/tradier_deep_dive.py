@@ -1,67 +1,42 @@
-import requests
 import os
-import json
-import datetime
-from dotenv import load_dotenv
+import sys
+import argparse
 
-load_dotenv()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tradier_client
 
-TOKEN = os.getenv("TRADIER_ACCESS_TOKEN")
-ACCOUNT_ID = os.getenv("TRADIER_ACCOUNT_ID")
+# Tickers from pre-market scan with high volume/change
+DEFAULT_TICKERS = ['MU', 'AMD', 'UAMY', 'STKH', 'BEPC', 'ZM']
 
-def get_options_chains(symbol):
+def print_deep_dive(symbol, chain, top=10):
     print(f"\n--- Tradier Options Deep-Dive: {symbol} ---")
-    if not TOKEN or not ACCOUNT_ID:
-        print("Missing Tradier credentials.")
+    if chain.empty:
+        print("No options data.")
         return
+    print(f"Analyzing {len(chain.attrs['expirations'])} expirations: {', '.join(chain.attrs['expirations'])}")
 
-    # 1. Get Expirations
-    url = f"https://api.tradier.com/v1/markets/options/expirations?symbol={symbol}&includeAllRoots=true"
-    headers = {"Authorization": f"Bearer {TOKEN}", "Accept": "application/json"}
-    
-    resp = requests.get(url, headers=headers)
-    if resp.status_code != 200:
-        print(f"Error fetching expirations: {resp.text}")
-        return
-        
-    expirations_data = resp.json().get('expirations')
-    if not expirations_data:
-        print(f"No expirations found for {symbol}.")
-        return
-    expirations = expirations_data.get('date', [])
-    if not expirations:
-        print("No expirations found.")
-        return
-        
-    next_expiry = expirations[0]
-    print(f"Analyzing nearest expiry: {next_expiry}")
+    # Focus on the heaviest-traded contracts across every expiration
+    busiest = chain.assign(volume=chain['volume'].fillna(0)).nlargest(top, 'volume')
+    print(f"{'Option':<22} {'Expiry':<11} {'Price':<8} {'Vol':<8} {'IV':<8} {'Delta':<8}")
+    for row in busiest.itertuples(index=False):
+        last = round(row.lastPrice, 2) if row.lastPrice == row.lastPrice else 0.0
+        iv = round(row.impliedVolatility * 100, 1) if row.impliedVolatility == row.impliedVolatility else 0.0
+        delta = round(row.delta, 3) if row.delta == row.delta else 0.0
+        print(f"{row.contractSymbol:<22} {row.expiration:<11} {last:<8} {int(row.volume):<8} {iv:<8} {delta:<8}")
 
-    # 2. Get Chain for nearest expiry
-    url = f"https://api.tradier.com/v1/markets/options/chains?symbol={symbol}&expiration={next_expiry}&greeks=true"
-    resp = requests.get(url, headers=headers)
-    
-    if resp.status_code != 200:
-        print(f"Error fetching chain: {resp.text}")
-        return
-        
-    options = resp.json().get('options', {}).get('option', [])
-    if not options:
-        print("No options data.")
-        return
+def main():
+    parser = argparse.ArgumentParser(description="Top contracts by volume from Tradier option chains")
+    parser.add_argument('tickers', nargs='*', default=DEFAULT_TICKERS)
+    parser.add_argument('--max-dte', type=int, default=60, help='Furthest expiration to include')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
 
-    # Focus on OTM calls/puts with high IV or volume
-    sorted_options = sorted(options, key=lambda x: x.get('volume', 0), reverse=True)
-    
-    print(f"{'Option':<20} {'Price':<8} {'Vol':<8} {'IV':<8} {'Delta':<8}")
-    for opt in sorted_options[:10]:
-        greeks = opt.get('greeks', {})
-        last = opt.get('last') if opt.get('last') is not None else 0.0
-        volume = opt.get('volume') if opt.get('volume') is not None else 0
-        mid_iv = greeks.get('mid_iv') if greeks.get('mid_iv') is not None else 0.0
-        delta = greeks.get('delta') if greeks.get('delta') is not None else 0.0
-        print(f"{opt.get('description', 'N/A'):<20} {last:<8} {volume:<8} {round(mid_iv*100, 1):<8} {delta:<8}")
+    if not tradier_client.is_configured():
+        print("Missing Tradier credentials.")
+        return
+    chains = tradier_client.fetch_chains(args.tickers, max_dte=args.max_dte)
+    for symbol in args.tickers:
+        print_deep_dive(symbol, chains[symbol], args.top)
 
 if __name__ == "__main__":
-    # Tickers from pre-market scan with high volume/change
-    for ticker in ['MU', 'AMD', 'UAMY', 'STKH', 'BEPC', 'ZM']:
-        get_options_chains(ticker)
+    main()
@@ -0,0 +1,125 @@
+import os
+import io
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+TOP_ALLOCATIONS = 15
+# Keep the profiler's own bookkeeping (including diffs running on other threads) out of the tables
+_PROFILER_FILTERS = [tracemalloc.Filter(False, path) for path in
+                     (cProfile.__file__, pstats.__file__, tracemalloc.__file__, __file__)]
+
+def _allocations_since(start):
+    """Lines that gained the most still-alive memory since the `start` snapshot, largest first.
+
+    compare_to groups every trace of both heaps, which takes seconds once pandas is loaded, so it
+    runs once per stage name (see StageProfiler).
+    """
+    end = tracemalloc.take_snapshot().filter_traces(_PROFILER_FILTERS)
+    grown = [d for d in end.compare_to(start.filter_traces(_PROFILER_FILTERS), "lineno") if d.size_diff > 0]
+    grown.sort(key=lambda d: d.size_diff, reverse=True)
+    return [str(d) for d in grown[:TOP_ALLOCATIONS]]
+
+class StageProfiler:
+    """cProfile + tracemalloc around every metrics.stage() of one process.
+
+    Only one cProfile can be active per process (3.12+ enforces it), so the outermost stage that
+    claims the slot is profiled and stages entered meanwhile on other threads are folded into
+    their own memory row only. Profiles for the same stage name are merged across tickers.
+
+    cProfile only sees the thread that enabled it: work a stage hands to provider_calls workers or
+    to a fetch pool shows up in its CPU table as the wait on the future, not as the fetch itself.
+    Those calls run their own metrics.stage() on the worker, which gets a memory row (and the CPU
+    profile, when no other stage holds it).
+
+    tracemalloc keeps one process-wide peak, reset only when no stage is running. A stage that
+    overlaps others counts that peak only if it rose while the stage ran (then it is the peak of
+    the overlap); otherwise the peak predates the stage and its high-water mark is what it still
+    held at exit. Each stage name gets one allocation table, from the heap diff over its first call.
+    """
+
+    def __init__(self, out_dir, label):
+        self.out_dir = out_dir
+        self.label = label
+        self._lock = threading.Lock()
+        self._active = None
+        self._local = threading.local()
+        self._running = 0
+        self._diffed = set()
+        self.stats = {}
+        self.memory = defaultdict(lambda: {"calls": 0, "peak_bytes": 0, "net_bytes": 0, "top": []})
+        if not tracemalloc.is_tracing():
+            # The tables group by line, so one frame per trace is enough and keeps tracing cheap
+            tracemalloc.start(1)
+
+    def enter(self, stage):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth:
+            return None
+        profiler = None
+        with self._lock:
+            if self._active is None:
+                profiler = cProfile.Profile()
+                self._active = profiler
+            self._running += 1
+            if self._running == 1:
+                tracemalloc.reset_peak()
+            diff = stage not in self._diffed
+            self._diffed.add(stage)
+        start = tracemalloc.take_snapshot() if diff else None
+        if profiler:
+            profiler.enable()
+        return (stage, profiler, *tracemalloc.get_traced_memory(), start)
+
+    def exit(self, token):
+        self._local.depth -= 1
+        if token is None:
+            return
+        stage, profiler, start_bytes, start_peak, start = token
+        current, peak = tracemalloc.get_traced_memory()
+        if profiler:
+            profiler.disable()
+        top = _allocations_since(start) if start is not None else None
+        with self._lock:
+            self._running -= 1
+            if profiler:
+                self._active = None
+                if stage in self.stats:
+                    self.stats[stage].add(profiler)
+                else:
+                    self.stats[stage] = pstats.Stats(profiler)
+            row = self.memory[stage]
+            row["calls"] += 1
+            row["net_bytes"] += current - start_bytes
+            # An unchanged peak was reached before this stage started, by whatever ran then
+            stage_peak = peak - start_bytes if peak > start_peak else current - start_bytes
+            row["peak_bytes"] = max(row["peak_bytes"], stage_peak)
+            if top is not None:
+                row["top"] = top
+
+    def save(self):
+        if not self.stats and not self.memory:
+            return None
+        run_dir = os.path.join(self.out_dir, f"{self.label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(run_dir, exist_ok=True)
+        for stage, stats in self.stats.items():
+            stats.dump_stats(os.path.join(run_dir, f"{stage}.prof"))
+            text = io.StringIO()
+            pstats.Stats(os.path.join(run_dir, f"{stage}.prof"), stream=text).sort_stats("cumulative").print_stats(30)
+            with open(os.path.join(run_dir, f"{stage}.txt"), "w") as f:
+                f.write(text.getvalue())
+
+        rows = sorted(self.memory.items(), key=lambda kv: kv[1]["peak_bytes"], reverse=True)
+        with open(os.path.join(run_dir, "memory.txt"), "w") as f:
+            f.write(f"{'stage':<16} {'calls':>6} {'peak MB':>9} {'net MB':>9}\n")
+            for stage, row in rows:
+                f.write(f"{stage:<16} {row['calls']:>6} {row['peak_bytes'] / 1e6:>9.2f} {row['net_bytes'] / 1e6:>9.2f}\n")
+            for stage, row in rows:
+                f.write(f"\n== {stage}: top allocations still held at the end of its first call ==\n")
+                f.write("\n".join(row["top"]) + "\n")
+        print(f"Profiles saved to: {run_dir}")
+        return run_dir
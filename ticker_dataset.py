@@ -0,0 +1,663 @@
+"""
+One data-acquisition pass per ticker, shared by every playbook.
+
+acquire() downloads history, fundamentals, TradingView, the option chain and the RSS intel feed once
+into a TickerDataset, and records the day's options history when it fetched the chain. hud_data(),
+options_data() and standalone_data() are projections of it that neither touch the network nor write
+anything, so generate_reports.py renders the HUD, options and standalone reports for a ticker
+in one process. fetch_playbook_data.py, fetch_options_data.py and alpha_standalone.py are thin wrappers
+that acquire only what their own report needs.
+"""
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import (LazyImport, calculate_sma, calculate_ema, calculate_rsi, calculate_macd, calculate_adx,
+                   clean_dict, format_large_number, calculate_intrinsic_value)
+from run_metrics import metrics
+from http_sessions import http_client, yf_session
+from provider_calls import call, checked_get
+from options_chain import fetch_chain
+from options_history import chain_snapshot, record_snapshot, change_metrics, ratio_series, iv_stats
+from greeks import chain_greeks, exposure_totals, strike_table
+from gamma_exposure import gamma_levels, snapshot_fields, record_profile
+from open_interest import oi_summary
+from vol_surface import build_surface, record_surface, load_surface
+from config import OPTIONS_MAX_DTE, OPTIONS_CHAIN_PROVIDER
+import tradier_client
+
+yf = LazyImport("yfinance")
+pd = LazyImport("pandas")
+np = LazyImport("numpy")
+feedparser = LazyImport("feedparser")
+TA_Handler = LazyImport("tradingview_ta", "TA_Handler")
+Interval = LazyImport("tradingview_ta", "Interval")
+
+FUNDAMENTAL_ATTRS = {'insiders': 'insider_transactions', 'news': 'news', 'info': 'info', 'calendar': 'calendar'}
+EXCHANGE_MAP = {'NMS': 'NASDAQ', 'NYQ': 'NYSE', 'NGM': 'NASDAQ', 'ASE': 'AMEX', 'PCX': 'ARCA'}
+RSS_FEEDS = {
+    "bloomberg": "https://feeds.bloomberg.com/markets/news.rss",
+    "wsj": "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
+    "cnbc": "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=10001147",
+    "seekingalpha": "https://seekingalpha.com/market_currents.xml",
+    "marketwatch": "https://www.marketwatch.com/rss/topstories",
+    "ft": "https://www.ft.com/rss/home"
+}
+# Which expiration the HUD reads its IV from when it has no surface (the third listed, ~2-3 weeks out)
+HUD_EXPIRATION_INDEX = 2
+
+class TickerDataset:
+    """Everything fetched for one ticker. `chain` is None unless the full chain was acquired, and
+    `quoted_vol` holds the HUD's (iv, skew) when it was read without one. `option_history` is the
+    stored daily chain history including today's row (empty without a chain)."""
+
+    def __init__(self, ticker, df, technicals, fundamentals, tv_analysis, chain=None, quoted_vol=None,
+                 rss_items=None):
+        self.ticker = ticker
+        self.df = df
+        self.technicals = technicals
+        self.fundamentals = fundamentals
+        self.tv_analysis = tv_analysis
+        self.chain = chain
+        self.quoted_vol = quoted_vol
+        self.rss_items = rss_items
+        self.option_history = pd.DataFrame()
+        self._options = None
+
+    @property
+    def info(self):
+        return self.fundamentals['info']
+
+    @property
+    def latest(self):
+        return self.df.iloc[-1]
+
+    @property
+    def options(self):
+        """Chain analytics (greeks, GEX, vol surface, max pain), computed once on first use."""
+        if self._options is None:
+            self._options = _chain_analytics(self)
+        return self._options
+
+# --- Acquisition ---
+def _indicators(ticker, df):
+    with metrics.stage(ticker, "indicators"):
+        for span in (8, 21, 34, 55, 89):
+            df[f'EMA_{span}'] = calculate_ema(df['Close'], span)
+
+        sma_50_series = calculate_sma(df['Close'], 50)
+        sma_200_series = calculate_sma(df['Close'], 200)
+        sma_50 = sma_50_series.iloc[-1] if not sma_50_series.empty else np.nan
+        sma_200 = sma_200_series.iloc[-1] if not sma_200_series.empty else np.nan
+
+        _, _, macd_hist = calculate_macd(df['Close'])
+        df['MACDh_12_26_9'] = macd_hist
+        df['RSI_14'] = calculate_rsi(df['Close'])
+        df['ADX_14'] = calculate_adx(df['High'], df['Low'], df['Close'])
+        df['log_ret'] = np.log(df['Close'] / df['Close'].shift(1))
+
+        vol_avg = df['Volume'].rolling(window=20).mean()
+        return {
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "sma_200_val": sma_200 if not np.isnan(sma_200) else sma_50 if not np.isnan(sma_50) else df['Close'].iloc[-1],
+            "sma_50_val": sma_50 if not np.isnan(sma_50) else df['Close'].iloc[-1],
+            "hv": df['log_ret'].rolling(window=30).std() * np.sqrt(252) * 100,
+            "vol_avg": vol_avg,
+            "rel_vol": df['Volume'] / vol_avg,
+        }
+
+def _atm_call_iv(chain, expiration, close):
+    """Mean IV (percent) of the expiration's calls struck within 5% of the close, 0 without any."""
+    calls = chain[(chain['side'] == 'call') & (chain['expiration'] == expiration)] if 'side' in chain else chain
+    atm = calls[(calls['strike'] >= close * 0.95) & (calls['strike'] <= close * 1.05)]
+    return atm['impliedVolatility'].mean() * 100 if not atm.empty else 0
+
+def _surface_vol(surface):
+    """(30-day ATM IV, 30-day 25-delta skew) in percent from a surface, or None when it has no 30-day IV."""
+    if not surface or not np.isfinite(surface.atm_iv(30)):
+        return None
+    skew = float(surface.skew_at(30)) * 100 if np.isfinite(surface.skew_at(30)) else None
+    return float(surface.atm_iv(30)) * 100, skew
+
+def _quoted_vol(ticker, stock, df):
+    """The HUD's IV without the full chain: the session's cached surface, else one expiration's calls."""
+    # The options run caches a surface per session; its 30-day point beats a one-expiration average
+    cached = _surface_vol(load_surface(ticker, df.index[-1].strftime('%Y-%m-%d')))
+    if cached:
+        metrics.cache(ticker, "options", "vol_surface", True)
+        return cached
+    iv = 0
+    try:
+        with metrics.stage(ticker, "options", "yfinance.options"):
+            expirations = call("yfinance.options", lambda: stock.options)
+        if expirations:
+            exp = expirations[min(HUD_EXPIRATION_INDEX, len(expirations) - 1)]
+            with metrics.stage(ticker, "options", "yfinance.option_chain") as m:
+                calls = call("yfinance.option_chain", stock.option_chain, exp).calls
+                m.add_bytes(calls)
+            iv = _atm_call_iv(calls.assign(side='call', expiration=exp), exp, df['Close'].iloc[-1])
+    except Exception:
+        pass
+    return iv, None
+
+def fetch_option_chain(ticker, stock, provider=OPTIONS_CHAIN_PROVIDER):
+    """The chain from `provider`; Tradier falls back to yfinance when it isn't configured or returns nothing."""
+    if provider == "tradier":
+        if tradier_client.is_configured():
+            try:
+                chain = tradier_client.fetch_chain(ticker, max_dte=OPTIONS_MAX_DTE)
+                if not chain.empty:
+                    return chain
+            except Exception as e:
+                print(f"Error fetching Tradier chain: {e}")
+        print("Using the yfinance option chain instead of Tradier")
+    return fetch_chain(ticker, stock, max_dte=OPTIONS_MAX_DTE)
+
+def _fundamental(ticker, stock, component):
+    try:
+        with metrics.stage(ticker, "fundamentals", f"yfinance.{component}") as m:
+            result = call(f"yfinance.{component}", getattr, stock, FUNDAMENTAL_ATTRS[component])
+            m.add_bytes(result)
+        return result
+    except Exception:
+        return None
+
+def _rss_entries(ticker, source, url):
+    try:
+        with metrics.stage(ticker, "rss", f"rss.{source}") as m:
+            response = call(f"rss.{source}", checked_get, http_client(), url, timeout=5.0)
+            m.add_bytes(response.content)
+            return feedparser.parse(response.text).entries
+    except Exception:
+        return []
+
+def _rss_item(entry, source):
+    return {'title': entry.get('title', 'No Title'), 'link': entry.get('link', ''), 'source': source,
+            'summary': entry.get('summary', entry.get('description', 'No summary'))[:150] + "..."}
+
+def _ticker_feed(ticker):
+    ticker_feed = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}"
+    try:
+        with metrics.stage(ticker, "rss", "rss.yahoo"):
+            return call("rss.yahoo", feedparser.parse, ticker_feed).entries
+    except Exception:
+        return []
+
+def _tradingview(ticker, info):
+    try:
+        exchange = EXCHANGE_MAP.get(info.get('exchange', 'NMS'), 'NASDAQ')
+        handler = TA_Handler(symbol=ticker, screener="america", exchange=exchange, interval=Interval.INTERVAL_1_DAY)
+        with metrics.stage(ticker, "tradingview", "tradingview") as m:
+            analysis = call("tradingview", handler.get_analysis)
+            m.add_bytes(analysis.indicators)
+        return {"summary": analysis.summary, "oscillators": analysis.oscillators,
+                "moving_averages": analysis.moving_averages, "indicators": analysis.indicators}
+    except Exception:
+        return {"summary": {"RECOMMENDATION": "UNAVAILABLE"}}
+
+def acquire(ticker, options="chain", rss=False, chain_provider=OPTIONS_CHAIN_PROVIDER):
+    """Fetch everything the requested reports need for `ticker` in one pass, or None without price history.
+
+    `options` is "chain" for the full option chain (options report), "iv" for just the HUD's IV, or None.
+    `rss` adds the news feeds the standalone report shows. Fundamentals, the chain and the feeds are
+    fetched concurrently; TradingView starts as soon as `info` has named the exchange. With the chain,
+    the day's snapshot, GEX profile and vol surface are recorded under reports/<ticker>/.
+    """
+    print(f"Fetching data for {ticker}...")
+    stock = yf.Ticker(ticker, session=yf_session())
+    try:
+        with metrics.stage(ticker, "history", "yfinance") as m:
+            df = call("yfinance", stock.history, period='2y')
+            m.add_bytes(df)
+        if df.empty:
+            raise ValueError(f"No price data found for {ticker}")
+    except Exception as e:
+        print(f"Error fetching history: {e}")
+        return None
+    technicals = _indicators(ticker, df)
+
+    fundamentals = {'insiders': [], 'news': [], 'info': {}, 'calendar': {}}
+    chain, quoted_vol, rss_items = None, None, None
+    with ThreadPoolExecutor() as executor:
+        parts = {c: executor.submit(_fundamental, ticker, stock, c) for c in fundamentals}
+        if options == "chain":
+            chain_future = executor.submit(fetch_option_chain, ticker, stock, chain_provider)
+        elif options == "iv":
+            chain_future = executor.submit(_quoted_vol, ticker, stock, df)
+        if rss:
+            feeds = [(src.upper(), executor.submit(_rss_entries, ticker, src, url)) for src, url in RSS_FEEDS.items()]
+            ticker_feed = executor.submit(_ticker_feed, ticker)
+
+        for component, future in parts.items():
+            if future.result() is not None:
+                fundamentals[component] = future.result()
+        tv_analysis = _tradingview(ticker, fundamentals['info'])
+
+        if options == "chain":
+            try:
+                chain = chain_future.result()
+            except Exception as e:
+                print(f"Error fetching options: {e}")
+                chain = pd.DataFrame()
+        elif options == "iv":
+            quoted_vol = chain_future.result()
+        if rss:
+            # The ticker's own headlines first (newest last, as the standalone always listed them), then
+            # two from each market feed; the first item with a title wins
+            rss_items = [_rss_item(e, 'YF-RSS') for e in ticker_feed.result()[:5]][::-1]
+            rss_items += [_rss_item(e, src) for src, f in feeds for e in f.result()[:2]]
+            seen_titles = set()
+            rss_items = [item for item in rss_items
+                         if item['title'] not in seen_titles and not seen_titles.add(item['title'])]
+
+    ds = TickerDataset(ticker, df, technicals, fundamentals, tv_analysis, chain, quoted_vol, rss_items)
+    if chain is not None and not chain.empty:
+        _record_history(ds)
+    return ds
+
+def _record_history(ds):
+    """Store the day's chain aggregates, GEX profile and vol surface; keeps the history on `ds`."""
+    ticker, opts, date_str = ds.ticker, ds.options, ds.df.index[-1].strftime('%Y-%m-%d')
+    try:
+        snapshot = chain_snapshot(ds.chain, date_str, ds.latest['Close'], atm_iv=_hud_volatility(ds)[0])
+        if opts["gamma"]:
+            snapshot.update(snapshot_fields(opts["gamma"]))
+            record_profile(ticker, date_str, opts["gamma_profile"])
+        ds.option_history = record_snapshot(ticker, snapshot, ds.chain)
+    except Exception as e:
+        print(f"Error updating options history: {e}")
+    if opts["surface"]:
+        try:
+            record_surface(ticker, date_str, opts["surface"])
+        except Exception as e:
+            print(f"Error caching volatility surface: {e}")
+
+# --- Options analytics ---
+def _chain_analytics(ds):
+    """Aggregates, greeks, GEX, vol surface and max pain for the acquired chain (empty defaults without one)."""
+    chain, empty = ds.chain if ds.chain is not None else pd.DataFrame(), pd.DataFrame()
+    out = {
+        "call_vol": 0, "put_vol": 0, "call_oi": 0, "put_oi": 0,
+        "greeks": {"expiration": None, "strikes": [], "exposure": exposure_totals(empty)},
+        "gamma": None, "gamma_profile": None, "surface": None, "oi": oi_summary(empty, 0),
+    }
+    if chain.empty:
+        return out
+    ticker, spot = ds.ticker, float(ds.df['Close'].iloc[-1])
+    try:
+        calls, puts = chain[chain['side'] == 'call'], chain[chain['side'] == 'put']
+        out["call_vol"], out["call_oi"] = calls['volume'].fillna(0).sum(), calls['openInterest'].fillna(0).sum()
+        out["put_vol"], out["put_oi"] = puts['volume'].fillna(0).sum(), puts['openInterest'].fillna(0).sum()
+    except Exception as e:
+        print(f"Error fetching options: {e}")
+    try:
+        with metrics.stage(ticker, "greeks"):
+            priced = chain_greeks(chain, spot)
+            nearest = chain.attrs['expirations'][0]
+            out["greeks"] = {"expiration": nearest, "strikes": strike_table(priced, spot, nearest),
+                             "exposure": exposure_totals(priced)}
+        with metrics.stage(ticker, "gamma"):
+            out["gamma"], out["gamma_profile"] = gamma_levels({ticker: (priced, spot)})[ticker]
+        with metrics.stage(ticker, "vol_surface"):
+            out["surface"] = build_surface(priced, spot)
+    except Exception as e:
+        print(f"Error computing greeks: {e}")
+    try:
+        with metrics.stage(ticker, "max_pain"):
+            out["oi"] = oi_summary(chain, spot)
+    except Exception as e:
+        print(f"Error computing max pain: {e}")
+    return out
+
+def _hud_volatility(ds):
+    """The one IV every payload and the stored history use, as (iv, skew): the 30-day point of the
+    surface when the chain was acquired, else what acquire() quoted without it."""
+    if ds.chain is None:
+        return ds.quoted_vol or (0, None)
+    from_surface = _surface_vol(ds.options["surface"])
+    if from_surface:
+        return from_surface
+    expirations = ds.chain.attrs.get('expirations') or []
+    if not expirations:
+        return 0, None
+    exp = expirations[min(HUD_EXPIRATION_INDEX, len(expirations) - 1)]
+    return _atm_call_iv(ds.chain, exp, ds.df['Close'].iloc[-1]), None
+
+# --- Projections ---
+def _insider_rows(insiders):
+    rows = []
+    if not isinstance(insiders, pd.DataFrame) or insiders.empty:
+        return rows
+    for _, row in insiders.reset_index().head(5).iterrows():
+        try:
+            date_val = row.get('Start Date') or row.get('Date')
+            date_str = date_val.strftime('%Y-%m-%d') if isinstance(date_val, pd.Timestamp) else str(date_val)
+            val = row.get('Value')
+            value_str = format_large_number(val) if isinstance(val, (int, float)) else str(val)
+            rows.append({"date": date_str, "insider": row.get('Insider', 'Unknown'),
+                         "type": row.get('Transaction', 'Unknown'), "value": value_str})
+        except Exception:
+            continue
+    return rows
+
+def _series(df):
+    chart_data = []
+    ema_data = {"8": [], "21": [], "34": [], "55": [], "89": []}
+    try:
+        hist_data = df.tail(400).copy().reset_index()
+        for _, row in hist_data.iterrows():
+            d_val = row['Date']
+            d_str = d_val.strftime('%Y-%m-%d') if pd.notnull(d_val) else ""
+            if not d_str:
+                continue
+            chart_data.append({"time": d_str, "open": round(row['Open'], 2), "high": round(row['High'], 2),
+                               "low": round(row['Low'], 2), "close": round(row['Close'], 2)})
+            for span in ema_data:
+                val = row.get(f"EMA_{span}")
+                if val is not None and not np.isnan(val):
+                    ema_data[span].append({"time": d_str, "value": round(float(val), 2)})
+    except Exception as e:
+        print(f"Error preparing chart data: {e}")
+    return chart_data, ema_data
+
+def _logo_url(info):
+    website = info.get('website', '')
+    logo_url = info.get('logo_url', '')
+    if not logo_url and website:
+        try:
+            domain = website.replace('http://', '').replace('https://', '').split('/')[0]
+            logo_url = f"https://logo.clearbit.com/{domain}"
+        except Exception:
+            logo_url = ""
+    return logo_url
+
+def _playbook(ds, volatility, intel=None):
+    """The HUD payload every report shares, before scores; `intel` fills the news feed when given."""
+    df, info, ticker, latest, t = ds.df, ds.info, ds.ticker, ds.latest, ds.technicals
+    sma_50, sma_200, sma_50_val, sma_200_val = t["sma_50"], t["sma_200"], t["sma_50_val"], t["sma_200_val"]
+
+    hist_month = df.iloc[-21:]
+    high_m, low_m, close_m = hist_month['High'].max(), hist_month['Low'].min(), hist_month['Close'].iloc[-1]
+    pp = (high_m + low_m + close_m) / 3
+    hist_1y = df.iloc[-252:]
+    h52, l52 = hist_1y['High'].max(), hist_1y['Low'].min()
+    diff = h52 - l52
+
+    intel = (intel or [])[:8]
+    supply_chain_claims = [{
+        "claim": f"<a href='{item['link']}' target='_blank' class='hover:text-neon-blue transition-colors'>{item['title']}</a>",
+        "status": "NEWS", "desc": f"<span class='text-neon-blue'>[{item['source']}]</span> {item['summary']}",
+    } for item in intel]
+
+    sec_ops = (
+        f"{info.get('longName', ticker)} // {info.get('sector', 'N/A')} [{info.get('industry', 'N/A')}]. "
+        f"Mkt Cap: {format_large_number(info.get('marketCap'))}. "
+        f"Rev Growth: {info.get('revenueGrowth', 0)*100 if info.get('revenueGrowth') else 0:.1f}%. "
+        f"PM: {info.get('profitMargins', 0)*100 if info.get('profitMargins') else 0:.1f}%."
+    )
+    sec_risks = (
+        f"Beta: {info.get('beta', 'N/A')}. "
+        f"Range(52W): {info.get('fiftyTwoWeekLow', 0)} - {info.get('fiftyTwoWeekHigh', 0)}. "
+        f"Analyst Tgt: {info.get('targetMeanPrice', 'N/A')}."
+    )
+    geo = {
+        "site": f"{info.get('city', 'Unknown')}, {info.get('country', 'Unknown')}",
+        "coords": info.get('website', 'N/A'),
+        "score": 0.0,
+        "observations": [{"period": "Current", "desc": "Headquarters location."}]
+    }
+    chart_data, ema_data = _series(df)
+    iv, skew = volatility
+    vol_avg, rel_vol = t["vol_avg"], t["rel_vol"]
+
+    return {
+        "ticker": ticker,
+        "logo_url": _logo_url(info),
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "chart_data": chart_data,
+        "ema_data": ema_data,
+        "market_snapshot": {
+            "price": round(float(latest['Close']), 2),
+            "market_cap": format_large_number(info.get('marketCap')),
+            "beta": info.get('beta', 'N/A'),
+            "range_52w": f"{info.get('fiftyTwoWeekLow', 0)} - {info.get('fiftyTwoWeekHigh', 0)}",
+            "analyst_target": info.get('targetMeanPrice', 'N/A')
+        },
+        "tradingview": ds.tv_analysis,
+        "technical_analysis": {
+            "trend": {
+                "outlook": "Bullish" if sma_50_val > sma_200_val else "Bearish",
+                "sma_50": round(float(sma_50), 2) if not np.isnan(sma_50) else None,
+                "sma_200": round(float(sma_200), 2) if not np.isnan(sma_200) else None,
+                "crossover": "Golden Cross" if sma_50_val > sma_200_val else "Death Cross"
+            },
+            "ema": {span: round(float(latest[f'EMA_{span}']), 2) for span in ("8", "21", "34", "55", "89")},
+            "volume": {
+                "current": f"{int(latest['Volume']):,}",
+                "avg_20d": f"{int(vol_avg.iloc[-1]):,}",
+                "rel_vol": round(float(rel_vol.iloc[-1]), 2),
+                "rel_vol_pct": min(100, int(rel_vol.iloc[-1] * 50))
+            },
+            "pivots": {
+                "R2": round(pp + (high_m - low_m), 2),
+                "R1": round((2 * pp) - low_m, 2),
+                "PP": round(pp, 2),
+                "S1": round((2 * pp) - high_m, 2),
+                "S2": round(pp - (high_m - low_m), 2)
+            },
+            "fibonacci": {
+                "100": round(h52, 2), "61.8": round(h52 - 0.382 * diff, 2),
+                "50": round(h52 - 0.5 * diff, 2), "38.2": round(h52 - 0.618 * diff, 2), "0": round(l52, 2)
+            },
+            "oscillators": {
+                "rsi_14": round(float(latest['RSI_14']), 2) if not np.isnan(latest['RSI_14']) else None,
+                "adx_14": round(float(latest['ADX_14']), 2) if not np.isnan(latest['ADX_14']) else None,
+                "macd_hist": round(float(latest['MACDh_12_26_9']), 2) if not np.isnan(latest['MACDh_12_26_9']) else None
+            }
+        },
+        "volatility": {"hv_30d": round(float(t["hv"].iloc[-1]), 2), "iv_current": round(float(iv), 2),
+                       "skew_25d": round(skew, 2) if skew is not None else None},
+        "insider_transactions": _insider_rows(ds.fundamentals['insiders']),
+        "intel_feed": intel,
+        "supply_chain": {"claims": supply_chain_claims, "shipments": []},
+        "sec_insights": {
+            "operations": sec_ops,
+            "forward_looking": sec_risks
+        },
+        "geospatial": geo
+    }
+
+def _narrative(d, risk_profile=True):
+    t_score = d['scores']['technical']
+    trend = d['technical_analysis']['trend']['outlook']
+    val_status = d['valuation']['status']
+    val_gap = d['valuation']['gap_pct']
+
+    narrative = f"<span class='text-neon-blue font-bold'>AI.SYNTHESIS // </span> <br>"
+    narrative += f"Asset demonstrates a <span class='{'text-neon-green' if t_score > 60 else 'text-neon-red'}'>{'STRONG' if t_score > 70 else 'WEAK' if t_score < 40 else 'NEUTRAL'}</span> technical posture (Score: {t_score}/100) within a wider {trend} trend. "
+
+    if val_status == "UNDERVALUED":
+        narrative += f"Models suggest the asset is <span class='text-neon-green'>UNDERVALUED</span> by {abs(val_gap)}%, implying a significant margin of safety. "
+    elif val_status == "OVERVALUED":
+        narrative += f"However, valuation models indicate the asset is <span class='text-neon-red'>OVERVALUED</span> by ~{val_gap}%; price may be extended beyond fundamentals. "
+    else:
+        narrative += f"Asset appears fairly valued relative to growth and book value. "
+
+    if risk_profile:
+        narrative += "<br><br><span class='text-gray-400 font-bold'>RISK.PROFILE // </span>"
+        if d['volatility']['iv_current'] > d['volatility']['hv_30d']:
+            narrative += "Implied volatility exceeds historical norms, expecting turbulence. "
+        else:
+            narrative += "Volatility compression detected; potential for range expansion. "
+
+    narrative += f"<br><br><span class='text-neon-amber font-bold'>VERDICT // </span>{'ACCUMULATE on Dips' if t_score > 60 and val_status != 'OVERVALUED' else 'DISTRIBUTE into Strength' if t_score < 40 else 'WAIT for Validation'}."
+    return narrative
+
+def _score(data, ds, risk_profile=True):
+    """Add scores, valuation and the narrative to a playbook payload."""
+    info, latest, t = ds.info, ds.latest, ds.technicals
+    sma_50, sma_200 = t["sma_50"], t["sma_200"]
+
+    tech_score = 50
+    tech_score += 20 if sma_50 > sma_200 else -20
+    tech_score += 10 if latest['Close'] > sma_50 else -10
+    tech_score += 10 if latest['Close'] > sma_200 else -10
+    rsi = data['technical_analysis']['oscillators'].get('rsi_14')
+    if rsi:
+        if 40 < rsi < 60: tech_score += 5
+        elif 30 < rsi <= 40: tech_score += 10
+        elif 60 <= rsi < 70: tech_score += 10
+        elif rsi >= 70: tech_score -= 5
+        elif rsi <= 30: tech_score -= 5
+
+    fund_score = 50
+    if info.get('profitMargins', 0) > 0.1: fund_score += 10
+    if info.get('revenueGrowth', 0) > 0.05: fund_score += 10
+
+    insider_sentiment = 0
+    for i in data['insider_transactions']:
+        v = i.get('value', '0').replace('$', '').replace('M', '000000').replace('K', '000').replace(',', '')
+        try:
+            float(v)
+            if 'Purchase' in i.get('type', ''): insider_sentiment += 1
+            elif 'Sale' in i.get('type', ''): insider_sentiment -= 1
+        except Exception:
+            pass
+    if insider_sentiment > 0: fund_score += 10
+    elif insider_sentiment < 0: fund_score -= 5
+
+    tgt = info.get('targetMeanPrice')
+    if tgt and tgt > latest['Close']: fund_score += 10
+
+    tech_score = max(0, min(100, tech_score))
+    fund_score = max(0, min(100, fund_score))
+    avg = (tech_score + fund_score) / 2
+    data["scores"] = {
+        "technical": tech_score,
+        "fundamental": fund_score,
+        "grade": "A" if avg > 80 else "B" if avg > 60 else "C" if avg > 40 else "D"
+    }
+
+    val_result = calculate_intrinsic_value(info, latest['Close'])
+    data["valuation"] = {
+        "status": val_result['status'],
+        "gap_pct": round(val_result['gap_pct'], 2),
+        "target_price": round(val_result['target_price'], 2),
+        "graham_num": val_result['details']['graham'],
+        "lynch_value": val_result['details']['lynch'],
+        "method": val_result['method']
+    }
+    data['ai_analysis'] = _narrative(data, risk_profile)
+    return data
+
+def hud_data(ds):
+    """Stock playbook (HUD) payload, as fetch_playbook_data.py saves it."""
+    data = _score(_playbook(ds, _hud_volatility(ds)), ds)
+    data['ghost_analysis'] = data['ai_analysis']
+    return clean_dict(data)
+
+def standalone_data(ds):
+    """alpha_standalone.py payload: the HUD with the RSS intel feed and a shorter narrative."""
+    return clean_dict(_score(_playbook(ds, _hud_volatility(ds), intel=ds.rss_items), ds, risk_profile=False))
+
+def _trend_strength(p, ema8, ema21, ema34):
+    if p > ema8 > ema21 > ema34: return "Strong"
+    if p > ema21: return "Weak"
+    if p < ema34: return "Bear"
+    return "Soft"
+
+def options_data(ds):
+    """Options dashboard payload (a superset of the HUD one), as fetch_options_data.py saves it."""
+    df, info, ticker, latest, t = ds.df, ds.info, ds.ticker, ds.latest, ds.technicals
+    opts = ds.options
+    (iv_val, skew), surface = _hud_volatility(ds), opts["surface"]
+    sma_50_val, sma_200_val = t["sma_50_val"], t["sma_200_val"]
+    hist_1y = df.iloc[-252:]
+    h52, l52 = hist_1y['High'].max(), hist_1y['Low'].min()
+
+    prev_close = df['Close'].iloc[-2] if len(df) > 1 else latest['Close']
+    price_change = latest['Close'] - prev_close
+    price_change_pct = (price_change / prev_close) * 100
+
+    trend_short = _trend_strength(latest['Close'], latest['EMA_8'], latest['EMA_21'], latest['EMA_34'])
+    trend_med = "Strong" if latest['Close'] > sma_50_val else "Soft"
+    trend_long = "Strong" if latest['Close'] > sma_200_val else "Bear"
+
+    expected_moves = []
+    days_out = [7, 14, 30, 60]
+    # Each horizon reads its own point on the ATM term structure; a single IV only without a surface
+    horizon_ivs = surface.atm_iv(days_out) * 100 if surface else [iv_val] * len(days_out)
+    for d, horizon_iv in zip(days_out, horizon_ivs):
+        horizon_iv = float(horizon_iv) if np.isfinite(horizon_iv) else float(iv_val)
+        move = latest['Close'] * (horizon_iv / 100) * np.sqrt(d / 365)
+        exp_date = (datetime.now() + pd.Timedelta(days=d)).strftime('%m/%d/%y')
+        expected_moves.append({
+            "expiration": exp_date,
+            "expectedMove": round(move, 2),
+            "expectedRange": f"{round(latest['Close'] - move, 2)} - {round(latest['Close'] + move, 2)}",
+            "iv": round(horizon_iv, 1)
+        })
+
+    total_call_vol, total_put_vol = opts["call_vol"], opts["put_vol"]
+    total_call_oi, total_put_oi = opts["call_oi"], opts["put_oi"]
+    pc_ratio_vol = total_put_vol / total_call_vol if total_call_vol > 0 else 0
+    pc_ratio_oi = total_put_oi / total_call_oi if total_call_oi > 0 else 0
+
+    # Daily chain aggregates (recorded by acquire) feed the 5d/1m changes and the put/call history
+    chart_dates = [d.strftime('%Y-%m-%d') for d in df.index[-10:]]
+    option_changes = {"volChg5d": 0, "volChg1m": 0, "oiChg5d": 0, "oiChg1m": 0}
+    vol_ratios, oi_ratios = [round(pc_ratio_vol, 2)] * 10, [round(pc_ratio_oi, 2)] * 10
+    option_history = ds.option_history
+    if not option_history.empty:
+        option_changes = change_metrics(option_history, chart_dates[-1])
+        vol_ratios, oi_ratios = ratio_series(option_history, chart_dates)
+    iv_summary = iv_stats(option_history, iv_val, chart_dates[-1])
+
+    dashboard_data = {
+        "ticker": ticker,
+        "companyName": info.get('longName', ticker),
+        "currentPrice": round(float(latest['Close']), 2),
+        "priceChange": round(float(price_change), 2),
+        "priceChangePct": round(float(price_change_pct), 2),
+        "timestamp": datetime.now().strftime("%m/%d/%y %H:%M %Z"),
+        "postMarketStr": f"Post-Market: ${round(float(latest['Close']), 2)} (0.00)",
+        "impliedVolatility": round(float(iv_val), 2),
+        "historicVolatility": round(float(t["hv"].iloc[-1]), 2),
+        **iv_summary,
+        "trendOverall": "Bullish" if latest['Close'] > sma_50_val else "Bearish",
+        "trendShort": trend_short,
+        "trendMed": trend_med,
+        "trendLong": trend_long,
+        "movAvg20d": round(float(df['Close'].rolling(20).mean().iloc[-1]), 2),
+        "movAvg50d": round(float(sma_50_val), 2),
+        "movAvg100d": round(float(df['Close'].rolling(100).mean().iloc[-1]), 2),
+        "movAvgChange20d": 0.0, "movAvgChange50d": 0.0, "movAvgChange100d": 0.0,
+        "atr20d": 5.0,
+        "rsi20d": round(float(calculate_rsi(df['Close'], 20).iloc[-1]), 2),
+        "trendSeekerSignal": "WAIT" if trend_short == "Soft" else "BUY" if "Strong" in trend_short else "SELL",
+        "low52w": round(float(l52), 2), "low52wDate": "1Y Low",
+        "high52w": round(float(h52), 2), "high52wDate": "1Y High",
+        "expectedMoves": expected_moves,
+        "volumeStats": {
+            "callVolume": int(total_call_vol), "putVolume": int(total_put_vol), "totalVolume": int(total_call_vol + total_put_vol), "pcRatioVol": round(pc_ratio_vol, 2),
+            "callOpenInt": int(total_call_oi), "putOpenInt": int(total_put_oi), "totalOpenInt": int(total_call_oi + total_put_oi), "pcRatioOi": round(pc_ratio_oi, 2),
+            **option_changes
+        },
+        "pcCharts": {
+            "dates": [d.strftime('%m/%d') for d in df.index[-10:]],
+            "stockPrices": [round(p, 2) for p in df['Close'].tail(10)],
+            "volRatios": vol_ratios,
+            "oiRatios": oi_ratios
+        },
+        "greeks": opts["greeks"],
+        "gamma": opts["gamma"],
+        "oiProfile": opts["oi"],
+        "volSurface": surface.to_json(chart_dates[-1]) if surface else None
+    }
+
+    # Same IV as hud_data(), so re-rendering the HUD from the saved JSON gives the same report
+    data = dashboard_data.copy()
+    data.update(_playbook(ds, (iv_val, skew)))
+    data = _score(data, ds)
+    data['ghost_analysis'] = data['ai_analysis']
+    return clean_dict(data)
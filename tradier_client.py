@@ -0,0 +1,166 @@
+"""
+Tradier market data: quotes, option expirations and chains with greeks.
+
+Every request goes through the shared requests.Session and provider_calls.call("tradier", ...), so
+callers share the "tradier" rate limit and circuit breaker. Chains come back in the
+options_chain.fetch_chain layout, are fetched one request per expiration on a shared pool for every
+symbol at once, and are cached per expiration like the yfinance ones (under OPTIONS_CACHE_DIR/tradier).
+The API root is the TRADIER_API_URL environment variable when set (benchmarks/tradier_stub.py serves
+a local stand-in), else config.TRADIER_API_URL.
+"""
+import os
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+from config import RATE_LIMITS, TRADIER_API_URL
+from http_sessions import requests_session
+from provider_calls import call, checked_get
+from options_chain import select_expirations, load_cached, store_cached, as_of_date
+from run_metrics import metrics
+from utils import LazyImport
+
+pd = LazyImport("pandas")
+
+CACHE_SOURCE = "tradier"
+GREEK_COLUMNS = ("delta", "gamma", "theta", "vega")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _executor():
+    # Sized to the provider's in-flight cap; the shared limiter still paces the request rate
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=RATE_LIMITS["tradier"]["concurrency"],
+                                       thread_name_prefix="tradier")
+        return _pool
+
+# Tradier field -> options_chain.fetch_chain column
+CHAIN_COLUMNS = {
+    "symbol": "contractSymbol", "strike": "strike", "bid": "bid", "ask": "ask", "last": "lastPrice",
+    "volume": "volume", "open_interest": "openInterest",
+}
+
+def api_url():
+    return os.getenv("TRADIER_API_URL", TRADIER_API_URL).rstrip("/")
+
+def access_token():
+    if not os.getenv("TRADIER_ACCESS_TOKEN") and importlib.util.find_spec("dotenv") is not None:
+        from dotenv import load_dotenv
+        load_dotenv()
+    return os.getenv("TRADIER_ACCESS_TOKEN")
+
+def is_configured():
+    """A token is set, or requests go to a stand-in that doesn't need one."""
+    return bool(access_token()) or api_url() != TRADIER_API_URL.rstrip("/")
+
+def _as_list(value):
+    # Tradier returns a bare object instead of a one-element list, and null instead of an empty one
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def get(path, **params):
+    """GET an API path (e.g. "markets/quotes") and return the decoded JSON body."""
+    headers = {"Accept": "application/json"}
+    token = access_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    provider = "tradier." + path.rsplit("/", 1)[-1]
+    response = call(provider, checked_get, requests_session(), f"{api_url()}/{path}",
+                    params=params, headers=headers, timeout=10)
+    return response.json()
+
+def quotes(symbols):
+    """{symbol: quote dict} for every symbol Tradier knows."""
+    body = get("markets/quotes", symbols=",".join(symbols))
+    return {q["symbol"]: q for q in _as_list((body.get("quotes") or {}).get("quote"))}
+
+def expirations(symbol):
+    body = get("markets/options/expirations", symbol=symbol, includeAllRoots="true")
+    return _as_list((body.get("expirations") or {}).get("date"))
+
+def chain(symbol, expiration):
+    """One expiration's contracts as a fetch_chain-style frame (without `dte`), with Tradier's greeks.
+
+    `impliedVolatility` is Tradier's mid IV (its smoothed IV where there is no mid); greeks.chain_greeks
+    recomputes the greeks from the quotes, these are the provider's own.
+    """
+    body = get("markets/options/chains", symbol=symbol, expiration=expiration, greeks="true")
+    options = _as_list((body.get("options") or {}).get("option"))
+    if not options:
+        return pd.DataFrame()
+    raw = pd.DataFrame(options)
+    frame = raw.reindex(columns=list(CHAIN_COLUMNS)).rename(columns=CHAIN_COLUMNS)
+    frame["side"] = raw["option_type"]
+    frame["expiration"] = expiration
+    greeks = pd.DataFrame([g or {} for g in raw["greeks"]] if "greeks" in raw else [{}] * len(raw))
+    greeks = greeks.reindex(columns=["mid_iv", "smv_vol", *GREEK_COLUMNS]).astype(float)
+    frame["impliedVolatility"] = greeks["mid_iv"].where(greeks["mid_iv"] > 0, greeks["smv_vol"]).to_numpy()
+    for name in GREEK_COLUMNS:
+        frame[name] = greeks[name].to_numpy()
+    return frame
+
+def _fetch_expiration(symbol, expiration):
+    cached = load_cached(symbol, expiration, CACHE_SOURCE)
+    metrics.cache(symbol, "options", "tradier.chains", cached is not None)
+    if cached is not None:
+        return cached
+    with metrics.stage(symbol, "options", "tradier.chains") as m:
+        frame = chain(symbol, expiration)
+        m.add_bytes(frame)
+    if not frame.empty:
+        store_cached(symbol, expiration, frame, CACHE_SOURCE)
+    return frame
+
+def _listed(symbol, min_dte, max_dte):
+    with metrics.stage(symbol, "options", "tradier.expirations"):
+        return select_expirations(expirations(symbol), min_dte, max_dte)
+
+def fetch_chains(symbols, min_dte=0, max_dte=None):
+    """{symbol: chain} for every symbol, like options_chain.fetch_chain.
+
+    Expiration listings and then every (symbol, expiration) chain go through one shared pool, so a
+    watchlist costs a couple of rate-limited waves rather than one symbol after another. Symbols whose
+    listing fails map to an empty chain with the error in `attrs["failed_expirations"]`.
+    """
+    listings = {symbol: _executor().submit(_listed, symbol, min_dte, max_dte) for symbol in symbols}
+    listed, futures = {}, {}
+    for symbol, future in listings.items():
+        try:
+            listed[symbol] = future.result()
+        except Exception as e:
+            listed[symbol] = []
+            print(f"Tradier expirations failed for {symbol}: {type(e).__name__}: {e}")
+        for expiration in listed[symbol]:
+            futures[symbol, expiration] = _executor().submit(_fetch_expiration, symbol, expiration)
+
+    chains = {}
+    for symbol, exps in listed.items():
+        as_of = as_of_date()
+        frames, failed = [], []
+        for expiration in exps:
+            try:
+                frame = futures[symbol, expiration].result()
+            except Exception as e:
+                failed.append({"expiration": expiration, "error": f"{type(e).__name__}: {e}"[:200]})
+                continue
+            if frame.empty:
+                failed.append({"expiration": expiration, "error": "empty chain"})
+            else:
+                frames.append(frame.assign(dte=(pd.Timestamp(expiration).date() - as_of).days))
+        if failed:
+            print(f"Tradier chain: {len(failed)}/{len(exps)} expirations failed for {symbol}: "
+                  f"{', '.join(f['expiration'] for f in failed)}")
+        chain_frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=["contractSymbol", "strike", "side", "expiration", "dte"])
+        chain_frame.attrs["failed_expirations"] = failed
+        chain_frame.attrs["expirations"] = [exp for exp in exps if exp not in {f["expiration"] for f in failed}]
+        chains[symbol] = chain_frame
+    return chains
+
+def fetch_chain(symbol, min_dte=0, max_dte=None):
+    """Every expiration in the DTE window as one frame, like options_chain.fetch_chain."""
+    return fetch_chains([symbol], min_dte, max_dte)[symbol]
@@ -0,0 +1,187 @@
+"""
+Unusual options activity (UOA) scan across the watchlist.
+
+Chains for every ticker are fetched concurrently from yfinance (options_chain.fetch_chain) or Tradier
+(tradier_client), stacked into one frame and priced in one greeks.chain_greeks pass. Contracts are
+ranked on volume/OI, premium traded and the IV change against the previous session's stored vol
+surface (or, without one, its ATM IV from options_history), all as column operations on that frame.
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from config import OPTIONS_MAX_DTE
+from run_metrics import metrics, add_profile_args
+from http_sessions import install_dns_cache, yf_session
+from provider_calls import call
+from options_chain import fetch_chain, last_close
+from options_history import load_history
+from greeks import CONTRACT_SIZE, chain_greeks
+from vol_surface import load_surface
+from gamma_screen import default_tickers
+from replay_providers import add_cassette_args, cassette
+import tradier_client
+from utils import LazyImport
+
+yf = LazyImport("yfinance")
+pd = LazyImport("pandas")
+np = LazyImport("numpy")
+
+FETCH_WORKERS = 4
+MIN_VOLUME = 100
+TOP_N = 25
+# Score components, each ranked as a percentile across every contract in the scan
+SCORE_COLUMNS = ("volOi", "premium", "ivChange")
+
+def fetch_yfinance(ticker, max_dte):
+    stock = yf.Ticker(ticker, session=yf_session())
+    with metrics.stage(ticker, "history", "yfinance"):
+        bars = call("yfinance", stock.history, period='5d')
+    if bars.empty:
+        raise ValueError(f"No price data found for {ticker}")
+    chain = fetch_chain(ticker, stock, max_dte=max_dte)
+    return bars.index[-1].strftime('%Y-%m-%d'), float(bars['Close'].iloc[-1]), chain
+
+def fetch_tradier(ticker, max_dte):
+    with metrics.stage(ticker, "quote", "tradier"):
+        quote = tradier_client.quotes([ticker]).get(ticker)
+    if not quote or not quote.get("last"):
+        raise ValueError(f"No Tradier quote for {ticker}")
+    traded = pd.Timestamp(quote["trade_date"], unit="ms") if quote.get("trade_date") else last_close()
+    chain = tradier_client.fetch_chain(ticker, max_dte=max_dte)
+    return traded.strftime('%Y-%m-%d'), float(quote["last"]), chain
+
+FETCHERS = {"yfinance": fetch_yfinance, "tradier": fetch_tradier}
+
+def fetch_all(tickers, provider="yfinance", max_dte=OPTIONS_MAX_DTE):
+    """Every ticker's chain stacked into one frame with `ticker`, `date` and `spot` columns."""
+    fetch = FETCHERS[provider]
+    frames, failed = [], []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = {ticker: executor.submit(fetch, ticker, max_dte) for ticker in tickers}
+        for ticker, future in futures.items():
+            try:
+                date_str, spot, chain = future.result()
+            except Exception as e:
+                print(f"Error fetching {ticker}: {e}")
+                failed.append(ticker)
+                continue
+            if chain.empty:
+                failed.append(ticker)
+                continue
+            frames.append(chain.assign(ticker=ticker, date=date_str, spot=spot))
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()), failed
+
+def prior_iv(contracts):
+    """Each contract's IV on the previous stored session: the cached surface at its moneyness and DTE,
+    else that session's ATM IV; NaN for tickers with no history."""
+    out = np.full(len(contracts), np.nan)
+    for (ticker, date_str), rows in contracts.groupby(["ticker", "date"], sort=False):
+        idx = contracts.index.get_indexer(rows.index)
+        surface = load_surface(ticker, before=date_str)
+        if surface is not None:
+            moneyness = rows["strike"].to_numpy(dtype=float) / rows["spot"].to_numpy(dtype=float)
+            out[idx] = surface.iv(moneyness, rows["dte"].to_numpy(dtype=float))
+            continue
+        history = load_history(ticker)
+        if history.empty or "atm_iv" not in history:
+            continue
+        previous = history[(history["date"] < date_str) & history["atm_iv"].notna()]
+        if not previous.empty:
+            # options_history stores ATM IV in percent
+            out[idx] = float(previous["atm_iv"].iloc[-1]) / 100
+    return out
+
+def score_contracts(priced, min_volume=MIN_VOLUME):
+    """Active contracts with volume/OI, premium, IV change (vol points) and a 0-100 composite score."""
+    volume = priced["volume"].fillna(0).to_numpy(dtype=float)
+    mid = priced["mid"].to_numpy(dtype=float)
+    active = priced[(volume >= min_volume) & np.isfinite(mid) & (mid > 0)].reset_index(drop=True)
+    if active.empty:
+        return active
+    volume = active["volume"].to_numpy(dtype=float)
+    oi = active["openInterest"].fillna(0).to_numpy(dtype=float)
+    active["volOi"] = volume / np.maximum(oi, 1)
+    active["premium"] = volume * active["mid"].to_numpy(dtype=float) * CONTRACT_SIZE
+    active["ivChange"] = (active["iv"].to_numpy(dtype=float) - prior_iv(active)) * 100
+    # Contracts without a prior IV are ranked on the other two components only
+    ranks = active[list(SCORE_COLUMNS)].rank(pct=True)
+    active["score"] = ranks.mean(axis=1, skipna=True) * 100
+    active["opening"] = volume > oi
+    return active.sort_values("score", ascending=False, kind="stable").reset_index(drop=True)
+
+def _value(v, digits=2):
+    return round(float(v), digits) if pd.notna(v) else None
+
+def report_rows(scored, top=TOP_N):
+    rows = []
+    for r in scored.head(top).itertuples(index=False):
+        rows.append({
+            "ticker": r.ticker, "contract": r.contractSymbol, "side": r.side, "strike": float(r.strike),
+            "expiration": r.expiration, "dte": int(r.dte), "spot": _value(r.spot),
+            "moneynessPct": _value((r.strike - r.spot) / r.spot * 100),
+            "volume": int(r.volume), "openInterest": int(r.openInterest) if pd.notna(r.openInterest) else 0,
+            "volOi": _value(r.volOi), "opening": bool(r.opening), "mid": _value(r.mid),
+            "premium": _value(r.premium, 0), "iv": _value(r.iv * 100), "ivChange": _value(r.ivChange),
+            "delta": _value(r.delta, 3), "score": _value(r.score, 1),
+        })
+    return rows
+
+def run_scan(tickers, provider="yfinance", max_dte=OPTIONS_MAX_DTE, min_volume=MIN_VOLUME, top=TOP_N):
+    contracts, failed = fetch_all(tickers, provider, max_dte)
+    if contracts.empty:
+        return None, [], failed
+    with metrics.stage("ALL", "greeks"):
+        priced = chain_greeks(contracts, contracts["spot"].to_numpy(dtype=float))
+    with metrics.stage("ALL", "uoa"):
+        scored = score_contracts(priced, min_volume)
+    return contracts["date"].max(), report_rows(scored, top), failed
+
+def print_scan(results, failed, date_str, provider):
+    print(f"Unusual options activity for {date_str} ({provider}): top {len(results)} contracts")
+    print(f"  {'TICKER':<7}{'CONTRACT':<22}{'VOLUME':>9}{'VOL/OI':>8}{'PREMIUM':>12}{'IV':>7}{'dIV':>7}{'SCORE':>7}")
+    for item in results:
+        iv_change = f"{item['ivChange']:+.1f}" if item["ivChange"] is not None else "--"
+        iv = f"{item['iv']:.1f}" if item["iv"] is not None else "--"
+        flag = " *" if item["opening"] else ""
+        print(f"  {item['ticker']:<7}{item['contract']:<22}{item['volume']:>9}{item['volOi']:>8.2f}"
+              f"{item['premium']:>12,.0f}{iv:>7}{iv_change:>7}{item['score']:>7.1f}{flag}")
+    if failed:
+        print(f"No chain for: {', '.join(failed)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan the watchlist for unusual options activity")
+    parser.add_argument('--tickers', type=str, nargs='+', help='Tickers to scan (default: the watchlist)')
+    parser.add_argument('--provider', choices=sorted(FETCHERS), default='yfinance', help='Chain provider')
+    parser.add_argument('--max-dte', type=int, default=OPTIONS_MAX_DTE, help='Furthest expiration to scan')
+    parser.add_argument('--min-volume', type=int, default=MIN_VOLUME, help='Ignore contracts trading less')
+    parser.add_argument('--top', type=int, default=TOP_N, help='Contracts in the report')
+    parser.add_argument('--output', type=str, help='Write the scan as JSON (default: daily_signals/<date>/)')
+    add_cassette_args(parser)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    install_dns_cache()
+    if args.profile:
+        metrics.enable_profiling(args.profile, "uoa_scanner")
+    if args.provider == "tradier" and not tradier_client.is_configured():
+        print("Missing Tradier credentials (TRADIER_ACCESS_TOKEN).")
+        sys.exit(1)
+
+    with cassette(args, sys.modules[__name__]):
+        date_str, results, failed = run_scan(args.tickers or default_tickers(), args.provider,
+                                             args.max_dte, args.min_volume, args.top)
+    if date_str is None:
+        print("No option chains fetched.")
+        sys.exit(1)
+    print_scan(results, failed, date_str, args.provider)
+
+    output = args.output or os.path.join("daily_signals", date_str, f"UOA_Scan_{date_str}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"date": date_str, "provider": args.provider, "results": results, "failed": failed}, f, indent=2)
+    print(f"Scan saved to: {output}")
+
+if __name__ == "__main__":
+    main()
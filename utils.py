@@ -1,5 +1,36 @@
-import pandas as pd
-import numpy as np
+import os
+import json
+import importlib
+
+class LazyImport:
+    """Stand-in for a module (or one attribute of it) that is imported on first use.
+
+    Keeps `--help`, report-only runs and deploys from paying for pandas/yfinance at startup while
+    the name stays a plain module global, so replay_providers can still patch it.
+    """
+
+    def __init__(self, module, attr=None):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._attr) if self._attr else target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self._module}{'.' + self._attr if self._attr else ''}>"
+
+pd = LazyImport("pandas")
+np = LazyImport("numpy")
 
 def calculate_sma(series, window):
     return series.rolling(window=window).mean()
@@ -150,3 +181,24 @@ def calculate_intrinsic_value(info, current_price):
             "analyst": round(analyst_target, 2)
         }
     }
+
+HISTORY_DATES_FILE = "history_dates.json"
+
+def load_history_dates(ticker_dir):
+    """Dates that only survive in the compacted history of a ticker (see compact_reports.py)."""
+    path = os.path.join(ticker_dir, HISTORY_DATES_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def upsert_parquet(path, rows, key='date'):
+    """Merge rows into a columnar parquet table, keeping the newest row per key."""
+    if os.path.exists(path):
+        rows = pd.concat([pd.read_parquet(path), rows], ignore_index=True)
+    rows = rows.drop_duplicates(subset=key, keep='last').sort_values(key).reset_index(drop=True)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    rows.to_parquet(tmp_path, index=False, compression='zstd')
+    os.replace(tmp_path, path)
+    return rows
@@ -0,0 +1,176 @@
+"""
+Implied volatility surface from a priced chain (see greeks.chain_greeks).
+
+Each expiration contributes an out-of-the-money smile sampled on a fixed moneyness grid (K / spot), its
+ATM IV and 25-delta skew. Between expirations the surface interpolates total variance (IV^2 * T)
+linearly in time and holds the vol flat beyond the first and last expiration.
+"""
+import os
+
+from greeks import MIN_DTE_DAYS
+from provider_calls import is_live
+from utils import LazyImport, upsert_parquet
+
+np = LazyImport("numpy")
+pd = LazyImport("pandas")
+
+SURFACE_FILE = "vol_surface.parquet"
+MONEYNESS_GRID = (0.8, 0.85, 0.9, 0.925, 0.95, 0.975, 1.0, 1.025, 1.05, 1.075, 1.1, 1.15, 1.2)
+SKEW_DELTA = 0.25
+MIN_QUOTES = 3
+
+def _years(dte):
+    return np.maximum(np.asarray(dte, dtype=float), MIN_DTE_DAYS) / 365
+
+class VolSurface:
+    """Per-expiration smiles on MONEYNESS_GRID plus ATM IV and 25-delta wings, all as fractions."""
+
+    def __init__(self, expirations, dte, smiles, atm, call_wing, put_wing, moneyness=MONEYNESS_GRID):
+        order = np.argsort(dte, kind="stable")
+        self.expirations = [expirations[i] for i in order]
+        self.dte = np.asarray(dte, dtype=float)[order]
+        self.smiles = np.asarray(smiles, dtype=float).reshape(len(order), len(moneyness))[order]
+        self.atm = np.asarray(atm, dtype=float)[order]
+        self.call_wing = np.asarray(call_wing, dtype=float)[order]
+        self.put_wing = np.asarray(put_wing, dtype=float)[order]
+        self.moneyness = np.asarray(moneyness, dtype=float)
+
+    @property
+    def skew(self):
+        """25-delta put IV minus 25-delta call IV per expiration."""
+        return self.put_wing - self.call_wing
+
+    def _in_time(self, values, days, variance=True):
+        """Interpolate per-expiration values to each horizon in `days`, flat outside the listed range.
+
+        `values` is (expirations,) or (expirations, len(days)). Vols blend in total variance, anything
+        else (skew) linearly.
+        """
+        t, target = _years(self.dte), _years(np.atleast_1d(days))
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = np.repeat(values[:, None], len(target), axis=1)
+        cols = np.arange(len(target))
+        if len(t) == 1:
+            return values[0, cols]
+        idx = np.clip(np.searchsorted(t, target), 1, len(t) - 1)
+        a, b = values[idx - 1, cols], values[idx, cols]
+        w = np.clip((target - t[idx - 1]) / (t[idx] - t[idx - 1]), 0.0, 1.0)
+        if variance:
+            blended = np.sqrt((a ** 2 * t[idx - 1] * (1 - w) + b ** 2 * t[idx] * w) / target)
+        else:
+            blended = a * (1 - w) + b * w
+        return np.where(target <= t[0], values[0, cols], np.where(target >= t[-1], values[-1, cols], blended))
+
+    def atm_iv(self, days):
+        """ATM IV at any horizon in days (scalar or array) from the term structure."""
+        return self._in_time(self.atm, days).reshape(np.shape(days))
+
+    def skew_at(self, days):
+        return self._in_time(self.skew, days, variance=False).reshape(np.shape(days))
+
+    def iv(self, moneyness, days):
+        """IV at (K / spot, days): linear in moneyness within each smile, total variance across time."""
+        moneyness, days = np.broadcast_arrays(np.atleast_1d(np.asarray(moneyness, dtype=float)),
+                                              np.atleast_1d(np.asarray(days, dtype=float)))
+        pos = np.clip(np.searchsorted(self.moneyness, moneyness), 1, len(self.moneyness) - 1)
+        lo, hi = pos - 1, pos
+        weight = np.clip((moneyness - self.moneyness[lo]) / (self.moneyness[hi] - self.moneyness[lo]), 0.0, 1.0)
+        # expirations x points: every smile sampled at the requested moneyness, then blended in time
+        smiles = self.smiles[:, lo] * (1 - weight) + self.smiles[:, hi] * weight
+        return self._in_time(smiles, days)
+
+    def to_frame(self, date_str):
+        rows = len(self.expirations) * len(self.moneyness)
+        return pd.DataFrame({
+            "date": [date_str] * rows,
+            "expiration": np.repeat(self.expirations, len(self.moneyness)),
+            "dte": np.repeat(self.dte, len(self.moneyness)),
+            "moneyness": np.tile(self.moneyness, len(self.expirations)),
+            "iv": self.smiles.ravel(),
+            "atm_iv": np.repeat(self.atm, len(self.moneyness)),
+            "call_25d_iv": np.repeat(self.call_wing, len(self.moneyness)),
+            "put_25d_iv": np.repeat(self.put_wing, len(self.moneyness)),
+        })
+
+    @classmethod
+    def from_frame(cls, frame):
+        frame = frame.sort_values(["dte", "expiration", "moneyness"])
+        per_exp = frame.groupby(["dte", "expiration"], sort=False).first().reset_index()
+        grid = np.sort(frame["moneyness"].unique())
+        return cls(list(per_exp["expiration"]), per_exp["dte"], frame["iv"].to_numpy(), per_exp["atm_iv"],
+                   per_exp["call_25d_iv"], per_exp["put_25d_iv"], moneyness=grid)
+
+    def to_json(self, date_str, horizon_days=30):
+        pct = lambda v: round(float(v) * 100, 2) if np.isfinite(v) else None
+        return {
+            "asOf": date_str,
+            "iv30d": pct(self.atm_iv(horizon_days)),
+            "skew30d": pct(self.skew_at(horizon_days)),
+            "moneyness": [float(m) for m in self.moneyness],
+            "term": [{"expiration": exp, "dte": int(d), "atmIv": pct(a), "skew25d": pct(p - c),
+                      "call25dIv": pct(c), "put25dIv": pct(p)}
+                     for exp, d, a, c, p in zip(self.expirations, self.dte, self.atm, self.call_wing, self.put_wing)],
+            "smiles": [[pct(v) for v in row] for row in self.smiles],
+        }
+
+def _wing(rows, target):
+    """IV at a given delta on one side of the smile, or NaN when the quotes don't straddle it."""
+    if len(rows) < 2:
+        return np.nan
+    delta, iv = rows["delta"].to_numpy(dtype=float), rows["iv"].to_numpy(dtype=float)
+    order = np.argsort(delta)
+    delta, iv = delta[order], iv[order]
+    if not delta[0] <= target <= delta[-1]:
+        return np.nan
+    return float(np.interp(target, delta, iv))
+
+def build_surface(priced, spot):
+    """VolSurface from every expiration with at least MIN_QUOTES usable out-of-the-money quotes, else None."""
+    if priced.empty or "iv" not in priced:
+        return None
+    iv = priced["iv"].to_numpy(dtype=float)
+    otm = np.where(priced["side"] == "call", priced["strike"] >= spot, priced["strike"] < spot)
+    usable = priced[np.isfinite(iv) & (iv > 0) & otm & np.isfinite(priced["delta"].to_numpy(dtype=float))]
+    grid = np.asarray(MONEYNESS_GRID)
+
+    expirations, dte, smiles, atm, call_wing, put_wing = [], [], [], [], [], []
+    for expiration, rows in usable.groupby("expiration", sort=True):
+        if len(rows) < MIN_QUOTES:
+            continue
+        rows = rows.sort_values("strike")
+        moneyness = rows["strike"].to_numpy(dtype=float) / spot
+        vols = rows["iv"].to_numpy(dtype=float)
+        expirations.append(expiration)
+        dte.append(float(rows["dte"].iloc[0]))
+        # Flat beyond the outermost quotes
+        smiles.append(np.interp(grid, moneyness, vols))
+        atm.append(float(np.interp(1.0, moneyness, vols)))
+        call_wing.append(_wing(rows[rows["side"] == "call"], SKEW_DELTA))
+        put_wing.append(_wing(rows[rows["side"] == "put"], -SKEW_DELTA))
+    if not expirations:
+        return None
+    return VolSurface(expirations, dte, smiles, atm, call_wing, put_wing)
+
+def record_surface(ticker, date_str, surface, reports_dir="reports"):
+    if not is_live():
+        return
+    upsert_parquet(os.path.join(reports_dir, ticker, SURFACE_FILE), surface.to_frame(date_str),
+                   key=["date", "expiration", "moneyness"])
+
+def load_surface(ticker, date_str=None, reports_dir="reports", before=None):
+    """Cached surface for the session (the latest one when no date is given, or the latest one
+    strictly before `before`), or None. Replays (provider_calls.offline) never see a cached surface."""
+    if not is_live():
+        return None
+    path = os.path.join(reports_dir, ticker, SURFACE_FILE)
+    if not os.path.exists(path):
+        return None
+    frame = pd.read_parquet(path)
+    if before is not None:
+        frame = frame[frame["date"] < before]
+        if frame.empty:
+            return None
+    date_str = date_str or frame["date"].max()
+    frame = frame[frame["date"] == date_str]
+    return VolSurface.from_frame(frame) if not frame.empty else None